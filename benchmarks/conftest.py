@@ -0,0 +1,77 @@
+import sys
+
+import pytest
+from django.urls import get_resolver
+
+from benchmarks.harness import Runner, format_report, save_baseline
+from core import constants
+from tmdb.fake_server import EndpointProfile, FakeTMDbConfig, FakeTMDbServer
+
+_results = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        help="Write the measured numbers to benchmarks/baseline.json.",
+    )
+    group.addoption("--bench-iterations", type=int, default=200)
+    group.addoption(
+        "--upstream-latency-ms",
+        type=float,
+        default=2.0,
+        help="Constant latency of the fake TMDb for every endpoint.",
+    )
+
+
+@pytest.fixture(scope="session")
+def fake_tmdb(pytestconfig):
+    config = FakeTMDbConfig(
+        default=EndpointProfile(
+            latency_ms=pytestconfig.getoption("upstream_latency_ms")
+        )
+    )
+    with FakeTMDbServer(config) as server, pytest.MonkeyPatch.context() as mp:
+        # Images are not served by the fake; pointing them at it turns a
+        # stray image fetch into a local 404 instead of a call to the CDN.
+        _redirect_tmdb(mp, server.base_url, f"{server.base_url}/t/p/")
+        yield server
+
+
+def _redirect_tmdb(mp, api_base, image_base):
+    # Modules copy the base URLs at import time, so every module holding the
+    # real value is patched rather than a hand-kept list of them. Loading the
+    # URLconf first imports every view and the services behind them.
+    get_resolver().url_patterns
+    targets = {
+        "TMDB_API_BASE": (constants.TMDB_API_BASE, api_base),
+        "TMDB_IMAGE_BASE": (constants.TMDB_IMAGE_BASE, image_base),
+    }
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", {})
+        for name, (real, fake) in targets.items():
+            if namespace.get(name) == real:
+                mp.setattr(module, name, fake)
+    mp.setattr("tmdb.client.TMDBClient.BASE", api_base)
+
+
+@pytest.fixture
+def runner(fake_tmdb, pytestconfig):
+    return Runner(fake_tmdb, iterations=pytestconfig.getoption("bench_iterations"))
+
+
+@pytest.fixture
+def record_result():
+    return _results.append
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(format_report(_results))
+    if config.getoption("update_baseline"):
+        save_baseline(_results)
+        terminalreporter.write_line("baseline updated")
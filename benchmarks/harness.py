@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from django.test import Client
+
+from tmdb.fake_server import FakeTMDbServer
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+
+# Metrics where a larger value is a regression; throughput is the reverse.
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "upstream_calls", "alloc_kib")
+HIGHER_IS_BETTER = ("rps",)
+
+# Relative slack per metric. Timings vary between machines and runs, upstream
+# calls are deterministic and must not grow at all.
+DEFAULT_TOLERANCE = {
+    "rps": 0.5,
+    "p50_ms": 0.5,
+    "p95_ms": 0.75,
+    "p99_ms": 1.0,
+    "upstream_calls": 0.0,
+    "alloc_kib": 0.25,
+}
+# Absolute slack so sub-millisecond timings do not flap.
+ABSOLUTE_SLACK = {"p50_ms": 0.5, "p95_ms": 1.0, "p99_ms": 2.0, "alloc_kib": 16.0}
+
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    method: str = "get"
+    data: Optional[dict[str, Any]] = None
+    authenticated: bool = True
+    # Runs before every iteration, outside the timed section.
+    before_each: Optional[Callable[[], None]] = None
+    # Runs once before warm-up (fixtures, DB rows).
+    setup: Optional[Callable[[], None]] = None
+    iterations: Optional[int] = None
+    # Dotted attribute -> value, patched for the duration of the scenario.
+    patches: dict[str, Any] = field(default_factory=dict)
+    expected_status: tuple[int, ...] = (200, 201)
+
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    upstream_calls: float
+    alloc_kib: float
+    errors: int = 0
+    upstream_by_endpoint: dict[str, float] = field(default_factory=dict)
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            name: getattr(self, name) for name in HIGHER_IS_BETTER + LOWER_IS_BETTER
+        }
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class Runner:
+    def __init__(
+        self,
+        server: FakeTMDbServer,
+        iterations: int = 200,
+        warmup: int = 10,
+        auth_header: str = "Bearer bench-token",
+    ) -> None:
+        self.server = server
+        self.iterations = iterations
+        self.warmup = warmup
+        self.client = Client(HTTP_AUTHORIZATION=auth_header)
+        self.anonymous = Client()
+
+    def run(self, scenario: Scenario) -> Result:
+        if scenario.setup:
+            scenario.setup()
+        iterations = scenario.iterations or self.iterations
+
+        for _ in range(self.warmup):
+            self._call(scenario)
+
+        latencies: list[float] = []
+        errors = 0
+        calls_before = self.server.app.stats()["calls"]
+        gc.collect()
+        for _ in range(iterations):
+            if scenario.before_each:
+                scenario.before_each()
+            started = perf_counter()
+            status = self._call(scenario)
+            latencies.append(perf_counter() - started)
+            errors += status not in scenario.expected_status
+        calls_after = self.server.app.stats()["calls"]
+
+        alloc_kib = self._peak_allocation(scenario)
+
+        latencies_ms = sorted(s * 1000 for s in latencies)
+        upstream = {
+            endpoint: round((count - calls_before.get(endpoint, 0)) / iterations, 3)
+            for endpoint, count in calls_after.items()
+            if count != calls_before.get(endpoint, 0)
+        }
+        return Result(
+            name=scenario.name,
+            iterations=iterations,
+            rps=round(iterations / sum(latencies), 1),
+            p50_ms=round(percentile(latencies_ms, 0.50), 3),
+            p95_ms=round(percentile(latencies_ms, 0.95), 3),
+            p99_ms=round(percentile(latencies_ms, 0.99), 3),
+            upstream_calls=round(sum(upstream.values()), 3),
+            alloc_kib=alloc_kib,
+            errors=errors,
+            upstream_by_endpoint=upstream,
+        )
+
+    def _call(self, scenario: Scenario) -> int:
+        client = self.client if scenario.authenticated else self.anonymous
+        if scenario.method == "post":
+            response = client.post(
+                scenario.path, scenario.data or {}, content_type="application/json"
+            )
+        else:
+            response = client.get(scenario.path, scenario.data or {})
+        return response.status_code
+
+    def _peak_allocation(self, scenario: Scenario, samples: int = 5) -> float:
+        # Peak traced memory per request, measured separately because
+        # tracemalloc slows the interpreter down too much to time under it.
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(samples):
+                if scenario.before_each:
+                    scenario.before_each()
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                self._call(scenario)
+                peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        finally:
+            tracemalloc.stop()
+        return round(sorted(peaks)[len(peaks) // 2] / 1024, 1)
+
+
+def compare(
+    result: Result,
+    baseline: dict[str, float],
+    tolerance: Optional[dict[str, float]] = None,
+) -> list[str]:
+    tolerance = {**DEFAULT_TOLERANCE, **(tolerance or {})}
+    regressions = []
+    current = result.metrics()
+    for name in HIGHER_IS_BETTER:
+        if name in baseline and current[name] < baseline[name] * (1 - tolerance[name]):
+            regressions.append(
+                f"{result.name}.{name}: {current[name]} < baseline {baseline[name]}"
+            )
+    for name in LOWER_IS_BETTER:
+        if name not in baseline:
+            continue
+        limit = baseline[name] * (1 + tolerance[name]) + ABSOLUTE_SLACK.get(name, 0)
+        if current[name] > limit:
+            regressions.append(
+                f"{result.name}.{name}: {current[name]} > baseline {baseline[name]}"
+            )
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> dict[str, dict[str, float]]:
+    if not path.is_file():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(results: list[Result], path: Path = BASELINE_FILE) -> None:
+    data = load_baseline(path)
+    data.update({result.name: result.metrics() for result in results})
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def format_report(results: list[Result]) -> str:
+    header = (
+        f"{'scenario':<22}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'upstream':>10}{'alloc KiB':>11}{'errors':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.name:<22}{r.rps:>9}{r.p50_ms:>9}{r.p95_ms:>9}{r.p99_ms:>9}"
+            f"{r.upstream_calls:>10}{r.alloc_kib:>11}{r.errors:>8}"
+        )
+    return "\n".join(lines)
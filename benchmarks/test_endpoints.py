@@ -0,0 +1,64 @@
+import pytest
+from django.core.cache import cache
+
+from benchmarks.harness import Scenario, compare, load_baseline
+from favorites.models import FavoritedList
+
+ACCOUNT_ID = 4242
+LIST_NAME = "bench-list"
+
+
+def _shared_list():
+    FavoritedList.objects.create(account_id=ACCOUNT_ID, list_name=LIST_NAME)
+
+
+SCENARIOS = [
+    Scenario("discover", "/api/v1/discover/", data={"page": 1}),
+    Scenario(
+        "discover_account",
+        "/api/v1/discover/",
+        data={"page": 1, "account_id": ACCOUNT_ID},
+    ),
+    Scenario(
+        "discover_passthrough",
+        "/api/v1/discover/",
+        data={"page": 1, "account_id": ACCOUNT_ID},
+        patches={"tmdb.views.TMDB_PASSTHROUGH": True},
+    ),
+    Scenario("search", "/api/v1/movies/search/", data={"query": "matrix"}),
+    Scenario("details_cold", "/api/v1/movies/550/", before_each=cache.clear),
+    Scenario("details_warm", "/api/v1/movies/550/"),
+    Scenario("favorites_list", "/api/v1/favorites/", data={"account_id": ACCOUNT_ID}),
+    Scenario(
+        "favorites_toggle",
+        "/api/v1/favorites/",
+        method="post",
+        data={"account_id": ACCOUNT_ID, "movie_id": 550, "favorite": True},
+    ),
+    Scenario(
+        "shared_list",
+        "/api/v1/get-shared-favorites/",
+        data={"list_name": LIST_NAME},
+        setup=_shared_list,
+    ),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s.name)
+def test_endpoint(scenario, runner, record_result, pytestconfig, monkeypatch):
+    cache.clear()
+    for target, value in scenario.patches.items():
+        monkeypatch.setattr(target, value)
+
+    result = runner.run(scenario)
+    record_result(result)
+
+    assert result.errors == 0, f"{scenario.name}: {result.errors} failed requests"
+    if pytestconfig.getoption("update_baseline"):
+        return
+    baseline = load_baseline().get(scenario.name)
+    if baseline is None:
+        pytest.skip(f"no baseline for {scenario.name}; run with --update-baseline")
+    regressions = compare(result, baseline)
+    assert not regressions, "\n".join(regressions)
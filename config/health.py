@@ -1,10 +1,28 @@
+import logging
+import threading
+import time
+import uuid
 from time import monotonic
+from typing import Any, Optional
 
-from django.db import connection
+from django.core.cache import cache
+from django.db import connection, connections
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from config.middleware import in_flight_requests
+from core.constants import HEALTH_PROBE_INTERVAL
+from tmdb.concurrency import details_pool, executor_stats
+from tmdb.upstream import tmdb_stats
+
+logger = logging.getLogger(__name__)
+
+# A probe result older than this many intervals means the prober has stopped
+# refreshing; readiness then reports an error rather than the last good result.
+STALE_AFTER_INTERVALS = 3
+
 
 class HealthCheckView(APIView):
     authentication_classes = []
@@ -37,3 +55,108 @@ class HealthCheckView(APIView):
                 },
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class HealthProber:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._result: Optional[dict[str, Any]] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def latest(self) -> dict[str, Any]:
+        self._ensure_started()
+        result = self._result
+        if result is None:
+            return self.refresh()
+        age = monotonic() - self._refreshed_at
+        if age > self.interval * STALE_AFTER_INTERVALS:
+            return {**result, "status": "error", "stale_seconds": round(age, 1)}
+        return result
+
+    def refresh(self) -> dict[str, Any]:
+        result = self.probe()
+        self._result = result
+        self._refreshed_at = monotonic()
+        return result
+
+    def probe(self) -> dict[str, Any]:
+        db = self._probe_db()
+        cache_check = self._probe_cache()
+        ready = db["status"] == "ok" and cache_check["status"] == "ok"
+        return {
+            "status": "ok" if ready else "error",
+            "checked_at": timezone.now().isoformat(),
+            "db": db,
+            "cache": cache_check,
+            "tmdb": tmdb_stats.snapshot(),
+            "workers": {
+                "in_flight_requests": in_flight_requests(),
+                "background": executor_stats(),
+                "details": details_pool.stats(),
+            },
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="health-prober", daemon=True
+                )
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Health probe failed")
+            finally:
+                connections.close_all()
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _probe_db() -> dict[str, Any]:
+        start = monotonic()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        except Exception as exc:
+            return {"status": "unavailable", "error": str(exc)}
+        return {"status": "ok", "latency_ms": round((monotonic() - start) * 1000, 2)}
+
+    @staticmethod
+    def _probe_cache() -> dict[str, Any]:
+        start = monotonic()
+        token = uuid.uuid4().hex
+        try:
+            cache.set("health:probe", token, timeout=60)
+            ok = cache.get("health:probe") == token
+        except Exception as exc:
+            return {"status": "unavailable", "error": str(exc)}
+        if not ok:
+            return {"status": "unavailable", "error": "cache round trip mismatch"}
+        return {"status": "ok", "latency_ms": round((monotonic() - start) * 1000, 2)}
+
+
+prober = HealthProber(interval=HEALTH_PROBE_INTERVAL)
+
+
+class ReadinessView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        result = prober.latest()
+        return Response(
+            result,
+            status=(
+                status.HTTP_200_OK
+                if result["status"] == "ok"
+                else status.HTTP_503_SERVICE_UNAVAILABLE
+            ),
+        )
@@ -0,0 +1,12 @@
+from django.http import HttpRequest, HttpResponse
+from django.views import View
+
+from core import metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsView(View):
+    def get(self, request: HttpRequest) -> HttpResponse:
+        body = metrics.render(metrics.collect())
+        return HttpResponse(body, content_type=PROMETHEUS_CONTENT_TYPE)
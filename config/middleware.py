@@ -0,0 +1,171 @@
+import json
+import logging
+import random
+import threading
+from time import perf_counter
+from typing import Any, Callable
+
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+
+from core import metrics, profiling, tracing
+from core.constants import (
+    PROFILE_SAMPLE_RATE,
+    PROFILE_TOKEN_MAX_AGE,
+    PROFILING_ENABLED,
+    TRACE_LOG,
+    TRACE_SAMPLE_RATE,
+    Headers,
+)
+
+logger = logging.getLogger("tracing")
+
+_in_flight = 0
+_lock = threading.Lock()
+
+
+def in_flight_requests() -> int:
+    return _in_flight
+
+
+class InFlightRequestsMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        global _in_flight
+        with _lock:
+            _in_flight += 1
+        try:
+            return self.get_response(request)
+        finally:
+            with _lock:
+                _in_flight -= 1
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        queries = _QueryCounter()
+        started = perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        elapsed = perf_counter() - started
+
+        match = request.resolver_match
+        route = match.route if match else "unmatched"
+        metrics.inc(
+            "http_requests_total",
+            {
+                "route": route,
+                "method": request.method or "",
+                "status": str(response.status_code),
+            },
+        )
+        metrics.observe(
+            "http_request_duration_seconds",
+            elapsed,
+            {"route": route, "method": request.method or ""},
+        )
+        metrics.observe("http_request_db_queries", queries.count, {"route": route})
+        return response
+
+
+class _QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute: Callable[..., Any], *args: Any) -> Any:
+        self.count += 1
+        return execute(*args)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if TRACE_SAMPLE_RATE <= 0 or random.random() >= TRACE_SAMPLE_RATE:
+            return self.get_response(request)
+
+        trace = tracing.Trace()
+        token = tracing.activate(trace)
+        started = perf_counter()
+        try:
+            with connection.execute_wrapper(_traced_query):
+                response = self.get_response(request)
+        finally:
+            tracing.deactivate(token)
+        elapsed = perf_counter() - started
+        trace.add("total", elapsed)
+
+        response["Server-Timing"] = trace.server_timing()
+        if TRACE_LOG:
+            logger.info(
+                json.dumps(
+                    {
+                        "path": request.path,
+                        "method": request.method,
+                        "status": response.status_code,
+                        "ms": round(elapsed * 1000, 2),
+                        "spans": trace.as_dict(),
+                    }
+                )
+            )
+        return response
+
+    def process_template_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        trace = tracing.current_trace()
+        if trace is not None:
+            started = perf_counter()
+            response.add_post_render_callback(
+                lambda _rendered: trace.add("render", perf_counter() - started)
+            )
+        return response
+
+
+def _traced_query(execute: Callable[..., Any], *args: Any) -> Any:
+    with tracing.span("db"):
+        return execute(*args)
+
+
+# Runs the request under cProfile when profiling is enabled and the request
+# carries a valid signed X-Profile-Token (see `manage.py profiles token`) or is
+# picked by PROFILE_SAMPLE_RATE. Profiles land in PROFILE_DIR.
+class ProfilingMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not PROFILING_ENABLED or not self._wanted(request):
+            return self.get_response(request)
+
+        capture = profiling.Capture()
+        if not capture.start():
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            capture.stop()
+
+        match = request.resolver_match
+        profiling.save(
+            capture,
+            {
+                "route": match.route if match else None,
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+            },
+        )
+        return response
+
+    def _wanted(self, request: HttpRequest) -> bool:
+        token = request.headers.get(Headers.PROFILE_TOKEN)
+        if token:
+            return profiling.verify_token(token, PROFILE_TOKEN_MAX_AGE)
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
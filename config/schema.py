@@ -0,0 +1,57 @@
+import hashlib
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.views import View
+from drf_spectacular.views import SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CONTENT_TYPE = "application/vnd.oai.openapi+json"
+
+
+@dataclass(frozen=True)
+class EncodedSchema:
+    body: bytes
+    etag: str
+
+
+@lru_cache(maxsize=1)
+def load_schema() -> Optional[EncodedSchema]:
+    path = Path(settings.OPENAPI_SCHEMA_FILE)
+    if not path.is_file():
+        # Cached, so this is logged once per process.
+        logger.error(
+            "OpenAPI schema file %s is missing; generating the schema per "
+            "request. Run `manage.py spectacular` at build time.",
+            path,
+        )
+        return None
+    body = path.read_bytes()
+    return EncodedSchema(body=body, etag=f'"{hashlib.sha256(body).hexdigest()}"')
+
+
+# Serves the schema written at build time by
+# `manage.py spectacular --format openapi-json --file openapi.json`. DEBUG
+# generates at runtime; outside DEBUG a missing file is logged as an error and
+# also falls back to runtime generation.
+class PrecomputedSchemaView(View):
+    runtime_view = staticmethod(SpectacularAPIView.as_view())
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        schema = None if settings.DEBUG else load_schema()
+        if schema is None:
+            return self.runtime_view(request, *args, **kwargs)
+
+        if schema.etag in request.headers.get("If-None-Match", ""):
+            response: HttpResponse = HttpResponseNotModified()
+        else:
+            response = HttpResponse(schema.body, content_type=SCHEMA_CONTENT_TYPE)
+        response["ETag"] = schema.etag
+        response["Cache-Control"] = "public, max-age=300"
+        return response
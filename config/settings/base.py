@@ -31,11 +31,16 @@ INSTALLED_APPS = [
     "rest_framework",
     "django_filters",
     "drf_spectacular",
+    "core",
     "favorites",
     "tmdb",
 ]
 
 MIDDLEWARE = [
+    "config.middleware.MetricsMiddleware",
+    "config.middleware.InFlightRequestsMiddleware",
+    "config.middleware.ServerTimingMiddleware",
+    "config.middleware.ProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -77,6 +82,27 @@ DATABASES = {
     }
 }
 
+# One cache shared by every worker on the host; LocMemCache (per process)
+# when unset. Put the file on tmpfs, e.g. /dev/shm/tmdb-cache.
+SHARED_CACHE_PATH = env("SHARED_CACHE_PATH", default="")
+if SHARED_CACHE_PATH:
+    CACHES = {
+        "default": {
+            "BACKEND": "core.shm_cache.SharedMemoryCache",
+            "LOCATION": SHARED_CACHE_PATH,
+            # SETS x WAYS slots of SLOT_SIZE bytes (128 MiB by default). A
+            # pickled value larger than a slot is not cached (counted in
+            # shm_cache_rejected_total). 64 KiB fits a 20-result discover page
+            # in either form (~14 KiB as a dict, ~20 KiB pre-encoded), which
+            # a 16 KiB slot did not.
+            "OPTIONS": {
+                "SETS": env.int("SHARED_CACHE_SETS", default=256),
+                "WAYS": env.int("SHARED_CACHE_WAYS", default=8),
+                "SLOT_SIZE": env.int("SHARED_CACHE_SLOT_SIZE", default=64 * 1024),
+            },
+        }
+    }
+
 LANGUAGE_CODE = "pt-br"
 TIME_ZONE = "America/Bahia"
 USE_I18N = True
@@ -115,6 +141,8 @@ SPECTACULAR_SETTINGS: dict[
     },
 }
 
+OPENAPI_SCHEMA_FILE = env("OPENAPI_SCHEMA_FILE", default=str(BASE_DIR / "openapi.json"))
+
 CORS_ALLOWED_ORIGINS = [
     o.strip() for o in env("CORS_ALLOWED_ORIGINS", default="").split(",") if o
 ]
@@ -132,3 +160,73 @@ LOGGING = {
 }
 
 TMDB_BEARER = env("TMDB_API_KEY", default="")
+TMDB_API_BASE = env("TMDB_API_BASE", default="https://api.themoviedb.org/3")
+TMDB_CONCURRENCY_WORKERS = env.int("TMDB_CONCURRENCY_WORKERS", default=8)
+TMDB_FAVORITES_DEADLINE = env.float("TMDB_FAVORITES_DEADLINE", default=3.0)
+# Raise (e.g. 86400) once `manage.py sync_tmdb_changes` runs periodically.
+TMDB_MOVIE_CACHE_TTL = env.int("TMDB_MOVIE_CACHE_TTL", default=600)
+# Cache TTL by TMDb path: first matching regex wins. Override with JSON, e.g.
+# TMDB_TTL_POLICY='[["^/discover/movie$", 300]]'. Each TTL is randomized by
+# +/-TMDB_TTL_JITTER, and entries read TMDB_TTL_POPULAR_HITS times before
+# expiring are refilled with TMDB_TTL_POPULAR_FACTOR times the TTL (0 = off).
+# Movie sub-resources default to TMDB_MOVIE_CACHE_TTL; longer credits or
+# providers TTLs (e.g. 86400 / 21600) are only safe while sync_tmdb_changes
+# runs, since that job is what invalidates them when TMDb edits a movie.
+TMDB_TTL_POLICY = env.json(
+    "TMDB_TTL_POLICY",
+    default=[
+        [r"^/discover/movie$", 600],
+        [r"^/movie/\d+/credits$", TMDB_MOVIE_CACHE_TTL],
+        [r"^/movie/\d+/watch/providers$", TMDB_MOVIE_CACHE_TTL],
+        [r"^/movie/\d+$", TMDB_MOVIE_CACHE_TTL],
+    ],
+)
+TMDB_TTL_JITTER = env.float("TMDB_TTL_JITTER", default=0.1)
+TMDB_TTL_POPULAR_HITS = env.int("TMDB_TTL_POPULAR_HITS", default=0)
+TMDB_TTL_POPULAR_FACTOR = env.float("TMDB_TTL_POPULAR_FACTOR", default=2.0)
+TMDB_PASSTHROUGH = env.bool("TMDB_PASSTHROUGH", default=False)
+TMDB_DETAILS_DEADLINE = env.float("TMDB_DETAILS_DEADLINE", default=3.0)
+# Details sections run on their own pool; misses beyond the busy workers plus
+# TMDB_DETAILS_MAX_QUEUED are answered as partial instead of queueing.
+TMDB_DETAILS_WORKERS = env.int("TMDB_DETAILS_WORKERS", default=8)
+TMDB_DETAILS_MAX_QUEUED = env.int("TMDB_DETAILS_MAX_QUEUED", default=32)
+# Warm discover page N+1 after serving page N (infinite scroll). Speculative
+# calls are capped at TMDB_PREFETCH_RATE per second, bursting to _BURST.
+TMDB_PREFETCH_NEXT_PAGE = env.bool("TMDB_PREFETCH_NEXT_PAGE", default=False)
+TMDB_PREFETCH_WORKERS = env.int("TMDB_PREFETCH_WORKERS", default=2)
+TMDB_PREFETCH_MAX_PENDING = env.int("TMDB_PREFETCH_MAX_PENDING", default=16)
+TMDB_PREFETCH_RATE = env.float("TMDB_PREFETCH_RATE", default=5.0)
+TMDB_PREFETCH_BURST = env.float("TMDB_PREFETCH_BURST", default=10.0)
+# Warm details for the top K discover/search results ("position" or
+# "popularity" order); 0 disables. Rates count TMDb calls, four per movie.
+TMDB_PREFETCH_DETAILS_TOP_K = env.int("TMDB_PREFETCH_DETAILS_TOP_K", default=0)
+TMDB_PREFETCH_DETAILS_ORDER = env("TMDB_PREFETCH_DETAILS_ORDER", default="position")
+TMDB_PREFETCH_DETAILS_RATE = env.float("TMDB_PREFETCH_DETAILS_RATE", default=8.0)
+TMDB_PREFETCH_DETAILS_BURST = env.float("TMDB_PREFETCH_DETAILS_BURST", default=40.0)
+TMDB_STATS_WINDOW = env.int("TMDB_STATS_WINDOW", default=300)
+HEALTH_PROBE_INTERVAL = env.float("HEALTH_PROBE_INTERVAL", default=5.0)
+METRICS_DIR = env("METRICS_DIR", default="")
+METRICS_FLUSH_INTERVAL = env.float("METRICS_FLUSH_INTERVAL", default=5.0)
+TRACE_SAMPLE_RATE = env.float("TRACE_SAMPLE_RATE", default=0.0)
+TRACE_LOG = env.bool("TRACE_LOG", default=False)
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=False)
+PROFILE_SAMPLE_RATE = env.float("PROFILE_SAMPLE_RATE", default=0.0)
+PROFILE_TOKEN_MAX_AGE = env.int("PROFILE_TOKEN_MAX_AGE", default=3600)
+PROFILE_DIR = env("PROFILE_DIR", default=str(BASE_DIR / "profiles"))
+# Absolute URL of the images/ route, e.g. https://api.example.com/api/v1/images;
+# leave empty to hand out TMDb CDN URLs directly.
+IMAGE_PROXY_URL = env("IMAGE_PROXY_URL", default="")
+IMAGE_CACHE_DIR = env("IMAGE_CACHE_DIR", default=str(BASE_DIR / "image_cache"))
+IMAGE_CACHE_MAX_BYTES = env.int("IMAGE_CACHE_MAX_BYTES", default=1024 * 1024 * 1024)
+
+FAVORITES_REPLICA_ENABLED = env.bool("FAVORITES_REPLICA_ENABLED", default=False)
+FAVORITES_REPLICA_MAX_AGE = env.int("FAVORITES_REPLICA_MAX_AGE", default=300)
+# How long a bearer stays allowed to read an account's replica after TMDb
+# accepted it for that account.
+FAVORITES_ACCESS_TTL = env.int("FAVORITES_ACCESS_TTL", default=3600)
+# How long a bearer TMDb refused for an account stays refused without asking.
+FAVORITES_ACCESS_NEGATIVE_TTL = env.int("FAVORITES_ACCESS_NEGATIVE_TTL", default=30)
+FAVORITE_IDS_CACHE_TTL = env.int("FAVORITE_IDS_CACHE_TTL", default=60)
+SHARED_LIST_RESOLVE_TTL = env.int("SHARED_LIST_RESOLVE_TTL", default=3600)
+SHARED_LIST_NEGATIVE_TTL = env.int("SHARED_LIST_NEGATIVE_TTL", default=30)
+SHARED_LIST_RENDER_TTL = env.int("SHARED_LIST_RENDER_TTL", default=300)
@@ -1,2 +1,4 @@
+from .base import *  # noqa
+
 DEBUG = False
 CORS_ALLOW_ALL_ORIGINS = False
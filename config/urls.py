@@ -1,13 +1,17 @@
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
 
-from config.health import HealthCheckView
+from config.health import HealthCheckView, ReadinessView
+from config.metrics import MetricsView
+from config.schema import PrecomputedSchemaView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", HealthCheckView.as_view(), name="healthcheck"),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("ready/", ReadinessView.as_view(), name="readiness"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("api/schema/", PrecomputedSchemaView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema")),
     path("api/v1/", include("tmdb.urls")),
     path("api/v1/", include("favorites.urls")),
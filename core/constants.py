@@ -6,8 +6,77 @@ TMDB_API_BASE: str = getattr(settings, "TMDB_API_BASE", "https://api.themoviedb.
 TMDB_IMAGE_BASE: str = getattr(
     settings, "TMDB_IMAGE_BASE", "https://image.tmdb.org/t/p/"
 )
+IMAGE_PROXY_URL: str = getattr(settings, "IMAGE_PROXY_URL", "")
+IMAGE_CACHE_MAX_BYTES: int = int(
+    getattr(settings, "IMAGE_CACHE_MAX_BYTES", 1024 * 1024 * 1024)
+)
 TMDB_DEFAULT_LANG: str = getattr(settings, "TMDB_DEFAULT_LANG", "en-US")
+TMDB_DEFAULT_REGION: str = getattr(settings, "TMDB_DEFAULT_REGION", "BR")
 TMDB_REQUEST_TIMEOUT: int = int(getattr(settings, "TMDB_REQUEST_TIMEOUT", 10))
+TMDB_CONCURRENCY_WORKERS: int = int(getattr(settings, "TMDB_CONCURRENCY_WORKERS", 8))
+TMDB_FAVORITES_DEADLINE: float = float(
+    getattr(settings, "TMDB_FAVORITES_DEADLINE", 3.0)
+)
+TMDB_MOVIE_CACHE_TTL: int = int(getattr(settings, "TMDB_MOVIE_CACHE_TTL", 600))
+TMDB_PASSTHROUGH: bool = bool(getattr(settings, "TMDB_PASSTHROUGH", False))
+TMDB_DETAILS_DEADLINE: float = float(getattr(settings, "TMDB_DETAILS_DEADLINE", 3.0))
+TMDB_DETAILS_WORKERS: int = int(getattr(settings, "TMDB_DETAILS_WORKERS", 8))
+TMDB_DETAILS_MAX_QUEUED: int = int(getattr(settings, "TMDB_DETAILS_MAX_QUEUED", 32))
+TMDB_PREFETCH_NEXT_PAGE: bool = bool(
+    getattr(settings, "TMDB_PREFETCH_NEXT_PAGE", False)
+)
+TMDB_PREFETCH_WORKERS: int = int(getattr(settings, "TMDB_PREFETCH_WORKERS", 2))
+TMDB_PREFETCH_MAX_PENDING: int = int(getattr(settings, "TMDB_PREFETCH_MAX_PENDING", 16))
+TMDB_PREFETCH_RATE: float = float(getattr(settings, "TMDB_PREFETCH_RATE", 5.0))
+TMDB_PREFETCH_BURST: float = float(getattr(settings, "TMDB_PREFETCH_BURST", 10.0))
+# Warm details for the top K list results; 0 disables. Order is "position"
+# or "popularity".
+TMDB_PREFETCH_DETAILS_TOP_K: int = int(
+    getattr(settings, "TMDB_PREFETCH_DETAILS_TOP_K", 0)
+)
+TMDB_PREFETCH_DETAILS_ORDER: str = getattr(
+    settings, "TMDB_PREFETCH_DETAILS_ORDER", "position"
+)
+TMDB_PREFETCH_DETAILS_RATE: float = float(
+    getattr(settings, "TMDB_PREFETCH_DETAILS_RATE", 8.0)
+)
+TMDB_PREFETCH_DETAILS_BURST: float = float(
+    getattr(settings, "TMDB_PREFETCH_DETAILS_BURST", 40.0)
+)
+# TMDb rejects discover pages past this one.
+TMDB_DISCOVER_MAX_PAGE = 500
+# (path regex, seconds) pairs; see tmdb.ttl.
+TMDB_TTL_POLICY: list = list(getattr(settings, "TMDB_TTL_POLICY", []))
+TMDB_TTL_JITTER: float = float(getattr(settings, "TMDB_TTL_JITTER", 0.1))
+TMDB_TTL_POPULAR_HITS: int = int(getattr(settings, "TMDB_TTL_POPULAR_HITS", 0))
+TMDB_TTL_POPULAR_FACTOR: float = float(
+    getattr(settings, "TMDB_TTL_POPULAR_FACTOR", 2.0)
+)
+TMDB_STATS_WINDOW: int = int(getattr(settings, "TMDB_STATS_WINDOW", 300))
+HEALTH_PROBE_INTERVAL: float = float(getattr(settings, "HEALTH_PROBE_INTERVAL", 5.0))
+METRICS_DIR: str = getattr(settings, "METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL: float = float(getattr(settings, "METRICS_FLUSH_INTERVAL", 5.0))
+TRACE_SAMPLE_RATE: float = float(getattr(settings, "TRACE_SAMPLE_RATE", 0.0))
+TRACE_LOG: bool = bool(getattr(settings, "TRACE_LOG", False))
+PROFILING_ENABLED: bool = bool(getattr(settings, "PROFILING_ENABLED", False))
+PROFILE_SAMPLE_RATE: float = float(getattr(settings, "PROFILE_SAMPLE_RATE", 0.0))
+PROFILE_TOKEN_MAX_AGE: int = int(getattr(settings, "PROFILE_TOKEN_MAX_AGE", 3600))
+
+FAVORITES_REPLICA_ENABLED: bool = bool(
+    getattr(settings, "FAVORITES_REPLICA_ENABLED", False)
+)
+FAVORITES_REPLICA_MAX_AGE: int = int(
+    getattr(settings, "FAVORITES_REPLICA_MAX_AGE", 300)
+)
+FAVORITES_PAGE_SIZE: int = 20
+FAVORITES_ACCESS_TTL: int = int(getattr(settings, "FAVORITES_ACCESS_TTL", 3600))
+FAVORITES_ACCESS_NEGATIVE_TTL: int = int(
+    getattr(settings, "FAVORITES_ACCESS_NEGATIVE_TTL", 30)
+)
+FAVORITE_IDS_CACHE_TTL: int = int(getattr(settings, "FAVORITE_IDS_CACHE_TTL", 60))
+SHARED_LIST_RESOLVE_TTL: int = int(getattr(settings, "SHARED_LIST_RESOLVE_TTL", 3600))
+SHARED_LIST_NEGATIVE_TTL: int = int(getattr(settings, "SHARED_LIST_NEGATIVE_TTL", 30))
+SHARED_LIST_RENDER_TTL: int = int(getattr(settings, "SHARED_LIST_RENDER_TTL", 300))
 
 
 class TMDBPaths:
@@ -19,6 +88,7 @@ class TMDBPaths:
     MOVIE_PROVIDERS = "/movie/{tmdb_id}/watch/providers"
     MOVIE_CREDITS = "/movie/{tmdb_id}/credits"
     SEARCH_MOVIE = "/search/movie"
+    MOVIE_CHANGES = "/movie/changes"
 
 
 class Headers:
@@ -27,10 +97,12 @@ class Headers:
     CONTENT_TYPE = "Content-Type"
     JSON_CT = "application/json"
     JSON_UTF8 = "application/json;charset=utf-8"
+    PROFILE_TOKEN = "X-Profile-Token"
 
 
 class QueryParams:
     LANGUAGE = "language"
+    REGION = "region"
     PAGE = "page"
     SORT_BY = "sort_by"
     INCLUDE_ADULT = "include_adult"
@@ -64,6 +136,7 @@ class Docs:
         DISCOVER = "Discover movies"
         SEARCH = "Search movies by title"
         DETAILS = "Get movie details"
+        IMAGE = "Get a poster, backdrop, logo or profile image"
 
         FAV_LIST = "List favorite movies"
         FAV_POST = "Favorite or unfavorite a movie"
@@ -80,7 +153,14 @@ class Docs:
         SEARCH = (
             "Searches TMDb by movie title and flags favorites for the given account_id."
         )
-        DETAILS = "Returns detailed information including videos, providers in Brazil, and credits."
+        DETAILS = (
+            "Returns detailed information including videos, watch providers for the "
+            "requested region (default BR), and credits."
+        )
+        IMAGE = (
+            "Proxies a TMDb image at the given size through the local disk cache. "
+            "Responses are immutable and long-cacheable."
+        )
 
         FAV_LIST = "Returns favorite movies from TMDb and appends the latest saved list_name (if any)."
         FAV_POST = "Toggles favorite on TMDb for the given account_id and movie_id."
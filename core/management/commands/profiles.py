@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core import profiling
+from core.constants import PROFILE_TOKEN_MAX_AGE, Headers
+
+
+class Command(BaseCommand):
+    help = (
+        "Works with request profiles captured by ProfilingMiddleware: list them, "
+        "summarize the top frames across them, or mint a signed "
+        f"{Headers.PROFILE_TOKEN} header value."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        actions = parser.add_subparsers(dest="action", required=True)
+
+        listing = actions.add_parser("list", help="List captured profiles.")
+        listing.add_argument("--route", default=None)
+
+        summary = actions.add_parser("summary", help="Top frames across profiles.")
+        summary.add_argument("--route", default=None)
+        summary.add_argument(
+            "--sort",
+            default="cumulative",
+            choices=("cumulative", "tottime", "ncalls"),
+        )
+        summary.add_argument("--limit", type=int, default=25)
+        summary.add_argument(
+            "--last", type=int, default=None, help="Only the N most recent."
+        )
+
+        token = actions.add_parser("token", help="Print a signed profiling token.")
+        token.add_argument("--label", default="", help="Who/why, kept in the token.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        action = options["action"]
+        if action == "token":
+            self.stdout.write(profiling.make_token(options["label"]))
+            self.stderr.write(
+                f"Send as {Headers.PROFILE_TOKEN}; valid for "
+                f"{PROFILE_TOKEN_MAX_AGE}s while PROFILING_ENABLED is on."
+            )
+            return
+
+        profiles = profiling.list_profiles(route=options["route"])
+        if action == "list":
+            for profile in profiles:
+                meta = profile.meta
+                captured = meta.get("captured_at")
+                when = (
+                    datetime.fromtimestamp(captured, tz=timezone.utc).isoformat(
+                        timespec="seconds"
+                    )
+                    if captured
+                    else "?"
+                )
+                self.stdout.write(
+                    f"{when}  {meta.get('ms', '?'):>9} ms  {meta.get('status', '?')}  "
+                    f"{meta.get('method', '?')} {meta.get('path', '?')}  "
+                    f"{profile.path.name}"
+                )
+            self.stdout.write(f"{len(profiles)} profiles in {profiling.profile_dir()}")
+            return
+
+        if options["last"]:
+            profiles = profiles[-options["last"] :]
+        if not profiles:
+            raise CommandError("No profiles captured.")
+        self.stdout.write(
+            f"{len(profiles)} profiles, "
+            f"{sum(p.meta.get('ms', 0) for p in profiles) / len(profiles):.1f} ms mean"
+        )
+        self.stdout.write(
+            profiling.summarize(profiles, sort=options["sort"], limit=options["limit"])
+        )
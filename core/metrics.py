@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Optional
+
+from core.constants import METRICS_DIR, METRICS_FLUSH_INTERVAL
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+TTL_BUCKETS = (60, 300, 600, 1800, 3600, 21600, 86400, 604800)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+METRICS: dict[str, tuple[str, str, tuple[float, ...]]] = {
+    "http_requests_total": (COUNTER, "HTTP requests by route and status.", ()),
+    "http_request_duration_seconds": (
+        HISTOGRAM,
+        "HTTP request latency by route.",
+        LATENCY_BUCKETS,
+    ),
+    "http_request_db_queries": (
+        HISTOGRAM,
+        "Database queries issued per HTTP request.",
+        COUNT_BUCKETS,
+    ),
+    "tmdb_requests_total": (COUNTER, "TMDb calls by path and status.", ()),
+    "tmdb_request_duration_seconds": (
+        HISTOGRAM,
+        "TMDb call latency by path.",
+        LATENCY_BUCKETS,
+    ),
+    "tmdb_cache_requests_total": (COUNTER, "TMDb response cache lookups.", ()),
+    "tmdb_cache_bytes_total": (COUNTER, "Bytes fetched from TMDb into the cache.", ()),
+    "tmdb_cache_ttl_seconds": (
+        HISTOGRAM,
+        "Effective TTL of TMDb cache writes by policy rule.",
+        TTL_BUCKETS,
+    ),
+    "shm_cache_rejected_total": (
+        COUNTER,
+        "Shared-memory cache writes dropped because the value exceeds a slot.",
+        (),
+    ),
+    "tmdb_prefetch_total": (COUNTER, "Speculative cache fills by outcome.", ()),
+    "tmdb_prefetch_used_total": (
+        COUNTER,
+        "Prefetched entries later read by a request.",
+        (),
+    ),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], list[float]] = {}
+
+    def inc(
+        self, name: str, labels: Optional[dict[str, str]] = None, amount: float = 1.0
+    ) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def observe(
+        self, name: str, value: float, labels: Optional[dict[str, str]] = None
+    ) -> None:
+        buckets = METRICS[name][2]
+        key = (name, _labels(labels))
+        with self._lock:
+            # Per-bucket counts followed by sum and count; made cumulative on render.
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0.0] * (len(buckets) + 3)
+            series[bisect_left(buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> dict[str, list]:
+        with self._lock:
+            return {
+                "counters": [
+                    [name, list(labels), value]
+                    for (name, labels), value in self._counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), list(values)]
+                    for (name, labels), values in self._histograms.items()
+                ],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _labels(labels: Optional[dict[str, str]]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+registry = Registry()
+
+
+def inc(
+    name: str, labels: Optional[dict[str, str]] = None, amount: float = 1.0
+) -> None:
+    registry.inc(name, labels, amount)
+    _ensure_flusher()
+
+
+def observe(name: str, value: float, labels: Optional[dict[str, str]] = None) -> None:
+    registry.observe(name, value, labels)
+    _ensure_flusher()
+
+
+# Multi-process aggregation: with METRICS_DIR set (shared by all workers on a
+# host), each process periodically writes its snapshot there and a scrape on
+# any worker sums every snapshot in the directory. A scrape folds snapshots of
+# exited workers into `archive.json` before deleting them, so counters and
+# histograms never go backwards when a worker is recycled.
+
+ARCHIVE_FILE = "archive.json"
+
+
+def _metrics_dir() -> Optional[Path]:
+    return Path(METRICS_DIR) if METRICS_DIR else None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_flusher_started = False
+_flusher_lock = threading.Lock()
+
+
+def _ensure_flusher() -> None:
+    global _flusher_started
+    if _flusher_started:
+        return
+    with _flusher_lock:
+        if _flusher_started:
+            return
+        _flusher_started = True
+        if _metrics_dir() is not None:
+            threading.Thread(
+                target=_flush_loop, name="metrics-flusher", daemon=True
+            ).start()
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        flush()
+
+
+def flush() -> None:
+    directory = _metrics_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"metrics-{os.getpid()}.json"
+    tmp = target.with_suffix(".tmp")
+    tmp.write_text(json.dumps(registry.snapshot()))
+    os.replace(tmp, target)
+
+
+def collect() -> list[dict[str, list]]:
+    directory = _metrics_dir()
+    if directory is None:
+        return [registry.snapshot()]
+
+    flush()
+    _archive_exited(directory)
+    snapshots = []
+    for path in [directory / ARCHIVE_FILE, *sorted(directory.glob("metrics-*.json"))]:
+        snapshot = _read_snapshot(path)
+        if snapshot is not None:
+            snapshots.append(snapshot)
+    return snapshots
+
+
+def _archive_exited(directory: Path) -> None:
+    exited = []
+    for path in directory.glob("metrics-*.json"):
+        pid = path.stem.removeprefix("metrics-")
+        if pid.isdigit() and not _pid_alive(int(pid)):
+            exited.append(path)
+    if not exited:
+        return
+    # Serialized across workers so a snapshot is archived exactly once; the
+    # archive is written before the snapshots are removed.
+    with open(directory / "archive.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive = directory / ARCHIVE_FILE
+        snapshots = [_read_snapshot(archive)]
+        snapshots += [_read_snapshot(path) for path in exited]
+        tmp = archive.with_suffix(".tmp")
+        tmp.write_text(json.dumps(_snapshot(*_merge(s for s in snapshots if s))))
+        os.replace(tmp, archive)
+        for path in exited:
+            path.unlink(missing_ok=True)
+
+
+def _read_snapshot(path: Path) -> Optional[dict[str, list]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _merge(
+    snapshots: Iterable[dict[str, list]],
+) -> tuple[dict[tuple[str, Labels], float], dict[tuple[str, Labels], list[float]]]:
+    counters: dict[tuple[str, Labels], float] = {}
+    histograms: dict[tuple[str, Labels], list[float]] = {}
+    for snap in snapshots:
+        for name, labels, value in snap.get("counters", []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, values in snap.get("histograms", []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            merged = histograms.setdefault(key, [0.0] * len(values))
+            for i, value in enumerate(values):
+                merged[i] += value
+    return counters, histograms
+
+
+def _snapshot(
+    counters: dict[tuple[str, Labels], float],
+    histograms: dict[tuple[str, Labels], list[float]],
+) -> dict[str, list]:
+    return {
+        "counters": [
+            [name, [list(pair) for pair in labels], value]
+            for (name, labels), value in counters.items()
+        ],
+        "histograms": [
+            [name, [list(pair) for pair in labels], values]
+            for (name, labels), values in histograms.items()
+        ],
+    }
+
+
+def render(snapshots: Iterable[dict[str, list]]) -> str:
+    counters, histograms = _merge(snapshots)
+
+    lines: list[str] = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == COUNTER:
+            for (series, labels), value in sorted(counters.items()):
+                if series == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_num(value)}")
+            continue
+        for (series, labels), values in sorted(histograms.items()):
+            if series != name:
+                continue
+            cumulative = 0.0
+            for bound, count in zip((*buckets, "+Inf"), values):
+                cumulative += count
+                le = labels + (("le", str(bound)),)
+                lines.append(f"{name}_bucket{_format_labels(le)} {_num(cumulative)}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_num(values[-2])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {_num(values[-1])}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.core import signing
+
+TOKEN_SALT = "core.profiling"
+
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+
+# cProfile refuses to run two profilers at once in one interpreter, so only one
+# request per process is profiled at a time; the rest run normally.
+_active = threading.Lock()
+
+
+def make_token(label: str = "") -> str:
+    return signing.dumps({"label": label}, salt=TOKEN_SALT)
+
+
+def verify_token(token: str, max_age: int) -> bool:
+    try:
+        signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR)
+
+
+class Capture:
+    def __init__(self) -> None:
+        self.profiler = cProfile.Profile()
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> bool:
+        if not _active.acquire(blocking=False):
+            return False
+        self.started = time.perf_counter()
+        self.profiler.enable()
+        return True
+
+    def stop(self) -> None:
+        self.profiler.disable()
+        self.elapsed = time.perf_counter() - self.started
+        _active.release()
+
+
+def save(capture: Capture, meta: dict[str, Any]) -> Path:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+    slug = _SLUG.sub("-", meta.get("route") or "unmatched").strip("-") or "root"
+    base = directory / f"{stamp}-{os.getpid()}-{time.monotonic_ns() % 10**6}-{slug}"
+    capture.profiler.dump_stats(f"{base}.prof")
+    meta = {
+        **meta,
+        "ms": round(capture.elapsed * 1000, 2),
+        "captured_at": time.time(),
+        "pid": os.getpid(),
+    }
+    Path(f"{base}.json").write_text(json.dumps(meta))
+    return Path(f"{base}.prof")
+
+
+@dataclass(frozen=True)
+class Profile:
+    path: Path
+    meta: dict[str, Any]
+
+
+def list_profiles(route: Optional[str] = None) -> list[Profile]:
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in sorted(directory.glob("*.prof")):
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text())
+        except (OSError, ValueError):
+            meta = {}
+        if route is None or meta.get("route") == route:
+            profiles.append(Profile(path=path, meta=meta))
+    return profiles
+
+
+def summarize(
+    profiles: Iterable[Profile], sort: str = "cumulative", limit: int = 25
+) -> str:
+    paths = [str(p.path) for p in profiles]
+    if not paths:
+        return ""
+    out = io.StringIO()
+    stats = pstats.Stats(*paths, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+
+from core import metrics
+
+# A fixed-size, set-associative hash table in a memory-mapped file shared by
+# every process on the host (put LOCATION on tmpfs, e.g. /dev/shm). A key hashes
+# to one set of WAYS slots; a full set evicts its least recently read slot.
+# Sets are guarded by fcntl byte-range locks across processes plus striped
+# thread locks inside a process, since fcntl locks are per process. Values
+# larger than SLOT_SIZE are not cached.
+#
+# The geometry is part of the file name, so processes configured differently
+# (e.g. old and new workers during a deploy) use separate files. A file is
+# never truncated while another process may have it mapped; one whose header
+# does not match its name is refused.
+
+_MAGIC = b"TMDBSHM1"
+# magic, sets, ways, slot_size
+_FILE_HEADER = struct.Struct("<8sIII")
+_FILE_HEADER_SIZE = 64
+# key digest, expires_at, last_access, value length
+_SLOT_HEADER = struct.Struct("<16sddI")
+_SLOT_HEADER_SIZE = 40
+_EMPTY_DIGEST = bytes(16)
+_NEVER = float("inf")
+_THREAD_STRIPES = 64
+
+
+class SharedMemoryCache(BaseCache):
+    def __init__(self, location: str, params: dict[str, Any]) -> None:
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.sets = int(options.get("SETS", 256))
+        self.ways = int(options.get("WAYS", 8))
+        self.slot_size = int(options.get("SLOT_SIZE", 64 * 1024))
+        self.path = f"{location}.{self.sets}x{self.ways}x{self.slot_size}"
+        self._slot_stride = _SLOT_HEADER_SIZE + self.slot_size
+        self._set_stride = self._slot_stride * self.ways
+        self._size = _FILE_HEADER_SIZE + self._set_stride * self.sets
+        self._thread_locks = [threading.Lock() for _ in range(_THREAD_STRIPES)]
+        self._open_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._fd = -1
+        self._map: Optional[mmap.mmap] = None
+
+    # Storage
+
+    def _mapping(self) -> mmap.mmap:
+        # Re-opened after fork so each process holds its own descriptor.
+        if self._pid == os.getpid() and self._map is not None:
+            return self._map
+        with self._open_lock:
+            if self._pid != os.getpid() or self._map is None:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.lockf(fd, fcntl.LOCK_EX)
+                try:
+                    self._initialize(fd)
+                except BaseException:
+                    os.close(fd)  # also releases the lock
+                    raise
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+                self._map = mmap.mmap(fd, self._size, mmap.MAP_SHARED)
+                self._fd = fd
+                self._pid = os.getpid()
+        return self._map
+
+    def _initialize(self, fd: int) -> None:
+        # Runs under an exclusive lock on the whole file. A new (empty) file
+        # is sized and stamped; a file that is already sized only gets the
+        # header if a previous process died before writing it.
+        header = _FILE_HEADER.pack(_MAGIC, self.sets, self.ways, self.slot_size)
+        size = os.fstat(fd).st_size
+        if size == 0:
+            os.ftruncate(fd, self._size)
+        elif size != self._size:
+            raise ImproperlyConfigured(
+                f"{self.path} is {size} bytes, expected {self._size}"
+            )
+        raw = os.pread(fd, _FILE_HEADER.size, 0)
+        if raw == bytes(_FILE_HEADER.size):
+            os.pwrite(fd, header, 0)
+        elif raw != header:
+            raise ImproperlyConfigured(f"{self.path} has an unexpected header")
+
+    def _locate(self, key: str) -> tuple[bytes, int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        return digest, int.from_bytes(digest[:8], "little") % self.sets
+
+    @contextmanager
+    def _locked(self, set_index: int, exclusive: bool) -> Iterator[mmap.mmap]:
+        mapping = self._mapping()
+        start = _FILE_HEADER_SIZE + set_index * self._set_stride
+        with self._thread_locks[set_index % _THREAD_STRIPES]:
+            fcntl.lockf(
+                self._fd,
+                fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH,
+                self._set_stride,
+                start,
+            )
+            try:
+                yield mapping
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self._set_stride, start)
+
+    def _slots(self, set_index: int) -> range:
+        start = _FILE_HEADER_SIZE + set_index * self._set_stride
+        return range(start, start + self._set_stride, self._slot_stride)
+
+    def _find(
+        self, mapping: mmap.mmap, set_index: int, digest: bytes, now: float
+    ) -> Optional[tuple[int, int]]:
+        for offset in self._slots(set_index):
+            slot_digest, expires_at, _, length = _SLOT_HEADER.unpack_from(
+                mapping, offset
+            )
+            if slot_digest == digest:
+                if expires_at <= now:
+                    return None
+                return offset, length
+        return None
+
+    def _victim(self, mapping: mmap.mmap, set_index: int, digest: bytes) -> int:
+        # The key's own slot, else an empty one, else the expired or least
+        # recently read one.
+        now = time.time()
+        empty, victim, oldest = -1, -1, _NEVER
+        for offset in self._slots(set_index):
+            slot_digest, expires_at, last_access, _ = _SLOT_HEADER.unpack_from(
+                mapping, offset
+            )
+            if slot_digest == digest:
+                return offset
+            if slot_digest == _EMPTY_DIGEST:
+                if empty < 0:
+                    empty = offset
+                continue
+            if expires_at <= now:
+                last_access = -1.0
+            if last_access < oldest:
+                victim, oldest = offset, last_access
+        return empty if empty >= 0 else victim
+
+    def _write(
+        self,
+        mapping: mmap.mmap,
+        offset: int,
+        digest: bytes,
+        expires_at: float,
+        value: bytes,
+    ) -> None:
+        start = offset + _SLOT_HEADER_SIZE
+        mapping[start : start + len(value)] = value
+        _SLOT_HEADER.pack_into(
+            mapping, offset, digest, expires_at, time.time(), len(value)
+        )
+
+    def _evict(self, mapping: mmap.mmap, set_index: int, digest: bytes) -> None:
+        for offset in self._slots(set_index):
+            if mapping[offset : offset + 16] == digest:
+                _SLOT_HEADER.pack_into(mapping, offset, _EMPTY_DIGEST, 0.0, 0.0, 0)
+
+    def _expiry(self, timeout: Any) -> float:
+        expires_at = self.get_backend_timeout(timeout)
+        return _NEVER if expires_at is None else expires_at
+
+    def _store(
+        self, key: str, value: Any, timeout: Any, version: Optional[int], only_new: bool
+    ) -> bool:
+        key = self.make_and_validate_key(key, version=version)
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        digest, set_index = self._locate(key)
+        with self._locked(set_index, exclusive=True) as mapping:
+            if len(data) > self.slot_size:
+                self._evict(mapping, set_index, digest)
+                metrics.inc("shm_cache_rejected_total", {"reason": "too_large"})
+                return False
+            if only_new and self._find(mapping, set_index, digest, time.time()):
+                return False
+            offset = self._victim(mapping, set_index, digest)
+            self._write(mapping, offset, digest, self._expiry(timeout), data)
+        return True
+
+    # BaseCache API
+
+    def add(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        return self._store(key, value, timeout, version, only_new=True)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        self._store(key, value, timeout, version, only_new=False)
+
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        key = self.make_and_validate_key(key, version=version)
+        digest, set_index = self._locate(key)
+        with self._locked(set_index, exclusive=False) as mapping:
+            found = self._find(mapping, set_index, digest, time.time())
+            if found is None:
+                return default
+            offset, length = found
+            start = offset + _SLOT_HEADER_SIZE
+            data = mapping[start : start + length]
+            # Racy under a shared lock, but only ever an approximate LRU clock.
+            struct.pack_into("<d", mapping, offset + 24, time.time())
+        return pickle.loads(data)
+
+    def touch(
+        self, key: str, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> bool:
+        key = self.make_and_validate_key(key, version=version)
+        digest, set_index = self._locate(key)
+        with self._locked(set_index, exclusive=True) as mapping:
+            found = self._find(mapping, set_index, digest, time.time())
+            if found is None:
+                return False
+            struct.pack_into("<d", mapping, found[0] + 16, self._expiry(timeout))
+        return True
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        key = self.make_and_validate_key(key, version=version)
+        digest, set_index = self._locate(key)
+        with self._locked(set_index, exclusive=True) as mapping:
+            found = self._find(mapping, set_index, digest, time.time())
+            self._evict(mapping, set_index, digest)
+        return found is not None
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        key = self.make_and_validate_key(key, version=version)
+        digest, set_index = self._locate(key)
+        with self._locked(set_index, exclusive=False) as mapping:
+            return self._find(mapping, set_index, digest, time.time()) is not None
+
+    def clear(self) -> None:
+        for set_index in range(self.sets):
+            with self._locked(set_index, exclusive=True) as mapping:
+                for offset in self._slots(set_index):
+                    _SLOT_HEADER.pack_into(mapping, offset, _EMPTY_DIGEST, 0.0, 0.0, 0)
+
+    def close(self, **kwargs: Any) -> None:
+        # Called at the end of every request; the mapping stays open.
+        pass
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from time import perf_counter
+from typing import Any, Iterator, Optional
+
+
+class Trace:
+    def __init__(self) -> None:
+        self.spans: list[tuple[str, float, Optional[str]]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float, desc: Optional[str] = None) -> None:
+        with self._lock:
+            self.spans.append((name, seconds * 1000, desc))
+
+    def server_timing(self) -> str:
+        entries = []
+        for name, ms, desc in self.spans:
+            entry = f"{name};dur={ms:.1f}"
+            if desc:
+                entry += ';desc="{}"'.format(desc.replace("\\", "").replace('"', ""))
+            entries.append(entry)
+        return ", ".join(entries)
+
+    def as_dict(self) -> list[dict[str, Any]]:
+        return [
+            {"name": name, "ms": round(ms, 2), "desc": desc}
+            for name, ms, desc in self.spans
+        ]
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def activate(trace: Trace) -> Token[Optional[Trace]]:
+    return _current.set(trace)
+
+
+def deactivate(token: Token[Optional[Trace]]) -> None:
+    _current.reset(token)
+
+
+def record(name: str, seconds: float, desc: Optional[str] = None) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, seconds, desc)
+
+
+@contextmanager
+def span(name: str, desc: Optional[str] = None) -> Iterator[None]:
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, perf_counter() - started, desc)
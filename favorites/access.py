@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+import requests
+from django.core.cache import cache
+
+from core.constants import (
+    FAVORITES_ACCESS_NEGATIVE_TTL,
+    FAVORITES_ACCESS_TTL,
+    TMDB_API_BASE,
+    TMDB_REQUEST_TIMEOUT,
+    Headers,
+    QueryParams,
+    TMDBPaths,
+)
+from tmdb.upstream import tracked
+
+# The favorites replica and the caches built from it answer without TMDb, and
+# TMDb is what checks that a bearer may read an account. A bearer is remembered
+# as allowed for an account once TMDb has answered it for that account, and
+# local copies are only served to remembered bearers. A bearer TMDb refused is
+# remembered as refused for a short while, so it costs one check per TTL
+# rather than one per request.
+
+# Statuses that say the bearer cannot read the account, as opposed to TMDb
+# being unavailable.
+REFUSED_STATUSES = frozenset({401, 403, 404})
+
+
+def access_cache_key(account_id: int | str, bearer: str) -> str:
+    digest = hashlib.sha256(bearer.encode()).hexdigest()[:32]
+    return f"favorites:access:{account_id}:{digest}"
+
+
+def mark_access(account_id: int | str, bearer: Optional[str]) -> None:
+    if bearer:
+        cache.set(access_cache_key(account_id, bearer), True, FAVORITES_ACCESS_TTL)
+
+
+def has_access(account_id: int | str, bearer: Optional[str]) -> bool:
+    # One TMDb call (the first favorites page) per bearer and account per TTL.
+    if not bearer:
+        return False
+    key = access_cache_key(account_id, bearer)
+    allowed = cache.get(key)
+    if allowed is not None:
+        return allowed
+
+    resp = tracked(
+        requests.get,
+        f"{TMDB_API_BASE}{TMDBPaths.ACCOUNT_FAVORITES.format(account_id=account_id)}",
+        params={QueryParams.PAGE: 1},
+        headers={Headers.AUTHORIZATION: bearer, Headers.ACCEPT: Headers.JSON_CT},
+        timeout=TMDB_REQUEST_TIMEOUT,
+    )
+    if resp.status_code in REFUSED_STATUSES:
+        cache.set(key, False, FAVORITES_ACCESS_NEGATIVE_TTL)
+    if resp.status_code >= 400:
+        return False
+    mark_access(account_id, bearer)
+    return True
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence, Set
+from typing import Optional
+
+from django.core.cache import cache
+
+from core.constants import FAVORITE_IDS_CACHE_TTL
+
+_UINT32_MAX = 2**32 - 1
+
+
+class FavoriteIdSet(Set[int]):
+    __slots__ = ("_ids",)
+
+    def __init__(self, ids: Iterable[int] = ()) -> None:
+        self._ids = array("q", sorted({i for i in ids if isinstance(i, int)}))
+
+    def __contains__(self, movie_id: object) -> bool:
+        if not isinstance(movie_id, int):
+            return False
+        pos = bisect_left(self._ids, movie_id)
+        return pos < len(self._ids) and self._ids[pos] == movie_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __repr__(self) -> str:
+        return f"FavoriteIdSet({list(self._ids)!r})"
+
+    def __reduce__(self):
+        return FavoriteIdSet.from_bytes, (self.to_bytes(),)
+
+    def contains_many(self, movie_ids: Sequence[object]) -> list[bool]:
+        flags = [False] * len(movie_ids)
+        if not self._ids:
+            return flags
+
+        positions = sorted(
+            (
+                pos
+                for pos, movie_id in enumerate(movie_ids)
+                if isinstance(movie_id, int)
+            ),
+            key=movie_ids.__getitem__,
+        )
+        lo, size = 0, len(self._ids)
+        for pos in positions:
+            movie_id = movie_ids[pos]
+            lo = bisect_left(self._ids, movie_id, lo)
+            if lo == size:
+                break
+            flags[pos] = self._ids[lo] == movie_id
+        return flags
+
+    def to_bytes(self) -> bytes:
+        fits_uint32 = not self._ids or (
+            self._ids[0] >= 0 and self._ids[-1] <= _UINT32_MAX
+        )
+        packed = array("I" if fits_uint32 else "q", self._ids)
+        if sys.byteorder != "little":
+            packed.byteswap()
+        return packed.typecode.encode() + packed.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> FavoriteIdSet:
+        packed = array(chr(data[0]))
+        packed.frombytes(data[1:])
+        if sys.byteorder != "little":
+            packed.byteswap()
+
+        instance = cls.__new__(cls)
+        instance._ids = packed if packed.typecode == "q" else array("q", packed)
+        return instance
+
+
+def favorite_ids_cache_key(account_id: int | str) -> str:
+    return f"favorites:ids:{account_id}"
+
+
+def get_cached_favorite_ids(account_id: int | str) -> Optional[FavoriteIdSet]:
+    data = cache.get(favorite_ids_cache_key(account_id))
+    if data is None:
+        return None
+    return FavoriteIdSet.from_bytes(data)
+
+
+def set_cached_favorite_ids(account_id: int | str, ids: FavoriteIdSet) -> None:
+    cache.set(
+        favorite_ids_cache_key(account_id),
+        ids.to_bytes(),
+        timeout=FAVORITE_IDS_CACHE_TTL,
+    )
+
+
+def invalidate_cached_favorite_ids(account_id: int | str) -> None:
+    cache.delete(favorite_ids_cache_key(account_id))
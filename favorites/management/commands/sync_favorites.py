@@ -0,0 +1,62 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core.constants import FAVORITES_REPLICA_ENABLED, Headers
+from favorites.services import FavoritesReplicaService, FavoritesService
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-syncs the local favorites replica from TMDb. Without --account-id, "
+        "every account whose replica is older than FAVORITES_REPLICA_MAX_AGE is "
+        "refreshed. Meant to run periodically (cron, scheduler)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--account-id",
+            action="append",
+            dest="account_ids",
+            default=[],
+            help="Account to resync (repeatable).",
+        )
+        parser.add_argument(
+            "--token",
+            default=None,
+            help="TMDb bearer token (defaults to TMDB_API_KEY).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not FAVORITES_REPLICA_ENABLED:
+            raise CommandError("FAVORITES_REPLICA_ENABLED is off.")
+
+        token = options["token"] or settings.TMDB_BEARER
+        if not token:
+            raise CommandError("A TMDb bearer token is required.")
+
+        service = FavoritesService(
+            {
+                Headers.AUTHORIZATION: token,
+                Headers.ACCEPT: Headers.JSON_CT,
+                Headers.CONTENT_TYPE: Headers.JSON_UTF8,
+            }
+        )
+        account_ids = options["account_ids"] or (
+            FavoritesReplicaService.stale_account_ids()
+        )
+
+        failed = 0
+        for account_id in account_ids:
+            if service.sync_replica(account_id):
+                self.stdout.write(f"synced account {account_id}")
+            else:
+                failed += 1
+                self.stderr.write(f"failed to sync account {account_id}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(account_ids) - failed}/{len(account_ids)} accounts synced."
+            )
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("favorites", "0005_alter_favoritedlist_list_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FavoritesSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("account_id", models.BigIntegerField(unique=True)),
+                ("synced_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "favorites_sync_state",
+            },
+        ),
+    ]
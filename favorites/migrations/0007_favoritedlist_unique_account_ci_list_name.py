@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:23
+
+import logging
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def dedupe_shared_lists(apps, schema_editor):
+    FavoritedList = apps.get_model("favorites", "FavoritedList")
+    seen_accounts: set[int] = set()
+    seen_names: set[str] = set()
+    stale_ids = []
+    # Keep the latest share per account; on case-insensitive name clashes the
+    # account that claimed the name first keeps it.
+    for row in FavoritedList.objects.order_by("-created_at", "-id").values(
+        "id", "account_id"
+    ):
+        if row["account_id"] in seen_accounts:
+            stale_ids.append(row["id"])
+        seen_accounts.add(row["account_id"])
+    for row in (
+        FavoritedList.objects.exclude(id__in=stale_ids)
+        .order_by("created_at", "id")
+        .values("id", "list_name")
+    ):
+        name = row["list_name"].lower()
+        if name in seen_names:
+            stale_ids.append(row["id"])
+        seen_names.add(name)
+    if not stale_ids:
+        return
+    # Deleted shares cannot be restored by reversing the migration; record
+    # them so they can be recovered from a backup.
+    logger.warning(
+        "Deleting %d duplicate shared lists: %s",
+        len(stale_ids),
+        ", ".join(
+            f"{row['id']} (account {row['account_id']}, {row['list_name']!r})"
+            for row in FavoritedList.objects.filter(id__in=stale_ids).values(
+                "id", "account_id", "list_name"
+            )
+        ),
+    )
+    FavoritedList.objects.filter(id__in=stale_ids).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("favorites", "0006_favoritessyncstate"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_shared_lists, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="favoritedlist",
+            name="favorited_l_account_68cef5_idx",
+        ),
+        migrations.AlterField(
+            model_name="favoritedlist",
+            name="account_id",
+            field=models.BigIntegerField(unique=True),
+        ),
+        migrations.AlterField(
+            model_name="favoritedlist",
+            name="list_name",
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name="favoritedlist",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("list_name"),
+                name="favorited_lists_list_name_ci_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:20
+
+from django.db import migrations, models
+
+
+def mark_replicas_stale(apps, schema_editor):
+    # Rows synced before this migration have no tmdb_item; forget every sync so
+    # reads go to TMDb until `sync_favorites` has stored full items.
+    apps.get_model("favorites", "FavoritesSyncState").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("favorites", "0007_favoritedlist_unique_account_ci_list_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="favoritedmovie",
+            name="tmdb_item",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.RunPython(mark_replicas_stale, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class FavoritedMovie(models.Model):
@@ -10,6 +11,8 @@ class FavoritedMovie(models.Model):
     release_date = models.CharField(max_length=20, blank=True, null=True)
     genre_ids = models.JSONField(default=list)
     vote_average = models.FloatField(default=0.0)
+    # The TMDb favorites result item as synced, served as-is by the replica.
+    tmdb_item = models.JSONField(default=dict)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -25,15 +28,28 @@ class FavoritedMovie(models.Model):
 
 
 class FavoritedList(models.Model):
-    account_id = models.BigIntegerField()
-    list_name = models.CharField(max_length=255, unique=True)
+    account_id = models.BigIntegerField(unique=True)
+    list_name = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "favorited_lists"
-        indexes = [
-            models.Index(fields=["account_id"]),
+        constraints = [
+            models.UniqueConstraint(
+                Lower("list_name"), name="favorited_lists_list_name_ci_uniq"
+            ),
         ]
 
     def __str__(self):
         return f"{self.list_name} (Account {self.account_id})"
+
+
+class FavoritesSyncState(models.Model):
+    account_id = models.BigIntegerField(unique=True)
+    synced_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "favorites_sync_state"
+
+    def __str__(self):
+        return f"Account {self.account_id} synced at {self.synced_at}"
@@ -1,30 +1,64 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Any, Dict, Iterable, Optional, Tuple
 
 import requests
-from django.db import IntegrityError, transaction
+from django.db import connection, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 from core.constants import (
+    FAVORITES_PAGE_SIZE,
+    FAVORITES_REPLICA_ENABLED,
+    FAVORITES_REPLICA_MAX_AGE,
     TMDB_API_BASE,
     TMDB_DEFAULT_LANG,
     TMDB_REQUEST_TIMEOUT,
+    Headers,
     QueryParams,
     SortBy,
     TMDBPaths,
 )
-from favorites.models import FavoritedList
+from favorites.access import has_access, mark_access
+from favorites.favorite_ids import FavoriteIdSet, invalidate_cached_favorite_ids
+from favorites.models import FavoritedList, FavoritedMovie, FavoritesSyncState
+from favorites.shared_cache import (
+    UNKNOWN_LIST,
+    get_cached_account_id,
+    invalidate_cached_shared_list,
+    normalize_list_name,
+    replace_cached_list_name,
+    set_cached_account_id,
+)
+from tmdb.upstream import tracked
+
+REPLICA_FIELDS = (
+    "title",
+    "overview",
+    "poster_path",
+    "release_date",
+    "genre_ids",
+    "vote_average",
+)
 
 
 class FavoritesService:
     def __init__(self, tmdb_headers: Optional[Dict[str, str]] = None) -> None:
         self.tmdb_headers = tmdb_headers or {}
+        self.bearer = self.tmdb_headers.get(Headers.AUTHORIZATION)
 
     def list_tmdb_favorites(
         self, account_id: int | str, page: int | str = 1
     ) -> Tuple[Dict[str, Any], int]:
+        if FavoritesReplicaService.is_fresh(account_id) and has_access(
+            account_id, self.bearer
+        ):
+            return FavoritesReplicaService.page(account_id, page), 200
+
         url = f"{TMDB_API_BASE}{TMDBPaths.ACCOUNT_FAVORITES.format(account_id=account_id)}"
-        resp = requests.get(
+        resp = tracked(
+            requests.get,
             url,
             params={
                 QueryParams.LANGUAGE: TMDB_DEFAULT_LANG,
@@ -34,6 +68,8 @@ class FavoritesService:
             headers=self.tmdb_headers,
             timeout=TMDB_REQUEST_TIMEOUT,
         )
+        if resp.status_code < 400:
+            mark_access(account_id, self.bearer)
         return resp.json(), resp.status_code
 
     def toggle_tmdb_favorite(
@@ -45,21 +81,55 @@ class FavoritesService:
     ) -> Tuple[Dict[str, Any], int]:
         url = f"{TMDB_API_BASE}{TMDBPaths.ACCOUNT_FAVORITE_TOGGLE.format(account_id=account_id)}"
         payload = {"media_type": media_type, "media_id": movie_id, "favorite": favorite}
-        resp = requests.post(
+        resp = tracked(
+            requests.post,
             url,
             headers=self.tmdb_headers,
             json=payload,
             timeout=TMDB_REQUEST_TIMEOUT,
         )
+        if resp.status_code < 400:
+            mark_access(account_id, self.bearer)
+        if resp.status_code < 400 and media_type == "movie":
+            invalidate_cached_favorite_ids(account_id)
+            invalidate_cached_shared_list(account_id)
+            FavoritesReplicaService.record_toggle(
+                account_id=account_id, movie_id=movie_id, favorite=favorite
+            )
         return resp.json(), resp.status_code
 
     def fetch_all_tmdb_favorites(self, account_id: int | str) -> list[dict[str, Any]]:
+        return self.load_all_favorites(account_id) or []
+
+    def load_all_favorites(
+        self, account_id: int | str
+    ) -> Optional[list[dict[str, Any]]]:
+        if FavoritesReplicaService.is_fresh(account_id) and has_access(
+            account_id, self.bearer
+        ):
+            return FavoritesReplicaService.list_items(account_id)
+
+        items = self._fetch_all_pages(account_id)
+        if items is None:
+            return None
+        FavoritesReplicaService.sync_account(account_id, items)
+        return items
+
+    def sync_replica(self, account_id: int | str) -> bool:
+        items = self._fetch_all_pages(account_id)
+        if items is None:
+            return False
+        FavoritesReplicaService.sync_account(account_id, items)
+        return True
+
+    def _fetch_all_pages(self, account_id: int | str) -> Optional[list[dict[str, Any]]]:
         items: list[dict[str, Any]] = []
         page = 1
         url = f"{TMDB_API_BASE}{TMDBPaths.ACCOUNT_FAVORITES.format(account_id=account_id)}"
 
         while True:
-            resp = requests.get(
+            resp = tracked(
+                requests.get,
                 url,
                 params={
                     QueryParams.LANGUAGE: TMDB_DEFAULT_LANG,
@@ -70,7 +140,7 @@ class FavoritesService:
                 timeout=TMDB_REQUEST_TIMEOUT,
             )
             if resp.status_code >= 400:
-                return []
+                return None
             payload = resp.json()
             results: Iterable[dict[str, Any]] = payload.get("results", []) or []
             items.extend(results)
@@ -79,19 +149,125 @@ class FavoritesService:
                 break
             page += 1
 
+        mark_access(account_id, self.bearer)
         return items
 
 
-class SharedListService:
+class FavoritesReplicaService:
+    @staticmethod
+    def is_fresh(account_id: int | str) -> bool:
+        if not FAVORITES_REPLICA_ENABLED:
+            return False
+        cutoff = timezone.now() - timedelta(seconds=FAVORITES_REPLICA_MAX_AGE)
+        return FavoritesSyncState.objects.filter(
+            account_id=account_id, synced_at__gte=cutoff
+        ).exists()
+
+    @staticmethod
+    def favorite_ids(account_id: int | str) -> FavoriteIdSet:
+        return FavoriteIdSet(
+            FavoritedMovie.objects.filter(account_id=account_id).values_list(
+                "movie_id", flat=True
+            )
+        )
+
+    @staticmethod
+    def list_items(account_id: int | str) -> list[dict[str, Any]]:
+        # The TMDb result items as synced, so replica pages have TMDb's shape.
+        rows = (
+            FavoritedMovie.objects.filter(account_id=account_id)
+            .order_by("id")
+            .values("movie_id", "tmdb_item", *REPLICA_FIELDS)
+        )
+        return [
+            row["tmdb_item"]
+            or {"id": row["movie_id"], **{f: row[f] for f in REPLICA_FIELDS}}
+            for row in rows
+        ]
+
+    @staticmethod
+    def page(account_id: int | str, page: int | str = 1) -> Dict[str, Any]:
+        items = FavoritesReplicaService.list_items(account_id)
+        try:
+            page_number = max(int(page), 1)
+        except (TypeError, ValueError):
+            page_number = 1
+        start = (page_number - 1) * FAVORITES_PAGE_SIZE
+        total_results = len(items)
+        return {
+            "page": page_number,
+            "results": items[start : start + FAVORITES_PAGE_SIZE],
+            "total_pages": max(-(-total_results // FAVORITES_PAGE_SIZE), 1),
+            "total_results": total_results,
+        }
+
+    @staticmethod
+    def sync_account(account_id: int | str, items: Iterable[dict[str, Any]]) -> None:
+        if not FAVORITES_REPLICA_ENABLED:
+            return
+
+        rows: dict[int, FavoritedMovie] = {}
+        for item in items:
+            movie_id = item.get("id")
+            if isinstance(movie_id, int) and movie_id not in rows:
+                rows[movie_id] = FavoritedMovie(
+                    account_id=account_id,
+                    movie_id=movie_id,
+                    tmdb_item=item,
+                    **_replica_fields(item),
+                )
+
+        with transaction.atomic():
+            FavoritedMovie.objects.filter(account_id=account_id).delete()
+            FavoritedMovie.objects.bulk_create(rows.values())
+            FavoritesSyncState.objects.update_or_create(
+                account_id=account_id, defaults={"synced_at": timezone.now()}
+            )
+        invalidate_cached_shared_list(account_id)
+
+    @staticmethod
+    def record_toggle(account_id: int | str, movie_id: int, favorite: bool) -> None:
+        # Only the membership change is recorded: movie metadata comes from
+        # TMDb alone, so an added row stays bare and the account is marked
+        # stale until the next sync fills it in. A removal leaves the replica
+        # accurate and fresh.
+        if not FAVORITES_REPLICA_ENABLED:
+            return
+
+        with transaction.atomic():
+            if not favorite:
+                FavoritedMovie.objects.filter(
+                    account_id=account_id, movie_id=movie_id
+                ).delete()
+                return
+
+            FavoritedMovie.objects.get_or_create(
+                account_id=account_id, movie_id=movie_id
+            )
+            FavoritesSyncState.objects.filter(account_id=account_id).delete()
+
     @staticmethod
-    def is_name_in_use(
-        list_name: str, exclude_account_id: Optional[int | str] = None
-    ) -> bool:
-        qs = FavoritedList.objects.filter(list_name__iexact=list_name)
-        if exclude_account_id is not None:
-            qs = qs.exclude(account_id=exclude_account_id)
-        return qs.exists()
+    def stale_account_ids() -> list[int]:
+        cutoff = timezone.now() - timedelta(seconds=FAVORITES_REPLICA_MAX_AGE)
+        return list(
+            FavoritesSyncState.objects.filter(synced_at__lt=cutoff).values_list(
+                "account_id", flat=True
+            )
+        )
+
 
+def _replica_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": item.get("title") or "",
+        "overview": item.get("overview"),
+        "poster_path": item.get("poster_path"),
+        "release_date": item.get("release_date"),
+        "genre_ids": item.get("genre_ids") or [],
+        "vote_average": item.get("vote_average") or 0.0,
+    }
+
+
+class SharedListService:
     @staticmethod
     def latest_name_for_account(account_id: int | str) -> Optional[str]:
         return (
@@ -101,24 +277,74 @@ class SharedListService:
             .first()
         )
 
+    @staticmethod
+    def resolve_account_id(list_name: str) -> Optional[int]:
+        cached = get_cached_account_id(list_name)
+        if cached is not None:
+            return None if cached == UNKNOWN_LIST else cached
+
+        account_id = (
+            FavoritedList.objects.annotate(list_name_lower=Lower("list_name"))
+            .filter(list_name_lower=normalize_list_name(list_name))
+            .values_list("account_id", flat=True)
+            .first()
+        )
+        set_cached_account_id(list_name, account_id)
+        return account_id
+
     @staticmethod
     def upsert(account_id: int | str, list_name: str) -> tuple[FavoritedList, bool]:
-        with transaction.atomic():
-            existing = (
-                FavoritedList.objects.filter(account_id=account_id)
-                .order_by("-created_at")
-                .first()
+        instance, created = SharedListService._upsert(account_id, list_name)
+        replace_cached_list_name(instance.account_id, instance.list_name)
+        invalidate_cached_shared_list(instance.account_id)
+        return instance, created
+
+    @staticmethod
+    def _upsert(account_id: int | str, list_name: str) -> tuple[FavoritedList, bool]:
+        if not _supports_native_upsert():
+            return SharedListService._upsert_select_then_write(account_id, list_name)
+
+        created_at = connection.ops.adapt_datetimefield_value(timezone.now())
+        instance = list(
+            FavoritedList.objects.raw(
+                UPSERT_SHARED_LIST_SQL.format(
+                    table=connection.ops.quote_name(FavoritedList._meta.db_table)
+                ),
+                [account_id, list_name, created_at, created_at],
             )
+        )[0]
+        return instance, bool(instance.created)
+
+    @staticmethod
+    def _upsert_select_then_write(
+        account_id: int | str, list_name: str
+    ) -> tuple[FavoritedList, bool]:
+        with transaction.atomic():
+            existing = FavoritedList.objects.filter(account_id=account_id).first()
             if existing:
                 existing.list_name = list_name
                 existing.save(update_fields=["list_name"])
                 return existing, False
 
-            try:
-                created = FavoritedList.objects.create(
-                    account_id=account_id,
-                    list_name=list_name,
-                )
-                return created, True
-            except IntegrityError as exc:
-                raise exc
+            created = FavoritedList.objects.create(
+                account_id=account_id,
+                list_name=list_name,
+            )
+            return created, True
+
+
+# created_at is never touched on conflict, so it only matches the value sent
+# with this statement when the row was inserted by it.
+UPSERT_SHARED_LIST_SQL = (
+    "INSERT INTO {table} (account_id, list_name, created_at) VALUES (%s, %s, %s) "
+    "ON CONFLICT (account_id) DO UPDATE SET list_name = EXCLUDED.list_name "
+    "RETURNING id, account_id, list_name, created_at, created_at = %s AS created"
+)
+
+
+def _supports_native_upsert() -> bool:
+    features = connection.features
+    return bool(
+        features.supports_update_conflicts_with_target
+        and features.can_return_columns_from_insert
+    )
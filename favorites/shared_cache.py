@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Optional
+
+from django.core.cache import cache
+
+from core.constants import (
+    SHARED_LIST_NEGATIVE_TTL,
+    SHARED_LIST_RENDER_TTL,
+    SHARED_LIST_RESOLVE_TTL,
+)
+
+# Cached in place of an account_id for names that do not exist.
+UNKNOWN_LIST = 0
+
+
+def normalize_list_name(list_name: str) -> str:
+    return list_name.strip().lower()
+
+
+def list_name_cache_key(list_name: str) -> str:
+    digest = hashlib.sha1(normalize_list_name(list_name).encode()).hexdigest()
+    return f"favorites:shared:name:{digest}"
+
+
+def list_owner_cache_key(account_id: int | str) -> str:
+    return f"favorites:shared:owner:{account_id}"
+
+
+def get_cached_account_id(list_name: str) -> Optional[int]:
+    return cache.get(list_name_cache_key(list_name))
+
+
+def set_cached_account_id(list_name: str, account_id: Optional[int]) -> None:
+    if account_id is None:
+        cache.set(
+            list_name_cache_key(list_name),
+            UNKNOWN_LIST,
+            timeout=SHARED_LIST_NEGATIVE_TTL,
+        )
+        return
+
+    cache.set_many(
+        {
+            list_name_cache_key(list_name): account_id,
+            list_owner_cache_key(account_id): normalize_list_name(list_name),
+        },
+        timeout=SHARED_LIST_RESOLVE_TTL,
+    )
+
+
+def replace_cached_list_name(account_id: int, list_name: str) -> None:
+    previous = cache.get(list_owner_cache_key(account_id))
+    if previous is not None and previous != normalize_list_name(list_name):
+        cache.delete(list_name_cache_key(previous))
+    set_cached_account_id(list_name, account_id)
+
+
+def shared_list_cache_key(account_id: int | str) -> str:
+    return f"favorites:shared:rendered:{account_id}"
+
+
+def get_cached_shared_list(account_id: int | str) -> Optional[list[dict[str, Any]]]:
+    return cache.get(shared_list_cache_key(account_id))
+
+
+def set_cached_shared_list(account_id: int | str, data: list[dict[str, Any]]) -> None:
+    cache.set(shared_list_cache_key(account_id), data, timeout=SHARED_LIST_RENDER_TTL)
+
+
+def invalidate_cached_shared_list(account_id: int | str) -> None:
+    cache.delete(shared_list_cache_key(account_id))
@@ -7,9 +7,12 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core import tracing
 from core.constants import Docs, Errors, Headers, QueryParams
+from favorites.access import has_access
 from favorites.serializers import FavoritedListSerializer, FavoritedMovieSerializer
 from favorites.services import FavoritesService, SharedListService
+from favorites.shared_cache import get_cached_shared_list, set_cached_shared_list
 
 
 class BaseTMDBView(APIView):
@@ -123,11 +126,6 @@ class ShareFavoritedListView(BaseTMDBView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if SharedListService.is_name_in_use(list_name, exclude_account_id=account_id):
-            return Response(
-                {"error": Errors.LIST_NAME_IN_USE}, status=status.HTTP_409_CONFLICT
-            )
-
         try:
             instance, created = SharedListService.upsert(
                 account_id=account_id, list_name=list_name
@@ -164,14 +162,8 @@ class GetSharedFavoritedListView(BaseTMDBView):
                 {"error": Errors.LIST_NAME_REQUIRED}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        record = None
-        try:
-            from favorites.models import FavoritedList
-
-            record = FavoritedList.objects.filter(list_name__iexact=list_name).latest(
-                "created_at"
-            )
-        except FavoritedList.DoesNotExist:
+        account_id = SharedListService.resolve_account_id(list_name)
+        if account_id is None:
             return Response(
                 {"error": Errors.SHARED_LIST_NOT_FOUND},
                 status=status.HTTP_404_NOT_FOUND,
@@ -183,11 +175,17 @@ class GetSharedFavoritedListView(BaseTMDBView):
             )
 
         service = FavoritesService(self.tmdb_headers)
-        tmdb_items = service.fetch_all_tmdb_favorites(account_id=record.account_id)
+        cached = get_cached_shared_list(account_id)
+        if cached is not None and has_access(account_id, service.bearer):
+            return Response(cached, status=status.HTTP_200_OK)
+
+        tmdb_items = service.load_all_favorites(account_id=account_id)
+        if tmdb_items is None:
+            return Response([], status=status.HTTP_200_OK)
 
         mapped = [
             {
-                "account_id": record.account_id,
+                "account_id": account_id,
                 "movie_id": item.get("id"),
                 "title": item.get("title") or "",
                 "overview": item.get("overview"),
@@ -201,6 +199,9 @@ class GetSharedFavoritedListView(BaseTMDBView):
             if isinstance(item.get("id"), int)
         ]
 
-        serializer = FavoritedMovieSerializer(data=mapped, many=True)
-        serializer.is_valid(raise_exception=False)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        with tracing.span("serialize"):
+            serializer = FavoritedMovieSerializer(data=mapped, many=True)
+            serializer.is_valid(raise_exception=False)
+            data = list(serializer.data)
+        set_cached_shared_list(account_id, data)
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from config.health import STALE_AFTER_INTERVALS, HealthProber, ReadinessView
+
+
+class _StopLoop(Exception):
+    pass
+
+
+class TestHealthProber:
+    @patch.object(HealthProber, "_probe_cache", return_value={"status": "ok"})
+    @patch.object(
+        HealthProber,
+        "_probe_db",
+        return_value={"status": "unavailable", "error": "down"},
+    )
+    def test_probe_reports_error_when_db_unavailable(self, _db, _cache):
+        result = HealthProber(interval=60).probe()
+
+        assert result["status"] == "error"
+        assert result["db"]["status"] == "unavailable"
+        assert {"tmdb", "workers", "cache"} <= result.keys()
+        assert {"in_flight_requests", "background"} <= result["workers"].keys()
+
+    def test_loop_survives_a_failing_probe(self):
+        prober = HealthProber(interval=60)
+        probe = patch.object(
+            HealthProber, "probe", side_effect=[RuntimeError("boom"), {"status": "ok"}]
+        )
+        sleep = patch("config.health.time.sleep", side_effect=[None, _StopLoop])
+        with probe as probe_mock, sleep, pytest.raises(_StopLoop):
+            prober._loop()
+
+        assert probe_mock.call_count == 2
+        assert prober._result == {"status": "ok"}
+
+    def test_stale_result_reports_not_ready(self):
+        prober = HealthProber(interval=10)
+        prober._thread = object()
+        with patch.object(HealthProber, "probe", return_value={"status": "ok"}):
+            prober.refresh()
+        assert prober.latest()["status"] == "ok"
+
+        prober._refreshed_at -= 10 * STALE_AFTER_INTERVALS + 1
+        result = prober.latest()
+
+        assert result["status"] == "error"
+        assert result["stale_seconds"] > 30
+
+
+class TestReadinessView:
+    def test_serves_latest_probe_without_reprobing(self):
+        cached = {"status": "ok", "db": {"status": "ok"}}
+        with patch("config.health.prober.latest", return_value=cached) as latest:
+            resp = ReadinessView.as_view()(APIRequestFactory().get("/ready/"))
+
+        assert resp.status_code == 200
+        assert resp.data == cached
+        latest.assert_called_once_with()
+
+    def test_returns_503_when_not_ready(self):
+        with patch("config.health.prober.latest", return_value={"status": "error"}):
+            resp = ReadinessView.as_view()(APIRequestFactory().get("/ready/"))
+
+        assert resp.status_code == 503
@@ -0,0 +1,92 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from config.middleware import MetricsMiddleware
+from core import metrics
+from core.metrics import Registry
+
+
+class TestRender:
+    def test_counters_and_cumulative_histogram_buckets(self):
+        registry = Registry()
+        registry.inc("tmdb_requests_total", {"path": "/movie/{id}", "status": "200"})
+        registry.inc("tmdb_requests_total", {"path": "/movie/{id}", "status": "200"})
+        registry.observe("tmdb_request_duration_seconds", 0.02, {"path": "/x"})
+        registry.observe("tmdb_request_duration_seconds", 3.0, {"path": "/x"})
+
+        text = metrics.render([registry.snapshot()])
+
+        assert 'tmdb_requests_total{path="/movie/{id}",status="200"} 2' in text
+        assert 'tmdb_request_duration_seconds_bucket{path="/x",le="0.025"} 1' in text
+        assert 'tmdb_request_duration_seconds_bucket{path="/x",le="2.5"} 1' in text
+        assert 'tmdb_request_duration_seconds_bucket{path="/x",le="+Inf"} 2' in text
+        assert 'tmdb_request_duration_seconds_count{path="/x"} 2' in text
+        assert "# TYPE tmdb_request_duration_seconds histogram" in text
+
+    def test_label_values_are_escaped(self):
+        registry = Registry()
+        registry.inc("http_requests_total", {"route": 'a"b\\c'})
+
+        text = metrics.render([registry.snapshot()])
+
+        assert 'http_requests_total{route="a\\"b\\\\c"} 1' in text
+
+
+class TestMultiProcessCollect:
+    def test_sums_snapshots_from_all_workers(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics, "METRICS_DIR", str(tmp_path))
+        other_worker = Registry()
+        other_worker.inc("tmdb_cache_requests_total", {"result": "hit"}, 3)
+        (tmp_path / f"metrics-{os.getppid()}.json").write_text(
+            json.dumps(other_worker.snapshot())
+        )
+
+        this_worker = Registry()
+        this_worker.inc("tmdb_cache_requests_total", {"result": "hit"}, 2)
+        monkeypatch.setattr(metrics, "registry", this_worker)
+
+        text = metrics.render(metrics.collect())
+
+        assert 'tmdb_cache_requests_total{result="hit"} 5' in text
+        assert len(list(tmp_path.glob("metrics-*.json"))) == 2
+
+    def test_exited_worker_totals_are_archived_not_dropped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics, "METRICS_DIR", str(tmp_path))
+        monkeypatch.setattr(metrics, "registry", Registry())
+        worker = subprocess.Popen([sys.executable, "-c", "pass"])
+        worker.wait()
+        exited = Registry()
+        exited.inc("tmdb_cache_requests_total", {"result": "hit"}, 3)
+        exited.observe("tmdb_request_duration_seconds", 0.2, {"path": "/x"})
+        snapshot = tmp_path / f"metrics-{worker.pid}.json"
+        snapshot.write_text(json.dumps(exited.snapshot()))
+
+        first = metrics.render(metrics.collect())
+        second = metrics.render(metrics.collect())
+
+        assert 'tmdb_cache_requests_total{result="hit"} 3' in first
+        assert 'tmdb_request_duration_seconds_count{path="/x"} 1' in first
+        assert first == second
+        assert not snapshot.exists()
+        assert (tmp_path / metrics.ARCHIVE_FILE).exists()
+
+
+class TestMetricsMiddleware:
+    def test_records_route_status_and_query_count(self, monkeypatch):
+        registry = Registry()
+        monkeypatch.setattr(metrics, "registry", registry)
+        request = RequestFactory().get("/nowhere/")
+        request.resolver_match = None
+
+        MetricsMiddleware(lambda _req: HttpResponse(status=204))(request)
+
+        text = metrics.render([registry.snapshot()])
+        assert (
+            'http_requests_total{method="GET",route="unmatched",status="204"} 1' in text
+        )
+        assert 'http_request_db_queries_bucket{route="unmatched",le="0"} 1' in text
@@ -0,0 +1,82 @@
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from config.middleware import ProfilingMiddleware
+from core import profiling
+
+
+def _view(_request):
+    sum(range(1000))
+    return HttpResponse("ok")
+
+
+@pytest.fixture
+def profile_dir(tmp_path, settings):
+    settings.PROFILE_DIR = str(tmp_path)
+    return tmp_path
+
+
+class TestProfilingMiddleware:
+    @patch("config.middleware.PROFILING_ENABLED", True)
+    def test_signed_token_captures_profile(self, profile_dir):
+        request = RequestFactory().get(
+            "/x/?page=2", HTTP_X_PROFILE_TOKEN=profiling.make_token("oncall")
+        )
+
+        ProfilingMiddleware(_view)(request)
+
+        [profile] = profiling.list_profiles()
+        assert profile.meta["path"] == "/x/?page=2"
+        assert profile.meta["status"] == 200
+        assert profile.meta["ms"] >= 0
+
+    @patch("config.middleware.PROFILING_ENABLED", True)
+    def test_forged_token_is_ignored(self, profile_dir):
+        request = RequestFactory().get("/x/", HTTP_X_PROFILE_TOKEN="forged:token")
+
+        ProfilingMiddleware(_view)(request)
+
+        assert profiling.list_profiles() == []
+
+    @patch("config.middleware.PROFILE_SAMPLE_RATE", 1.0)
+    @patch("config.middleware.PROFILING_ENABLED", False)
+    def test_disabled_setting_wins(self, profile_dir):
+        ProfilingMiddleware(_view)(RequestFactory().get("/x/"))
+
+        assert profiling.list_profiles() == []
+
+    @patch("config.middleware.PROFILE_SAMPLE_RATE", 1.0)
+    @patch("config.middleware.PROFILING_ENABLED", True)
+    def test_sampled_request_is_profiled(self, profile_dir):
+        ProfilingMiddleware(_view)(RequestFactory().get("/x/"))
+
+        assert len(profiling.list_profiles()) == 1
+
+
+def test_expired_token_is_rejected():
+    token = profiling.make_token()
+
+    assert profiling.verify_token(token, max_age=60)
+    with patch("django.core.signing.time.time", return_value=2**40):
+        assert not profiling.verify_token(token, max_age=60)
+
+
+@patch("config.middleware.PROFILE_SAMPLE_RATE", 1.0)
+@patch("config.middleware.PROFILING_ENABLED", True)
+def test_profiles_command_lists_and_summarizes(profile_dir):
+    for _ in range(2):
+        ProfilingMiddleware(_view)(RequestFactory().get("/x/"))
+
+    listing, summary = StringIO(), StringIO()
+    call_command("profiles", "list", stdout=listing)
+    call_command("profiles", "summary", "--limit", "5", stdout=summary)
+
+    assert "2 profiles in" in listing.getvalue()
+    assert "GET /x/" in listing.getvalue()
+    assert "2 profiles," in summary.getvalue()
+    assert "test_profiling.py" in summary.getvalue()
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from config.schema import PrecomputedSchemaView, load_schema
+
+
+@pytest.fixture
+def schema_file(tmp_path, settings):
+    path = tmp_path / "openapi.json"
+    path.write_bytes(b'{"openapi": "3.0.3"}')
+    settings.OPENAPI_SCHEMA_FILE = str(path)
+    settings.DEBUG = False
+    load_schema.cache_clear()
+    yield path
+    load_schema.cache_clear()
+
+
+class TestPrecomputedSchemaView:
+    def test_serves_file_bytes_with_etag(self, schema_file):
+        resp = PrecomputedSchemaView.as_view()(RequestFactory().get("/api/schema/"))
+
+        assert resp.status_code == 200
+        assert resp.content == b'{"openapi": "3.0.3"}'
+        assert resp["ETag"] == load_schema().etag
+
+    def test_matching_etag_returns_304(self, schema_file):
+        etag = load_schema().etag
+        request = RequestFactory().get("/api/schema/", HTTP_IF_NONE_MATCH=etag)
+
+        resp = PrecomputedSchemaView.as_view()(request)
+
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+    def test_file_is_read_once(self, schema_file):
+        view = PrecomputedSchemaView.as_view()
+        view(RequestFactory().get("/api/schema/"))
+        schema_file.write_bytes(b"{}")
+
+        resp = view(RequestFactory().get("/api/schema/"))
+
+        assert resp.content == b'{"openapi": "3.0.3"}'
+
+    @pytest.mark.parametrize("debug,file_exists", [(True, True), (False, False)])
+    def test_falls_back_to_runtime_generation(
+        self, schema_file, settings, debug, file_exists
+    ):
+        settings.DEBUG = debug
+        if not file_exists:
+            schema_file.unlink()
+        with patch.object(
+            PrecomputedSchemaView,
+            "runtime_view",
+            staticmethod(lambda request, *a, **kw: HttpResponse(b"runtime")),
+        ):
+            resp = PrecomputedSchemaView.as_view()(RequestFactory().get("/api/schema/"))
+
+        assert resp.content == b"runtime"
+
+    def test_missing_file_outside_debug_logs_error(self, schema_file, caplog):
+        schema_file.unlink()
+
+        with caplog.at_level("ERROR", logger="config.schema"):
+            assert load_schema() is None
+
+        assert str(schema_file) in caplog.text
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from config.middleware import ServerTimingMiddleware
+from core import tracing
+
+
+def _view(_request):
+    with tracing.span("cache", "get"):
+        pass
+    tracing.record("tmdb", 0.0123, "/movie/{id}")
+    return HttpResponse("ok")
+
+
+class TestServerTimingMiddleware:
+    @patch("config.middleware.TRACE_SAMPLE_RATE", 1.0)
+    def test_sampled_request_emits_spans(self):
+        resp = ServerTimingMiddleware(_view)(RequestFactory().get("/x/"))
+
+        header = resp["Server-Timing"]
+        assert header.startswith("cache;dur=")
+        assert 'tmdb;dur=12.3;desc="/movie/{id}"' in header
+        assert ", total;dur=" in header
+        assert tracing.current_trace() is None
+
+    @patch("config.middleware.TRACE_SAMPLE_RATE", 0.0)
+    def test_unsampled_request_has_no_header(self):
+        resp = ServerTimingMiddleware(_view)(RequestFactory().get("/x/"))
+
+        assert not resp.has_header("Server-Timing")
+
+    @patch("config.middleware.TRACE_LOG", True)
+    @patch("config.middleware.TRACE_SAMPLE_RATE", 1.0)
+    def test_structured_log_line(self, caplog):
+        with caplog.at_level("INFO", logger="tracing"):
+            ServerTimingMiddleware(_view)(RequestFactory().get("/x/"))
+
+        assert '"path": "/x/"' in caplog.text
+        assert '"name": "tmdb"' in caplog.text
+
+
+class TestSpans:
+    def test_span_without_active_trace_is_noop(self):
+        with tracing.span("db"):
+            pass
+        tracing.record("tmdb", 1.0)
+
+        assert tracing.current_trace() is None
+
+    def test_desc_quotes_are_stripped(self):
+        trace = tracing.Trace()
+        trace.add("tmdb", 0.001, 'a"b')
+
+        assert trace.server_timing() == 'tmdb;dur=1.0;desc="ab"'
@@ -4,11 +4,9 @@ from django.conf import settings
 
 
 @pytest.fixture(scope="session", autouse=True)
-def django_db_setup():
-    settings.DATABASES["default"] = {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": ":memory:",
-    }
+def django_db_setup(django_db_setup):
+    # pytest-django's own setup creates the (in-memory SQLite) test tables
+    # from config.settings.test; django_db tests run against them.
     settings.CACHES = {
         "default": {
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
@@ -0,0 +1,119 @@
+import multiprocessing
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from core.shm_cache import SharedMemoryCache
+
+
+def _cache(path, **options):
+    return SharedMemoryCache(
+        str(path),
+        {"OPTIONS": {"SETS": 4, "WAYS": 2, "SLOT_SIZE": 1024, **options}},
+    )
+
+
+def _child(path):
+    child = _cache(path)
+    ok = child.get("parent") == "p"
+    child.set("child", "c")
+    sys.exit(0 if ok else 1)
+
+
+@pytest.fixture
+def shm(tmp_path):
+    return _cache(tmp_path / "cache")
+
+
+class TestSharedMemoryCache:
+    def test_set_get_delete(self, shm):
+        shm.set("movie:1", {"title": "A", "ids": [1, 2]})
+
+        assert shm.get("movie:1") == {"title": "A", "ids": [1, 2]}
+        assert shm.delete("movie:1") is True
+        assert shm.get("movie:1", "missing") == "missing"
+
+    def test_none_values_are_distinguishable_from_misses(self, shm):
+        sentinel = object()
+        shm.set("providers", None)
+
+        assert shm.get("providers", sentinel) is None
+        assert shm.get("other", sentinel) is sentinel
+
+    def test_expired_entries_are_misses(self, shm, monkeypatch):
+        shm.set("k", 1, timeout=10)
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 11)
+
+        assert shm.get("k") is None
+        assert shm.add("k", 2) is True
+
+    def test_add_only_when_absent(self, shm):
+        assert shm.add("k", 1) is True
+        assert shm.add("k", 2) is False
+        assert shm.get("k") == 1
+
+    def test_oversized_value_is_not_cached_and_drops_old_one(self, shm):
+        shm.set("k", "small")
+        with patch("core.shm_cache.metrics.inc") as inc:
+            shm.set("k", "x" * 4096)
+
+        assert shm.get("k") is None
+        inc.assert_called_once_with("shm_cache_rejected_total", {"reason": "too_large"})
+
+    def test_full_set_evicts_least_recently_read(self, tmp_path):
+        cache = _cache(tmp_path / "cache", SETS=1, WAYS=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_touch_and_clear(self, shm):
+        shm.set("k", 1, timeout=1)
+        assert shm.touch("k", timeout=None) is True
+        assert shm.touch("missing") is False
+
+        shm.clear()
+
+        assert shm.has_key("k") is False
+
+    def test_shared_between_processes(self, shm, tmp_path):
+        shm.set("parent", "p")
+
+        child = multiprocessing.get_context("spawn").Process(
+            target=_child, args=(str(tmp_path / "cache"),)
+        )
+        child.start()
+        child.join(timeout=30)
+
+        assert child.exitcode == 0
+        assert shm.get("child") == "c"
+
+    def test_geometry_change_uses_a_separate_file(self, tmp_path):
+        original = _cache(tmp_path / "cache")
+        original.set("k", 1)
+
+        resized = _cache(tmp_path / "cache", SETS=8)
+
+        assert resized.get("k") is None
+        assert resized.path != original.path
+        assert original.get("k") == 1
+
+    def test_mismatched_file_is_refused_not_truncated(self, tmp_path):
+        shm = _cache(tmp_path / "cache")
+        with open(shm.path, "wb") as fh:
+            fh.write(b"not a cache file")
+
+        with pytest.raises(ImproperlyConfigured):
+            shm.get("k")
+
+        with open(shm.path, "rb") as fh:
+            assert fh.read() == b"not a cache file"
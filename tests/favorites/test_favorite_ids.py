@@ -0,0 +1,62 @@
+import pickle
+
+import pytest
+
+from favorites.favorite_ids import (
+    FavoriteIdSet,
+    get_cached_favorite_ids,
+    invalidate_cached_favorite_ids,
+    set_cached_favorite_ids,
+)
+
+
+class TestFavoriteIdSet:
+    def test_membership_and_set_semantics(self):
+        ids = FavoriteIdSet([30, 10, 20, 10])
+
+        assert list(ids) == [10, 20, 30]
+        assert len(ids) == 3
+        assert 20 in ids
+        assert 25 not in ids
+        assert "20" not in ids
+        assert ids == {10, 20, 30}
+        assert FavoriteIdSet() == set()
+
+    def test_contains_many_preserves_input_order(self):
+        ids = FavoriteIdSet([2, 5, 9])
+
+        flags = ids.contains_many([9, 1, None, 5, 5, 100, 2])
+
+        assert flags == [True, False, False, True, True, False, True]
+
+    @pytest.mark.parametrize("values", [[], [1, 550, 27205], [1, 2**40, 3], [-5, 7]])
+    def test_bytes_roundtrip(self, values):
+        ids = FavoriteIdSet(values)
+
+        restored = FavoriteIdSet.from_bytes(ids.to_bytes())
+
+        assert restored == ids
+        assert list(restored) == sorted(values)
+
+    def test_encoding_is_smaller_than_pickled_set(self):
+        values = range(100_000, 104_000)
+
+        encoded = FavoriteIdSet(values).to_bytes()
+
+        assert len(encoded) == 1 + 4 * 4000
+        assert len(encoded) < len(pickle.dumps(set(values)))
+
+    def test_pickle_roundtrip(self):
+        ids = FavoriteIdSet([3, 1, 2])
+
+        assert pickle.loads(pickle.dumps(ids)) == {1, 2, 3}
+
+
+class TestFavoriteIdsCache:
+    def test_set_get_and_invalidate(self):
+        set_cached_favorite_ids(31337, FavoriteIdSet([4, 8]))
+
+        assert get_cached_favorite_ids(31337) == {4, 8}
+
+        invalidate_cached_favorite_ids(31337)
+        assert get_cached_favorite_ids(31337) is None
@@ -1,7 +1,11 @@
 from contextlib import nullcontext
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 
 from core.constants import (
     TMDB_API_BASE,
@@ -13,11 +17,21 @@ from core.constants import (
     TMDBPaths,
 )
 from favorites import models as fav_models
-from favorites.services import FavoritesService, SharedListService
+from favorites.access import mark_access
+from favorites.models import FavoritedList, FavoritedMovie, FavoritesSyncState
+from favorites.services import (
+    FavoritesReplicaService,
+    FavoritesService,
+    SharedListService,
+)
 
 
 @pytest.fixture(autouse=True)
-def _neutralize_atomic(monkeypatch):
+def _neutralize_atomic(request, monkeypatch):
+    # Tests against the test database keep real transactions.
+    if request.node.get_closest_marker("django_db"):
+        return
+
     try:
         monkeypatch.setattr("favorites.services.atomic", lambda: nullcontext())
     except AttributeError:
@@ -107,22 +121,33 @@ def mock_favorited_list(monkeypatch):
         state.append(row)
         return _to_instance(row)
 
+    def _objects_raw(_sql, params):
+        account_id, list_name = params[0], params[1]
+        if any(
+            r["list_name"].lower() == list_name.lower()
+            and r["account_id"] != account_id
+            for r in state
+        ):
+            raise IntegrityError("favorited_lists_list_name_ci_uniq")
+        row = next((r for r in state if r["account_id"] == account_id), None)
+        created = row is None
+        if created:
+            row = {"account_id": account_id, "list_name": list_name}
+            state.append(row)
+        row["list_name"] = list_name
+        inst = _to_instance(row)
+        inst.created = int(created)
+        return [inst]
+
     objects.filter.side_effect = _objects_filter
     objects.create.side_effect = _objects_create
+    objects.raw.side_effect = _objects_raw
 
     monkeypatch.setattr(fav_models.FavoritedList, "objects", objects)
     return {"objects": objects, "state": state}
 
 
 class TestSharedListService:
-    def test_is_name_in_use_without_exclude(self, mock_favorited_list):
-        assert SharedListService.is_name_in_use("mylist") is True
-        assert SharedListService.is_name_in_use("other") is False
-
-    def test_is_name_in_use_with_exclude(self, mock_favorited_list):
-        assert SharedListService.is_name_in_use("shared", exclude_account_id=2) is False
-        assert SharedListService.is_name_in_use("shared", exclude_account_id=1) is True
-
     def test_latest_name_for_account(self, mock_favorited_list):
         assert SharedListService.latest_name_for_account(7) == "new"
         assert SharedListService.latest_name_for_account(99) is None
@@ -139,15 +164,43 @@ class TestSharedListService:
 
     def test_upsert_updates_when_exists(self, mock_favorited_list):
         SharedListService.upsert(10, "old")
-        inst, created = SharedListService.upsert(10, "new")
+        inst, created = SharedListService.upsert(10, "renamed")
         assert created is False
         assert inst.account_id == 10
-        assert inst.list_name == "new"
+        assert inst.list_name == "renamed"
         state = mock_favorited_list["state"]
         assert any(
-            r for r in state if r["account_id"] == 10 and r["list_name"] == "new"
+            r for r in state if r["account_id"] == 10 and r["list_name"] == "renamed"
         )
 
+    def test_upsert_is_a_single_statement(self, mock_favorited_list):
+        SharedListService.upsert(10, "october")
+
+        objects = mock_favorited_list["objects"]
+        assert objects.raw.call_count == 1
+        objects.filter.assert_not_called()
+        objects.create.assert_not_called()
+        assert "ON CONFLICT (account_id)" in objects.raw.call_args.args[0]
+
+    def test_upsert_case_insensitive_name_conflict_raises(self, mock_favorited_list):
+        with pytest.raises(IntegrityError):
+            SharedListService.upsert(10, "MyList")
+
+    def test_upsert_same_account_can_change_case(self, mock_favorited_list):
+        inst, created = SharedListService.upsert(1, "MYLIST")
+        assert created is False
+        assert inst.list_name == "MYLIST"
+
+    @patch("favorites.services._supports_native_upsert", return_value=False)
+    def test_upsert_fallback_without_native_upsert(self, _native, mock_favorited_list):
+        inst, created = SharedListService.upsert(2, "renamed")
+        assert created is False
+        assert inst.list_name == "renamed"
+
+        inst, created = SharedListService.upsert(11, "fresh")
+        assert created is True
+        mock_favorited_list["objects"].raw.assert_not_called()
+
 
 class TestFavoritesService:
     @patch("favorites.services.requests.get")
@@ -256,3 +309,227 @@ class TestFavoritesService:
 
         items = service.fetch_all_tmdb_favorites(account_id=5)
         assert items == []
+
+
+class TestFavoritesReplica:
+    @patch("favorites.services.requests.get")
+    @patch(
+        "favorites.services.FavoritesReplicaService.page",
+        return_value={"page": 1, "results": [{"id": 9}]},
+    )
+    @patch("favorites.services.FavoritesReplicaService.is_fresh", return_value=True)
+    def test_list_favorites_reads_fresh_replica(self, _fresh, _page, mock_get):
+        mark_access(3, "Bearer t")
+        service = FavoritesService(tmdb_headers={Headers.AUTHORIZATION: "Bearer t"})
+
+        payload, status_code = service.list_tmdb_favorites(account_id=3, page=1)
+
+        assert status_code == 200
+        assert payload == {"page": 1, "results": [{"id": 9}]}
+        mock_get.assert_not_called()
+
+    @patch("favorites.services.requests.get")
+    @patch("favorites.services.FavoritesReplicaService.is_fresh", return_value=True)
+    def test_refused_bearer_is_checked_once_per_negative_ttl(self, _fresh, mock_get):
+        cache.clear()
+        mock_get.return_value = MagicMock(status_code=401, json=lambda: {})
+        service = FavoritesService(tmdb_headers={Headers.AUTHORIZATION: "Bearer bad"})
+
+        for _ in range(3):
+            assert service.list_tmdb_favorites(account_id=3)[1] == 401
+
+        # One access check, then only the pass-through call per request.
+        assert mock_get.call_count == 1 + 3
+
+    @patch("favorites.services.FavoritesReplicaService.sync_account")
+    @patch("favorites.services.FavoritesReplicaService.is_fresh", return_value=False)
+    @patch("favorites.services.requests.get")
+    def test_fetch_all_syncs_replica_when_stale(self, mock_get, _fresh, mock_sync):
+        mock_get.return_value = MagicMock(
+            status_code=200, json=lambda: {"results": [{"id": 1}], "total_pages": 1}
+        )
+        service = FavoritesService(tmdb_headers={Headers.AUTHORIZATION: "Bearer t"})
+
+        assert service.fetch_all_tmdb_favorites(account_id=5) == [{"id": 1}]
+        mock_sync.assert_called_once_with(5, [{"id": 1}])
+
+    @patch("favorites.services.FavoritesReplicaService.sync_account")
+    @patch("favorites.services.FavoritesReplicaService.is_fresh", return_value=False)
+    @patch("favorites.services.requests.get")
+    def test_fetch_all_does_not_sync_on_upstream_error(
+        self, mock_get, _fresh, mock_sync
+    ):
+        mock_get.return_value = MagicMock(status_code=500, json=lambda: {})
+        service = FavoritesService(tmdb_headers={Headers.AUTHORIZATION: "Bearer t"})
+
+        assert service.fetch_all_tmdb_favorites(account_id=5) == []
+        mock_sync.assert_not_called()
+
+    @pytest.mark.parametrize("status_code,expected_calls", [(200, 1), (401, 0)])
+    @patch("favorites.services.FavoritesReplicaService.record_toggle")
+    @patch("favorites.services.requests.post")
+    def test_toggle_writes_through_on_success(
+        self, mock_post, mock_record, status_code, expected_calls
+    ):
+        mock_post.return_value = MagicMock(status_code=status_code, json=lambda: {})
+        service = FavoritesService(tmdb_headers={Headers.AUTHORIZATION: "Bearer t"})
+
+        service.toggle_tmdb_favorite(account_id=1, movie_id=2, favorite=True)
+
+        assert mock_record.call_count == expected_calls
+
+    @patch(
+        "favorites.services.FavoritesReplicaService.list_items",
+        return_value=[{"id": i} for i in range(45)],
+    )
+    def test_replica_page_matches_tmdb_shape(self, _items):
+        payload = FavoritesReplicaService.page(account_id=1, page="3")
+
+        assert payload["page"] == 3
+        assert [m["id"] for m in payload["results"]] == [40, 41, 42, 43, 44]
+        assert payload["total_pages"] == 3
+        assert payload["total_results"] == 45
+
+
+@pytest.mark.django_db
+class TestSharedListUpsertSQL:
+    # Runs the real ON CONFLICT statement against the test database.
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def test_insert_then_update_branch(self):
+        created_inst, created = SharedListService.upsert(10, "october")
+        updated_inst, updated = SharedListService.upsert(10, "November")
+
+        assert created is True and updated is False
+        assert updated_inst.pk == created_inst.pk
+        assert updated_inst.created_at == created_inst.created_at
+        assert list(FavoritedList.objects.values_list("account_id", "list_name")) == [
+            (10, "November")
+        ]
+
+    def test_case_insensitive_name_clash_raises(self):
+        SharedListService.upsert(10, "october")
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            SharedListService.upsert(11, "OCTOBER")
+
+        assert FavoritedList.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestFavoritesReplicaStore:
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch):
+        cache.clear()
+        monkeypatch.setattr("favorites.services.FAVORITES_REPLICA_ENABLED", True)
+
+    def test_sync_account_replaces_rows_and_marks_fresh(self):
+        FavoritesReplicaService.sync_account(1, [{"id": 5, "title": "Old"}])
+        FavoritesReplicaService.sync_account(
+            1, [{"id": 7, "title": "A"}, {"id": 7, "title": "dup"}, {"id": "x"}]
+        )
+
+        assert FavoritesReplicaService.is_fresh(1)
+        assert not FavoritesReplicaService.is_fresh(2)
+        assert FavoritesReplicaService.favorite_ids(1) == {7}
+        assert FavoritesReplicaService.list_items(1)[0]["title"] == "A"
+
+    def test_replica_page_serves_full_tmdb_items(self):
+        item = {
+            "id": 7,
+            "title": "A",
+            "backdrop_path": "/b.jpg",
+            "popularity": 12.5,
+            "vote_count": 40,
+            "original_language": "en",
+        }
+        FavoritesReplicaService.sync_account(1, [item])
+
+        payload = FavoritesReplicaService.page(1)
+
+        assert payload["results"] == [item]
+
+    def test_toggle_records_membership_only_and_forces_a_resync(self):
+        FavoritesReplicaService.sync_account(1, [{"id": 5, "title": "A"}])
+        FavoritesReplicaService.record_toggle(1, 9, True)
+
+        row = FavoritedMovie.objects.get(account_id=1, movie_id=9)
+        assert row.title == "" and row.tmdb_item == {}
+        assert FavoritesReplicaService.favorite_ids(1) == {5, 9}
+        assert not FavoritesReplicaService.is_fresh(1)
+
+    def test_removal_keeps_the_replica_fresh(self):
+        FavoritesReplicaService.sync_account(1, [{"id": 5, "title": "A"}])
+        FavoritesReplicaService.record_toggle(1, 5, False)
+
+        assert FavoritesReplicaService.favorite_ids(1) == set()
+        assert FavoritesReplicaService.is_fresh(1)
+
+    def test_old_sync_is_stale(self, monkeypatch):
+        FavoritesReplicaService.sync_account(1, [{"id": 5, "title": "A"}])
+        FavoritesSyncState.objects.filter(account_id=1).update(
+            synced_at=timezone.now() - timedelta(days=1)
+        )
+
+        assert not FavoritesReplicaService.is_fresh(1)
+        assert FavoritesReplicaService.stale_account_ids() == [1]
+
+    @patch("favorites.services.requests.get")
+    def test_replica_is_only_served_to_bearers_tmdb_accepted(self, mock_get):
+        mock_get.return_value = MagicMock(
+            status_code=200, json=lambda: {"results": [{"id": 5}], "total_pages": 1}
+        )
+        owner = FavoritesService({Headers.AUTHORIZATION: "Bearer owner"})
+        assert owner.load_all_favorites(1) == [{"id": 5}]
+        mock_get.reset_mock()
+
+        assert [m["id"] for m in owner.load_all_favorites(1)] == [5]
+        mock_get.assert_not_called()
+
+        mock_get.return_value = MagicMock(status_code=401, json=lambda: {})
+        other = FavoritesService({Headers.AUTHORIZATION: "Bearer other"})
+        assert other.load_all_favorites(1) is None
+        payload, status_code = other.list_tmdb_favorites(1)
+        assert status_code == 401 and payload == {}
+
+
+class TestSharedListResolution:
+    @pytest.fixture
+    def mock_lookup(self, monkeypatch):
+        objects = MagicMock()
+        chain = objects.annotate.return_value.filter.return_value.values_list
+        monkeypatch.setattr(fav_models.FavoritedList, "objects", objects)
+        return objects, chain.return_value
+
+    def test_resolution_is_cached_by_normalized_name(self, mock_lookup):
+        objects, values = mock_lookup
+        values.first.return_value = 77
+
+        assert SharedListService.resolve_account_id("Viral List") == 77
+        assert SharedListService.resolve_account_id("  viral list ") == 77
+        assert objects.annotate.call_count == 1
+
+    def test_unknown_names_are_negatively_cached(self, mock_lookup):
+        objects, values = mock_lookup
+        values.first.return_value = None
+
+        assert SharedListService.resolve_account_id("nobody-has-this") is None
+        assert SharedListService.resolve_account_id("NOBODY-HAS-THIS") is None
+        assert objects.annotate.call_count == 1
+
+    def test_upsert_invalidates_previous_and_new_names(
+        self, mock_favorited_list, monkeypatch
+    ):
+        SharedListService.upsert(42, "before-rename")
+        SharedListService.upsert(42, "after-rename")
+
+        lookup = MagicMock()
+        chain = lookup.annotate.return_value.filter.return_value.values_list
+        chain.return_value.first.return_value = None
+        monkeypatch.setattr(fav_models.FavoritedList, "objects", lookup)
+
+        assert SharedListService.resolve_account_id("after-rename") == 42
+        assert SharedListService.resolve_account_id("before-rename") is None
+        assert lookup.annotate.call_count == 1
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.db import IntegrityError
 from rest_framework import status
 from rest_framework.test import APIRequestFactory
 
@@ -13,7 +14,11 @@ from core.constants import (
     SortBy,
     TMDBPaths,
 )
-from favorites.views import FavoritesView
+from favorites.views import (
+    FavoritesView,
+    GetSharedFavoritedListView,
+    ShareFavoritedListView,
+)
 
 
 @pytest.fixture
@@ -138,3 +143,77 @@ class TestFavoritesViewPOST:
         }
         assert resp.status_code == status.HTTP_200_OK
         assert resp.data["status_message"] == "Removed."
+
+
+class TestShareFavoritedListViewPOST:
+    @patch(
+        "favorites.views.SharedListService.upsert",
+        side_effect=IntegrityError("favorited_lists_list_name_ci_uniq"),
+    )
+    def test_name_conflict_returns_409_from_upsert(self, mock_upsert, api_factory):
+        request = api_factory.post(
+            "/api/v1/share-favorites/",
+            {"account_id": 1, "list_name": " October "},
+            format="json",
+        )
+        resp = ShareFavoritedListView.as_view()(request)
+
+        assert resp.status_code == status.HTTP_409_CONFLICT
+        mock_upsert.assert_called_once_with(account_id=1, list_name="October")
+
+
+class TestGetSharedFavoritedListViewGET:
+    @patch("favorites.views.SharedListService.resolve_account_id", return_value=4242)
+    @patch("favorites.services.requests.post")
+    @patch("favorites.services.requests.get")
+    def test_rendered_list_cached_until_owner_toggles(
+        self, mock_get, mock_post, _resolve, api_factory
+    ):
+        mock_get.return_value = MagicMock(
+            status_code=200,
+            json=lambda: {"results": [{"id": 7, "title": "Up"}], "total_pages": 1},
+        )
+        mock_post.return_value = MagicMock(status_code=200, json=lambda: {})
+        headers = {"HTTP_AUTHORIZATION": "Bearer test_token"}
+        shared_view = GetSharedFavoritedListView.as_view()
+
+        def _get_shared():
+            request = api_factory.get(
+                "/api/v1/get-shared-favorites/?list_name=Cached", **headers
+            )
+            return shared_view(request)
+
+        first = _get_shared()
+        second = _get_shared()
+
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert [m["movie_id"] for m in second.data] == [7]
+        assert mock_get.call_count == 1
+
+        toggle = api_factory.post(
+            "/api/v1/favorites/",
+            {"account_id": 4242, "movie_id": 7, "favorite": False},
+            format="json",
+            **headers,
+        )
+        FavoritesView.as_view()(toggle)
+        _get_shared()
+
+        assert mock_get.call_count == 2
+
+    @patch("favorites.views.SharedListService.resolve_account_id", return_value=4343)
+    @patch("favorites.services.requests.get")
+    def test_upstream_errors_are_not_cached(self, mock_get, _resolve, api_factory):
+        mock_get.return_value = MagicMock(status_code=502, json=lambda: {})
+        headers = {"HTTP_AUTHORIZATION": "Bearer test_token"}
+        view = GetSharedFavoritedListView.as_view()
+
+        for _ in range(2):
+            request = api_factory.get(
+                "/api/v1/get-shared-favorites/?list_name=Flaky", **headers
+            )
+            resp = view(request)
+            assert resp.status_code == status.HTTP_200_OK
+            assert resp.data == []
+
+        assert mock_get.call_count == 2
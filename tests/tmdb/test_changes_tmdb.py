@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from tmdb.changes import CURSOR_KEY, MAX_WINDOW, sync_changes
+from tmdb.client import TMDBClient
+from tmdb.fake_server import FakeTMDbConfig, FakeTMDbServer
+
+
+@pytest.fixture
+def fake_tmdb(monkeypatch):
+    cache.clear()
+    with FakeTMDbServer(FakeTMDbConfig(catalog_size=300)) as server:
+        monkeypatch.setattr(TMDBClient, "BASE", server.base_url)
+        yield server
+
+
+def _calls(server):
+    return server.app.stats()["total"]
+
+
+class TestSyncChanges:
+    def test_only_changed_movies_are_invalidated(self, fake_tmdb):
+        client = TMDBClient(bearer_token="Bearer x")
+        client.movie_details(7)
+        client.movie_details(9)
+        fake_tmdb.app.changed_ids = [7, 250]
+
+        result = sync_changes(client)
+        before = _calls(fake_tmdb)
+        client.movie_details(9)
+        assert _calls(fake_tmdb) == before
+
+        client.movie_details(7)
+        assert _calls(fake_tmdb) == before + 4
+        assert result.changed == 2
+        assert result.refreshed == 0
+
+    def test_refresh_warms_recently_served_movies(self, fake_tmdb):
+        client = TMDBClient(bearer_token="Bearer x")
+        client.movie_details(7)
+        fake_tmdb.app.changed_ids = [7, 250]
+
+        result = sync_changes(client, refresh=True)
+        before = _calls(fake_tmdb)
+        client.movie_details(7)
+
+        assert result.refreshed == 1
+        assert _calls(fake_tmdb) == before
+
+    def test_window_starts_at_cursor_and_is_clamped(self, fake_tmdb):
+        client = TMDBClient(bearer_token="Bearer x")
+        now = timezone.now()
+
+        first = sync_changes(client, since=now - timedelta(days=60), now=now)
+        later = now + timedelta(minutes=10)
+        second = sync_changes(client, now=later)
+
+        assert first.start == now - MAX_WINDOW
+        assert second.start == now
+        assert cache.get(CURSOR_KEY) == later
+
+    def test_pages_through_feed(self, fake_tmdb):
+        fake_tmdb.app.changed_ids = list(range(1, 251))
+
+        result = sync_changes(TMDBClient(bearer_token="Bearer x"))
+
+        assert result.changed == 250
+        assert fake_tmdb.app.stats()["calls"]["changes"] == 3
+
+
+def test_command_reports_changes(fake_tmdb, capsys):
+    fake_tmdb.app.changed_ids = [1, 2, 3]
+
+    call_command("sync_tmdb_changes", "--token", "Bearer x", "--since", "2025-01-01")
+
+    assert "3 movies changed" in capsys.readouterr().out
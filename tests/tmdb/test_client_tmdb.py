@@ -0,0 +1,213 @@
+import pickle
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+
+from tmdb.client import TMDBClient
+from tmdb.movie_cache import (
+    VERSION_TTL,
+    invalidate_movies,
+    movie_namespace,
+    movie_version_key,
+)
+
+PAYLOADS = {
+    "/movie/9": {"id": 9, "title": "Nine", "poster_path": "/p.jpg", "runtime": 90},
+    "/movie/9?videos": {
+        "id": 9,
+        "title": "Nove",
+        "poster_path": "/p.jpg",
+        "runtime": 90,
+        "videos": {
+            "results": [
+                {"name": "T", "key": "abc", "site": "YouTube", "type": "Trailer"},
+                {"name": "V", "key": "def", "site": "Vimeo", "type": "Teaser"},
+            ]
+        },
+    },
+    "/movie/9/watch/providers": {"results": {"US": {"link": "https://x"}}},
+    "/movie/9/credits": {
+        "cast": [
+            {
+                "name": f"Actor {n}",
+                "profile_path": "/a.jpg",
+                "character": "C",
+                "known_for_department": "Acting" if n % 2 else "Sound",
+                "popularity": 1.0,
+                "credit_id": "x" * 24,
+            }
+            for n in range(200)
+        ],
+        "crew": [{"name": f"Crew {n}", "job": "Grip"} for n in range(500)],
+    },
+}
+
+
+@pytest.fixture
+def client():
+    cache.clear()
+    tmdb = TMDBClient(bearer_token="Bearer x")
+    tmdb.BASE = ""
+
+    def get(url, params=None, **kwargs):
+        if params and "append_to_response" in params:
+            url = f"{url}?{params['append_to_response']}"
+        resp = MagicMock(status_code=200, content=b"{}")
+        resp.json.return_value = PAYLOADS[url]
+        return resp
+
+    tmdb.session.get = MagicMock(side_effect=get)
+    return tmdb
+
+
+class TestMovieDetailsProjection:
+    def test_caches_projected_sub_resources(self, client):
+        details = client.movie_details(9)
+
+        cached_credits = cache.get(
+            f"tmdb:{movie_namespace(9)}:/movie/9/credits:[]:_cast_credits"
+        )
+        assert cached_credits == details["credits"]
+        assert len(cached_credits) == 100
+        assert set(cached_credits[0]) == {
+            "name",
+            "profile_path",
+            "character",
+            "known_for_department",
+        }
+        assert details["videos"] == [
+            {
+                "name": "T",
+                "url": "https://www.youtube.com/watch?v=abc",
+                "site": "YouTube",
+                "type": "Trailer",
+            }
+        ]
+        assert details["poster_path"] == "https://image.tmdb.org/t/p/w500/p.jpg"
+
+    def test_warm_details_skip_upstream_including_missing_providers(self, client):
+        first = client.movie_details(9)
+        client.session.get.reset_mock()
+
+        second = client.movie_details(9)
+
+        client.session.get.assert_not_called()
+        assert second == first
+        assert second["providers"] is None
+
+    def test_invalidated_movie_is_refetched(self, client):
+        client.movie_details(9)
+        client.session.get.reset_mock()
+
+        invalidate_movies([9])
+        client.movie_details(9)
+
+        assert client.session.get.call_count == 4
+
+    def test_invalidating_uncached_movies_writes_no_keys(self, client):
+        client.movie_details(9)
+        before = cache.get(movie_version_key(9))
+
+        invalidate_movies([9, 404, 405])
+
+        assert cache.get(movie_version_key(9)) != before
+        assert cache.get_many([movie_version_key(404), movie_version_key(405)]) == {}
+
+    def test_version_keys_expire_after_the_longest_sub_resource(self):
+        fake = MagicMock()
+        fake.get.return_value = None
+        fake.get_many.return_value = {movie_version_key(9): 1}
+
+        with patch("tmdb.movie_cache.cache", fake):
+            movie_namespace(9)
+            invalidate_movies([9])
+
+        assert VERSION_TTL >= 600
+        assert fake.add.call_args.kwargs["timeout"] == VERSION_TTL
+        assert fake.set_many.call_args.kwargs["timeout"] == VERSION_TTL
+
+    def test_providers_entry_stays_small_for_popular_titles(self, client):
+        # Shaped like /watch/providers for a popular title: ~60 regions with
+        # flatrate, rent and buy lists drawn from the same few services.
+        services = [
+            (8, "Netflix"),
+            (9, "Amazon Prime Video"),
+            (337, "Disney Plus"),
+            (384, "HBO Max"),
+            (2, "Apple TV"),
+            (3, "Google Play Movies"),
+            (10, "Amazon Video"),
+            (192, "YouTube"),
+        ]
+
+        def offers(count):
+            return [
+                {
+                    "logo_path": f"/{name.replace(' ', '')}Logo{pid}AbCdEfGh.jpg",
+                    "provider_id": pid,
+                    "provider_name": name,
+                    "display_priority": priority,
+                }
+                for priority, (pid, name) in enumerate(services[:count])
+            ]
+
+        regions = {
+            f"{chr(65 + n // 26)}{chr(65 + n % 26)}": {
+                "link": f"https://www.themoviedb.org/movie/550-fight-club/watch?locale=R{n}",
+                "flatrate": offers(4),
+                "rent": offers(6),
+                "buy": offers(8),
+            }
+            for n in range(60)
+        }
+        raw = {"id": 550, "results": regions}
+
+        compact = client._compact_providers(raw)
+
+        assert len(pickle.dumps(raw["results"], pickle.HIGHEST_PROTOCOL)) > 16 * 1024
+        assert len(pickle.dumps(compact, pickle.HIGHEST_PROTOCOL)) < 8 * 1024
+        assert client._region_providers(compact, "ab")["flatrate"][1] == {
+            "logo_path": "https://image.tmdb.org/t/p/w92/AmazonPrimeVideoLogo9AbCdEfGh.jpg",
+            "provider_id": 9,
+            "provider_name": "Amazon Prime Video",
+            "display_priority": 1,
+        }
+
+    def test_new_locale_costs_one_overlay_call(self, client):
+        client.movie_details(9)
+        client.session.get.reset_mock()
+
+        details = client.movie_details(9, language="es-ES")
+
+        client.session.get.assert_called_once()
+        assert client.session.get.call_args.kwargs["params"] == {
+            "language": "es-ES",
+            "append_to_response": "videos",
+        }
+        assert details["title"] == "Nove" and details["runtime"] == 90
+        assert len(details["credits"]) == 100
+
+    def test_regions_are_sliced_from_one_cached_providers_blob(
+        self, client, monkeypatch
+    ):
+        providers = {
+            "results": {
+                "US": {"link": "https://us", "flatrate": [{"logo_path": "/n.jpg"}]},
+                "BR": {"link": "https://br"},
+            }
+        }
+        monkeypatch.setitem(PAYLOADS, "/movie/8/watch/providers", providers)
+        for suffix in ("", "?videos", "/credits"):
+            monkeypatch.setitem(
+                PAYLOADS, f"/movie/8{suffix}", PAYLOADS[f"/movie/9{suffix}"]
+            )
+
+        assert client.movie_details(8)["providers"] == {"link": "https://br"}
+        client.session.get.reset_mock()
+
+        us = client.movie_details(8, region="us")["providers"]
+        assert client.movie_details(8, region="FR")["providers"] is None
+
+        client.session.get.assert_not_called()
+        assert us["flatrate"] == [{"logo_path": "https://image.tmdb.org/t/p/w92/n.jpg"}]
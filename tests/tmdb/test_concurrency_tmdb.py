@@ -0,0 +1,20 @@
+import threading
+
+import pytest
+
+from tmdb.concurrency import BackgroundPool, PoolFull
+
+
+class TestBackgroundPool:
+    def test_rejects_work_beyond_workers_plus_queue(self):
+        pool = BackgroundPool("test-pool", workers=1, max_queued=1)
+        release = threading.Event()
+
+        running = pool.submit(release.wait)
+        queued = pool.submit(lambda: "queued")
+        with pytest.raises(PoolFull):
+            pool.submit(lambda: "rejected")
+
+        release.set()
+        assert running.result(timeout=1) is True
+        assert queued.result(timeout=1) == "queued"
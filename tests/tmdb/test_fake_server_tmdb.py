@@ -0,0 +1,154 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+from django.core.cache import cache
+
+from tmdb.client import TMDBClient
+from tmdb.concurrency import PoolFull, details_pool
+from tmdb.fake_server import EndpointProfile, FakeTMDbConfig, FakeTMDbServer
+
+
+@pytest.fixture
+def fake_tmdb():
+    with FakeTMDbServer(FakeTMDbConfig(catalog_size=100, page_size=10)) as server:
+        yield server
+
+
+class TestFakeTMDbServer:
+    def test_discover_paginates_catalog(self, fake_tmdb):
+        resp = requests.get(f"{fake_tmdb.base_url}/discover/movie", params={"page": 2})
+
+        payload = resp.json()
+        assert resp.status_code == 200
+        assert [m["id"] for m in payload["results"]] == list(range(11, 21))
+        assert payload["total_pages"] == 10
+        assert payload["total_results"] == 100
+
+    def test_unknown_movie_is_404(self, fake_tmdb):
+        resp = requests.get(f"{fake_tmdb.base_url}/movie/101")
+
+        assert resp.status_code == 404
+        assert resp.json()["status_code"] == 34
+
+    def test_favorite_toggle_updates_account_list(self, fake_tmdb):
+        url = f"{fake_tmdb.base_url}/account/5/favorite"
+        before = requests.get(f"{url}/movies").json()["total_results"]
+
+        resp = requests.post(url, json={"media_type": "movie", "media_id": 1})
+        after = requests.get(f"{url}/movies", params={"page": 99}).json()
+
+        added = resp.status_code == 201
+        assert after["total_results"] == before + added
+        assert after["results"] == []
+
+    def test_stats_count_calls_per_endpoint(self, fake_tmdb):
+        requests.get(f"{fake_tmdb.base_url}/movie/1")
+        requests.get(f"{fake_tmdb.base_url}/movie/1/credits")
+        requests.get(f"{fake_tmdb.base_url}/movie/2")
+
+        stats = requests.get(fake_tmdb.base_url.rsplit("/3", 1)[0] + "/__stats").json()
+
+        assert stats == {"calls": {"details": 2, "credits": 1}, "total": 3}
+
+    def test_fault_injection(self):
+        config = FakeTMDbConfig(
+            endpoints={
+                "discover": EndpointProfile(rate_limit_rate=1.0),
+                "search": EndpointProfile(error_rate=1.0),
+            }
+        )
+        with FakeTMDbServer(config) as server:
+            limited = requests.get(f"{server.base_url}/discover/movie")
+            failed = requests.get(
+                f"{server.base_url}/search/movie", params={"query": "x"}
+            )
+
+        assert limited.status_code == 429
+        assert limited.headers["Retry-After"] == "1"
+        assert failed.status_code == 500
+
+    def test_config_endpoints_inherit_default_profile(self):
+        config = FakeTMDbConfig.from_dict(
+            {
+                "default": {"latency_ms": 20, "latency_p99_ms": 200},
+                "endpoints": {"details": {"error_rate": 0.1}},
+            }
+        )
+
+        details = config.profile("details")
+        assert (details.latency_ms, details.error_rate) == (20.0, 0.1)
+        assert config.profile("search").latency_p99_ms == 200.0
+
+    def test_config_rejects_unknown_endpoint(self):
+        with pytest.raises(ValueError):
+            FakeTMDbConfig.from_dict({"endpoints": {"trending": {}}})
+
+    def test_client_details_against_fake_server(self, fake_tmdb, monkeypatch):
+        cache.clear()
+        monkeypatch.setattr(TMDBClient, "BASE", fake_tmdb.base_url)
+
+        details = TMDBClient(bearer_token="Bearer x").movie_details(7)
+
+        assert details["title"] == "Movie 7"
+        assert details["runtime"] >= 80
+        assert all(v["site"] == "YouTube" for v in details["videos"])
+        assert {c["known_for_department"] for c in details["credits"]} <= {
+            "Acting",
+            "Directing",
+        }
+
+
+class TestMovieDetailsDeadline:
+    def test_slow_and_failing_sections_degrade_then_fill_cache(self, monkeypatch):
+        cache.clear()
+        config = FakeTMDbConfig(
+            endpoints={
+                "credits": EndpointProfile(latency_ms=300),
+                "providers": EndpointProfile(error_rate=1.0),
+            }
+        )
+        with FakeTMDbServer(config) as server:
+            monkeypatch.setattr(TMDBClient, "BASE", server.base_url)
+            client = TMDBClient(bearer_token="Bearer x")
+
+            started = time.monotonic()
+            first = client.movie_details(7, deadline=time.monotonic() + 0.15)
+            elapsed = time.monotonic() - started
+            time.sleep(0.4)
+            second = client.movie_details(7, deadline=time.monotonic() + 0.15)
+
+        assert elapsed < 0.3
+        assert first["partial"] is True
+        assert first["credits"] == [] and first["providers"] is None
+        assert first["title"] == "Movie 7"
+        assert second["credits"]
+        assert second["partial"] is True
+        assert second["providers"] is None
+
+    def test_complete_details_are_not_partial(self, fake_tmdb, monkeypatch):
+        cache.clear()
+        monkeypatch.setattr(TMDBClient, "BASE", fake_tmdb.base_url)
+
+        details = TMDBClient(bearer_token="Bearer x").movie_details(7)
+
+        assert details["partial"] is False
+
+    def test_full_details_pool_degrades_to_fresh_empty_sections(
+        self, fake_tmdb, monkeypatch
+    ):
+        cache.clear()
+        monkeypatch.setattr(TMDBClient, "BASE", fake_tmdb.base_url)
+        monkeypatch.setattr(
+            details_pool, "submit", Mock(side_effect=PoolFull("saturated"))
+        )
+        client = TMDBClient(bearer_token="Bearer x")
+
+        first = client.movie_details(7)
+        first["credits"].append({"name": "leaked"})
+        cache.clear()
+        second = client.movie_details(7)
+
+        assert first["partial"] is True and first["title"] == "Movie 7"
+        assert second["credits"] == [] and second["videos"] == []
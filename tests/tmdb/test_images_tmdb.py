@@ -0,0 +1,140 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from rest_framework.test import APIRequestFactory
+
+from tmdb import images
+from tmdb.images import ImageCache, ImageNotFound, image_url
+from tmdb.views import ImageProxyView
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"x" * 100
+
+
+def _resp(status_code: int, content: bytes = PNG) -> MagicMock:
+    resp = MagicMock(status_code=status_code, content=content)
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    return resp
+
+
+class TestImageUrl:
+    def test_points_at_tmdb_cdn_by_default(self):
+        assert image_url("w500", "/p.jpg") == "https://image.tmdb.org/t/p/w500/p.jpg"
+
+    def test_rewrites_to_proxy_when_configured(self):
+        with patch.object(images, "IMAGE_PROXY_URL", "https://api.example/images/"):
+            assert image_url("w92", "/l.png") == "https://api.example/images/w92/l.png"
+
+    def test_empty_and_absolute_paths_pass_through(self):
+        assert image_url("w500", None) is None
+        assert image_url("w500", "") is None
+        assert image_url("w500", "https://x/p.jpg") == "https://x/p.jpg"
+
+
+class TestImageCache:
+    @patch("tmdb.images.requests.get")
+    def test_fetches_once_then_serves_from_disk(self, mock_get, tmp_path):
+        mock_get.return_value = _resp(200)
+        cache = ImageCache(tmp_path, max_bytes=10_000)
+
+        first = cache.get("w500", "/p.png")
+        second = cache.get("w500", "/p.png")
+
+        assert mock_get.call_count == 1
+        assert first == second
+        assert first.path.read_bytes() == PNG
+        assert first.content_type == "image/png"
+
+    @patch("tmdb.images.requests.get")
+    def test_identical_images_share_one_blob(self, mock_get, tmp_path):
+        mock_get.return_value = _resp(200)
+        cache = ImageCache(tmp_path, max_bytes=10_000)
+
+        assert cache.get("w500", "/a.jpg").path == cache.get("w780", "/b.jpg").path
+        assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
+
+    @patch("tmdb.images.requests.get")
+    def test_rejects_unknown_sizes_and_paths_without_fetching(self, mock_get, tmp_path):
+        cache = ImageCache(tmp_path, max_bytes=10_000)
+
+        for size, path in [
+            ("w1", "/p.jpg"),
+            ("w500", "/../p.jpg"),
+            ("w500", "/p.exe"),
+            ("w500", "/p.svg"),
+        ]:
+            with pytest.raises(ImageNotFound):
+                cache.get(size, path)
+        mock_get.assert_not_called()
+
+    @patch("tmdb.images.requests.get")
+    def test_evicts_least_recently_served(self, mock_get, tmp_path):
+        cache = ImageCache(tmp_path, max_bytes=150)
+        stored = []
+        for n in range(3):
+            mock_get.return_value = _resp(200, bytes([n]) * 100)
+            stored.append(cache.get("w500", f"/{n}.jpg"))
+            os.utime(stored[-1].path, (n, n))
+        os.utime(stored[0].path)  # served again: now the most recent
+
+        assert cache.evict() == 2
+        assert stored[0].path.exists()
+        assert not stored[1].path.exists()
+        assert not stored[2].path.exists()
+        assert len(list((tmp_path / "index").glob("*"))) == 1
+
+    @patch("tmdb.images.requests.get")
+    def test_open_refetches_a_blob_evicted_after_lookup(self, mock_get, tmp_path):
+        mock_get.return_value = _resp(200)
+        cache = ImageCache(tmp_path, max_bytes=10_000)
+        evicted = cache.get("w500", "/p.png")
+        lookup = cache.get
+
+        def get_then_evict(size, path):
+            image = lookup(size, path)
+            image.path.unlink(missing_ok=True)
+            cache.get = lookup
+            return image
+
+        cache.get = get_then_evict
+        image, file = cache.open("w500", "/p.png")
+
+        with file:
+            assert file.read() == PNG
+        assert image == evicted
+        assert mock_get.call_count == 2
+
+
+class TestImageProxyView:
+    @pytest.fixture(autouse=True)
+    def cache(self, tmp_path):
+        with patch.object(images, "_cache", ImageCache(tmp_path, 10_000)):
+            yield
+
+    def _get(self, size, path, **headers):
+        request = APIRequestFactory().get(f"/api/v1/images/{size}/{path}", **headers)
+        return ImageProxyView.as_view()(request, size=size, path=path)
+
+    @patch("tmdb.images.requests.get")
+    def test_serves_file_with_immutable_caching(self, mock_get):
+        mock_get.return_value = _resp(200)
+
+        response = self._get("w500", "p.png")
+
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == PNG
+        assert response["Content-Type"] == "image/png"
+        assert "immutable" in response["Cache-Control"]
+
+        revalidated = self._get("w500", "p.png", HTTP_IF_NONE_MATCH=response["ETag"])
+        assert revalidated.status_code == 304
+
+    @patch("tmdb.images.requests.get")
+    def test_maps_upstream_errors(self, mock_get):
+        mock_get.return_value = _resp(404)
+        assert self._get("w500", "missing.jpg").status_code == 404
+
+        mock_get.return_value = _resp(503)
+        assert self._get("w500", "down.jpg").status_code == 502
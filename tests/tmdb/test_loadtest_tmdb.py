@@ -0,0 +1,112 @@
+import threading
+from collections import Counter
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+import pytest
+
+from tmdb.loadtest import LoadTest, Sampler, Scenario, summarize
+
+METRICS_BODY = (
+    "# TYPE tmdb_cache_requests_total counter\n"
+    'tmdb_cache_requests_total{result="hit"} %d\n'
+    'tmdb_cache_requests_total{result="miss"} %d\n'
+    'tmdb_requests_total{path="/discover/movie",status="200"} %d\n'
+)
+
+
+class _Quiet(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def target():
+    scrapes = []
+
+    def app(environ, start_response):
+        if environ["PATH_INFO"] == "/metrics":
+            scrapes.append(1)
+            n = len(scrapes)
+            body = (METRICS_BODY % (n * 30, n * 10, n * 10)).encode()
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            return [body]
+        if environ["PATH_INFO"].startswith("/api/v1/movies/search/"):
+            start_response("500 Internal Server Error", [])
+            return [b""]
+        start_response("200 OK", [("Content-Type", "application/json")])
+        return [b"{}"]
+
+    httpd = make_server("127.0.0.1", 0, app, handler_class=_Quiet)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestSampler:
+    def test_mix_follows_weights(self):
+        sampler = Sampler(Scenario(), seed=1)
+
+        counts = Counter(sampler.next()[0] for _ in range(5000))
+
+        assert 0.55 < counts["discover"] / 5000 < 0.65
+        assert 0.20 < counts["details"] / 5000 < 0.30
+        assert counts["shared_list"] < counts["search"]
+
+    def test_details_ids_are_zipf_skewed(self):
+        sampler = Sampler(Scenario(catalog_size=1000), seed=1)
+
+        ids = Counter(sampler.movie_id() for _ in range(5000))
+
+        assert ids[1] > ids[2] > ids[10]
+        assert max(ids) <= 1000
+
+    def test_discover_pages_and_account(self):
+        sampler = Sampler(
+            Scenario(mix={"discover": 1}, discover_pages=(2, 3), account_id=9),
+            seed=1,
+        )
+
+        params = [sampler.next()[2] for _ in range(50)]
+
+        assert {p["page"] for p in params} == {2, 3}
+        assert all(p["account_id"] == 9 for p in params)
+
+
+class TestLoadTest:
+    def test_report(self, target):
+        report = LoadTest(
+            target,
+            Scenario(mix={"discover": 3, "search": 1}),
+            rps=200,
+            duration=0.5,
+            workers=4,
+            seed=3,
+        ).run()
+
+        assert report["requests"] == 100
+        ops = report["operations"]
+        assert ops["discover"]["count"] + ops["search"]["count"] == 100
+        assert report["errors"] == {"500": ops["search"]["count"]}
+        assert ops["discover"]["errors"] == {}
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+        assert report["cache"]["hit_ratio"] == 0.75
+        assert report["cache"]["upstream_calls_per_request"] == 0.1
+
+    def test_unreachable_metrics_leaves_cache_empty(self):
+        report = LoadTest(
+            "http://127.0.0.1:9", Scenario(), rps=20, duration=0.1, timeout=0.5
+        ).run()
+
+        assert report["cache"] is None
+        assert report["errors"] == {"ConnectionError": 2}
+
+
+def test_summarize():
+    summary = summarize([float(ms) for ms in range(1, 101)])
+
+    assert summary["p50"] == 51.0
+    assert summary["p99"] == 100.0
+    assert summary["max"] == 100.0
+    assert summarize([])["p50"] is None
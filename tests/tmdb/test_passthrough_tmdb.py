@@ -0,0 +1,107 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from favorites.favorite_ids import FavoriteIdSet
+from tmdb.passthrough import encode_listing
+from tmdb.serializers import (
+    MovieDiscoverListSerializer,
+    MovieDiscoverResultSerializer,
+)
+from tmdb.views import DiscoverMoviesView
+
+
+def _movie(movie_id, **extra):
+    return {
+        "id": movie_id,
+        "title": f"Filme “{movie_id}”",
+        "original_title": "Original",
+        "original_language": "pt",
+        "overview": None,
+        "poster_path": "/p.jpg",
+        "backdrop_path": None,
+        "release_date": "2020-01-01",
+        "genre_ids": [18, 35],
+        "adult": False,
+        "video": False,
+        "popularity": 12.5,
+        "vote_average": 7.0,
+        "vote_count": 10,
+        "budget": 1,
+        **extra,
+    }
+
+
+PAYLOAD = {
+    "page": 3,
+    "results": [_movie(10), _movie(20), _movie(30)],
+    "total_pages": 7,
+    "total_results": 130,
+}
+
+
+def _serialized(favorites):
+    payload = json.loads(json.dumps(PAYLOAD))
+    for item in payload["results"]:
+        item["favorite"] = item["id"] in favorites
+    ser = MovieDiscoverListSerializer(data=payload)
+    ser.is_valid(raise_exception=True)
+    return JSONRenderer().render(ser.data)
+
+
+class TestEncodedListing:
+    def test_splices_flags_into_serializer_identical_bytes(self):
+        listing = encode_listing(PAYLOAD)
+
+        body = listing.render([False, True, False])
+
+        assert listing.ids == (10, 20, 30)
+        assert body == _serialized({20})
+
+    def test_favorite_is_the_last_serializer_field(self):
+        # encode_listing splices the flag after the last field; moving
+        # `favorite` would silently reorder the passthrough output.
+        fields = list(MovieDiscoverResultSerializer().fields)
+
+        assert fields[-1] == "favorite"
+
+    def test_invalid_items_are_dropped(self):
+        listing = encode_listing({"page": 1, "results": [_movie(1), {"id": 2}]})
+
+        body = json.loads(listing.render([True]))
+
+        assert [m["id"] for m in body["results"]] == [1]
+        assert body["results"][0]["favorite"] is True
+
+    def test_empty_page(self):
+        body = encode_listing({"results": []}).render([])
+
+        assert json.loads(body) == {
+            "page": 1,
+            "results": [],
+            "total_pages": 0,
+            "total_results": 0,
+        }
+
+
+@pytest.mark.django_db
+@patch("tmdb.views.TMDB_PASSTHROUGH", True)
+@patch("tmdb.views.TMDBService")
+def test_discover_view_passthrough_matches_serialized_response(mock_service_cls):
+    svc = MagicMock()
+    svc.discover_encoded.return_value = encode_listing(PAYLOAD)
+    svc.fetch_favorite_ids.return_value = FavoriteIdSet({30})
+    mock_service_cls.return_value = svc
+
+    request = APIRequestFactory().get(
+        "/api/v1/discover/?account_id=5", HTTP_AUTHORIZATION="Bearer x"
+    )
+    resp = DiscoverMoviesView.as_view()(request)
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/json"
+    assert resp.content == _serialized({30})
+    svc.discover.assert_not_called()
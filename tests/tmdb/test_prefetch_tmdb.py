@@ -0,0 +1,232 @@
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.test import APIRequestFactory
+
+from tmdb.client import TMDBClient
+from tmdb.passthrough import encode_listing
+from tmdb.prefetch import Prefetcher, TokenBucket, top_k_ids
+from tmdb.views import DiscoverMoviesView, after_response
+
+
+@pytest.fixture
+def prefetcher():
+    cache.clear()
+    return Prefetcher("test", workers=2, max_pending=4, budget=TokenBucket(100, 100))
+
+
+class TestTokenBucket:
+    def test_allows_burst_then_refills_at_rate(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        with patch("tmdb.prefetch.monotonic", return_value=bucket._updated):
+            assert bucket.try_acquire()
+            assert bucket.try_acquire()
+            assert not bucket.try_acquire()
+        with patch("tmdb.prefetch.monotonic", return_value=bucket._updated + 0.15):
+            assert bucket.try_acquire()
+            assert not bucket.try_acquire()
+
+
+class TestPrefetcher:
+    def test_skips_cached_keys(self, prefetcher):
+        cache.set("k", 1)
+        fn = MagicMock()
+
+        assert prefetcher.submit("k", fn) is None
+        fn.assert_not_called()
+
+    def test_dedupes_in_flight_keys_and_bounds_pending(self, prefetcher):
+        release = threading.Event()
+        fn = MagicMock(side_effect=lambda *_: release.wait(5))
+
+        first = prefetcher.submit("k0", fn)
+        assert prefetcher.submit("k0", fn) is None
+        for n in range(1, 4):
+            assert prefetcher.submit(f"k{n}", fn) is not None
+        assert prefetcher.submit("k4", fn) is None
+
+        release.set()
+        first.result(timeout=5)
+        assert fn.call_count == 4
+
+    def test_respects_budget(self, prefetcher):
+        prefetcher.budget = TokenBucket(rate=0, burst=1)
+
+        assert prefetcher.submit("a", MagicMock()).result(timeout=5) is None
+        assert prefetcher.submit("b", MagicMock()) is None
+
+    def test_prefetch_warms_the_key_discover_reads(self, prefetcher):
+        client = TMDBClient(bearer_token="Bearer x")
+        client.BASE = ""
+        client.session.get = MagicMock(
+            return_value=MagicMock(status_code=200, content=b"{}")
+        )
+        client.session.get.return_value.json.return_value = {"page": 2}
+
+        with patch("tmdb.client.next_page_prefetcher", prefetcher):
+            client.prefetch_discover({"page": 2}, encoded=False).result(timeout=5)
+
+        assert client.discover_movies({"page": 2}) == {"page": 2}
+        assert client.session.get.call_count == 1
+
+
+class TestDetailsPrefetch:
+    def test_top_k_by_position_or_popularity(self):
+        results = [{"id": 1, "popularity": 5}, {"id": 2, "popularity": 50}, {}]
+
+        assert top_k_ids(results, 1, "position") == [1]
+        assert top_k_ids(results, 5, "popularity") == [2, 1]
+
+    def test_warms_every_section_and_counts_the_click(self, prefetcher):
+        client = TMDBClient(bearer_token="Bearer x")
+        client.BASE = ""
+
+        def get(url, **kwargs):
+            resp = MagicMock(status_code=200, content=b"{}")
+            resp.json.return_value = {"id": 7} if url == "/movie/7" else {}
+            return resp
+
+        client.session.get = MagicMock(side_effect=get)
+        with patch("tmdb.client.details_prefetcher", prefetcher):
+            client.prefetch_movie_details(7).result(timeout=5)
+            assert client.session.get.call_count == 4
+
+            with patch("tmdb.client.TMDB_PREFETCH_DETAILS_TOP_K", 3), patch(
+                "tmdb.prefetch.metrics.inc"
+            ) as inc:
+                details = client.movie_details(7)
+
+        assert details["id"] == 7 and details["partial"] is False
+        assert client.session.get.call_count == 4
+        inc.assert_any_call("tmdb_prefetch_used_total", {"kind": "details"})
+
+    def test_request_joins_a_running_prefetch(self, prefetcher):
+        client = TMDBClient(bearer_token="Bearer x")
+        client.BASE = ""
+        started, release = threading.Event(), threading.Event()
+
+        def get(url, **kwargs):
+            started.set()
+            release.wait(5)
+            resp = MagicMock(status_code=200, content=b"{}")
+            resp.json.return_value = {"id": 7} if url == "/movie/7" else {}
+            return resp
+
+        client.session.get = MagicMock(side_effect=get)
+        with patch("tmdb.client.details_prefetcher", prefetcher), patch(
+            "tmdb.client.TMDB_PREFETCH_DETAILS_TOP_K", 3
+        ):
+            client.prefetch_movie_details(7)
+            assert started.wait(5)
+            threading.Timer(0.05, release.set).start()
+            details = client.movie_details(7)
+
+        assert details["partial"] is False
+        assert client.session.get.call_count == 4
+
+    def test_join_gives_up_after_timeout(self, prefetcher):
+        started, release = threading.Event(), threading.Event()
+        prefetcher.submit("k", lambda: (started.set(), release.wait(5)))
+        assert started.wait(5)
+
+        with patch("tmdb.prefetch.metrics.inc") as inc:
+            prefetcher.join("k", timeout=0.05)
+        release.set()
+
+        inc.assert_called_once_with(
+            "tmdb_prefetch_total", {"kind": "test", "result": "join_timeout"}
+        )
+
+    def test_queued_prefetch_can_be_cancelled(self):
+        cache.clear()
+        prefetcher = Prefetcher("test", 1, 4, TokenBucket(100, 100))
+        release = threading.Event()
+        fn = MagicMock()
+        prefetcher.submit("busy", lambda: release.wait(5))
+        queued = prefetcher.submit("k", fn)
+
+        assert prefetcher.cancel("k")
+        release.set()
+        assert queued.cancelled()
+        fn.assert_not_called()
+        assert prefetcher.submit("k", fn) is not None
+
+
+@pytest.mark.django_db
+class TestDiscoverPrefetch:
+    @pytest.mark.parametrize(
+        "enabled,page,total_pages,expected",
+        [(True, 1, 3, True), (True, 3, 3, False), (False, 1, 3, False)],
+    )
+    @patch("tmdb.views.TMDBService")
+    def test_schedules_next_page_when_enabled_and_more_pages_exist(
+        self, mock_service_cls, enabled, page, total_pages, expected
+    ):
+        svc = mock_service_cls.return_value
+        svc.discover.return_value = {
+            "page": page,
+            "results": [],
+            "total_pages": total_pages,
+            "total_results": 0,
+        }
+
+        with patch("tmdb.views.TMDB_PREFETCH_NEXT_PAGE", enabled):
+            request = APIRequestFactory().get("/api/v1/discover/", {"page": page})
+            response = DiscoverMoviesView.as_view()(request)
+
+        svc.prefetch_next_discover_page.assert_not_called()
+        response.close()
+        assert svc.prefetch_next_discover_page.called is expected
+
+    @pytest.mark.parametrize("page,expected", [(2, True), (3, False)])
+    @patch("tmdb.views.TMDB_PASSTHROUGH", True)
+    @patch("tmdb.views.TMDB_PREFETCH_NEXT_PAGE", True)
+    @patch("tmdb.views.TMDBService")
+    def test_passthrough_stops_at_the_last_page(self, mock_service_cls, page, expected):
+        svc = mock_service_cls.return_value
+        svc.discover_encoded.return_value = encode_listing(
+            {"page": page, "results": [{"id": 1}], "total_pages": 3}
+        )
+
+        request = APIRequestFactory().get("/api/v1/discover/", {"page": page})
+        DiscoverMoviesView.as_view()(request).close()
+
+        assert svc.prefetch_next_discover_page.called is expected
+
+    @patch("tmdb.views.TMDBService")
+    def test_prefetches_details_for_top_k_results(self, mock_service_cls):
+        svc = mock_service_cls.return_value
+        svc.discover.return_value = {
+            "page": 1,
+            "results": [{"id": n, "popularity": n} for n in range(1, 6)],
+            "total_pages": 1,
+            "total_results": 5,
+        }
+
+        with patch("tmdb.views.TMDB_PREFETCH_DETAILS_TOP_K", 2), patch(
+            "tmdb.views.TMDB_PREFETCH_DETAILS_ORDER", "popularity"
+        ):
+            response = DiscoverMoviesView.as_view()(
+                APIRequestFactory().get("/api/v1/discover/")
+            )
+
+        svc.prefetch_details.assert_not_called()
+        response.close()
+        svc.prefetch_details.assert_called_once_with([5, 4])
+
+
+class TestAfterResponse:
+    def test_runs_tasks_after_the_original_close(self):
+        calls = []
+        response = HttpResponse(b"body")
+        response.close = lambda: calls.append("close")
+        after_response(response, calls.append, "first")
+        after_response(response, Mock(side_effect=RuntimeError("boom")))
+        after_response(response, calls.append, "second")
+
+        response.close()
+
+        assert calls == ["close", "first", "second"]
@@ -8,6 +8,7 @@ from core.constants import (
     QueryParams,
     TMDBPaths,
 )
+from favorites.favorite_ids import FavoriteIdSet
 from tmdb.services import TMDBService
 
 
@@ -93,6 +94,30 @@ class TestTMDBServiceFavoriteIds:
         assert first_params[QueryParams.LANGUAGE] == TMDB_DEFAULT_LANG
         assert first_headers[Headers.AUTHORIZATION] == "Bearer z"
 
+    @patch("tmdb.services.requests.get")
+    def test_fetch_favorite_ids_served_from_cache_on_second_call(self, mock_get):
+        mock_get.return_value = _resp(200, {"results": [{"id": 5}], "total_pages": 1})
+
+        service = TMDBService(bearer_token="Bearer z")
+        first = service.fetch_favorite_ids(account_id=778)
+        second = service.fetch_favorite_ids(account_id=778)
+
+        assert first == second == {5}
+        assert mock_get.call_count == 1
+
+    @patch("tmdb.services.requests.get")
+    def test_cached_ids_are_not_served_to_another_bearer(self, mock_get):
+        mock_get.return_value = _resp(200, {"results": [{"id": 5}], "total_pages": 1})
+        assert TMDBService(bearer_token="Bearer owner").fetch_favorite_ids(779) == {5}
+
+        mock_get.return_value = _resp(401, {})
+        other = TMDBService(bearer_token="Bearer other")
+
+        assert other.fetch_favorite_ids(account_id=779) == set()
+        assert mock_get.call_args.kwargs["headers"][Headers.AUTHORIZATION] == (
+            "Bearer other"
+        )
+
     def test_fetch_favorite_ids_without_bearer_returns_empty(self):
         service = TMDBService(bearer_token=None)
         assert service.fetch_favorite_ids(account_id=1) == set()
@@ -109,6 +134,12 @@ class TestTMDBServiceAnnotateFavorites:
         assert flags[2] is True
         assert flags[3] is True
 
+    def test_annotate_favorites_with_compact_ids(self):
+        service = TMDBService(bearer_token="Bearer t")
+        items = [{"id": 3}, {"id": 1}, {"title": "no id"}]
+        service.annotate_favorites(items, FavoriteIdSet([3]))
+        assert [m["favorite"] for m in items] == [True, False, False]
+
 
 class TestTMDBServiceDetails:
     @patch("tmdb.services.TMDBClient")
@@ -127,4 +158,6 @@ class TestTMDBServiceDetails:
         payload = service.details(500)
 
         assert payload["id"] == 500
-        mock_instance.movie_details.assert_called_once_with(500)
+        mock_instance.movie_details.assert_called_once_with(
+            500, language=None, region=None
+        )
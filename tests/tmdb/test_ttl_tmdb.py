@@ -0,0 +1,89 @@
+import random
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+
+from tmdb.client import TMDBClient
+from tmdb.ttl import HitCounter, TTLPolicy, expiry_spread
+
+RULES = [(r"^/movie/\d+/credits$", 86400), (r"^/movie/\d+", 600)]
+
+
+class TestTTLPolicy:
+    def test_first_matching_rule_wins_and_unmatched_paths_keep_default(self):
+        policy = TTLPolicy(RULES)
+
+        assert policy.resolve("/movie/5/credits", 60) == (RULES[0][0], 86400)
+        assert policy.resolve("/movie/5", 60) == (RULES[1][0], 600)
+        assert policy.resolve("/discover/movie", 60) == ("default", 60)
+
+    def test_jitter_stays_in_bounds_and_spreads_expiry(self):
+        policy = TTLPolicy(RULES, jitter=0.1, rng=random.Random(1))
+
+        spread = expiry_spread(policy, 600, keys=500, bucket_seconds=10)
+
+        assert 540 <= spread["min"] and spread["max"] <= 660
+        assert spread["peak_share"] < 0.2
+        assert expiry_spread(TTLPolicy(RULES), 600, 500, 10)["peak_share"] == 1.0
+
+    def test_popular_entries_are_extended(self):
+        policy = TTLPolicy(RULES, popular_hits=3, popular_factor=4)
+
+        assert policy.resolve("/movie/5", 60, hits=2)[1] == 600
+        assert policy.resolve("/movie/5", 60, hits=3)[1] == 2400
+
+    def test_longest_covers_jitter_and_popular_extension(self):
+        policy = TTLPolicy(RULES, jitter=0.1, popular_hits=3, popular_factor=2)
+        paths = ["/movie/5", "/movie/5/credits"]
+
+        assert TTLPolicy(RULES).longest(paths, 60) == 86400
+        assert policy.longest(paths, 60) == 190080
+        assert policy.longest(["/discover/movie"], 60) == 132
+
+
+class TestHitCounter:
+    def test_counts_until_popped_and_bounds_keys(self):
+        counter = HitCounter(max_keys=2)
+        for key in ("a", "a", "b", "c"):
+            counter.hit(key)
+
+        assert counter.pop("a") == 0
+        assert counter.pop("c") == 1
+        assert counter.pop("c") == 0
+
+
+class TestClientTTL:
+    def test_refill_of_a_hot_key_uses_the_extended_ttl(self):
+        cache.clear()
+        client = TMDBClient(bearer_token="Bearer x")
+        client.BASE = ""
+        client.session.get = MagicMock(
+            return_value=MagicMock(status_code=200, content=b"{}")
+        )
+        client.session.get.return_value.json.return_value = {"cast": []}
+        policy = TTLPolicy(RULES, popular_hits=2, popular_factor=3)
+
+        with patch("tmdb.client.ttl_policy", policy), patch(
+            "tmdb.client.TMDB_TTL_POPULAR_HITS", 2
+        ), patch("tmdb.client.cache.set", wraps=cache.set) as cache_set:
+            client._cached_request("/movie/5/credits", None)
+            client._cached_request("/movie/5/credits", None)
+            client._cached_request("/movie/5/credits", None)
+            cache.clear()
+            client._cached_request("/movie/5/credits", None)
+
+        ttls = [c.kwargs["timeout"] for c in cache_set.call_args_list]
+        assert ttls == [86400, 259200]
+
+
+class TestTTLReportCommand:
+    def test_reports_rule_and_spread_per_path(self):
+        out = StringIO()
+
+        call_command("ttl_report", "/movie/1/credits", "/search/movie", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        assert "credits$" in lines[1] and "600s" in lines[1]
+        assert "default" in lines[2] and "600s" in lines[2]
@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from tmdb import upstream
+from tmdb.upstream import RollingStats, tracked, upstream_path
+
+
+class TestRollingStats:
+    def test_snapshot_percentiles_and_error_rate(self):
+        stats = RollingStats(window_seconds=60)
+        for ms in range(1, 101):
+            stats.record(float(ms), ok=ms % 4 != 0)
+
+        snap = stats.snapshot()
+
+        assert snap["count"] == 100
+        assert snap["p50_ms"] == 51.0
+        assert snap["p99_ms"] == 100.0
+        assert snap["error_rate"] == 0.25
+
+    def test_samples_outside_window_are_ignored(self, monkeypatch):
+        stats = RollingStats(window_seconds=10)
+        monkeypatch.setattr(upstream, "monotonic", lambda: 100.0)
+        stats.record(5.0, ok=False)
+        monkeypatch.setattr(upstream, "monotonic", lambda: 200.0)
+
+        assert stats.snapshot()["count"] == 0
+
+
+class TestTracked:
+    @pytest.fixture
+    def stats(self, monkeypatch):
+        stats = RollingStats(window_seconds=60)
+        monkeypatch.setattr(upstream, "tmdb_stats", stats)
+        return stats
+
+    @pytest.mark.parametrize(
+        "status_code,error_rate", [(200, 0.0), (404, 0.0), (429, 1.0), (503, 1.0)]
+    )
+    def test_records_status(self, stats, status_code, error_rate):
+        send = MagicMock(return_value=MagicMock(status_code=status_code))
+
+        resp = tracked(send, "https://tmdb.test/x", timeout=1)
+
+        assert resp.status_code == status_code
+        send.assert_called_once_with("https://tmdb.test/x", timeout=1)
+        assert stats.snapshot()["error_rate"] == error_rate
+
+    def test_records_failure_without_response(self, stats):
+        send = MagicMock(side_effect=requests.ConnectionError("down"))
+
+        with pytest.raises(requests.ConnectionError):
+            tracked(send, "https://tmdb.test/x")
+
+        snap = stats.snapshot()
+        assert snap["count"] == 1
+        assert snap["error_rate"] == 1.0
+
+
+class TestUpstreamPath:
+    def test_api_ids_and_image_files_are_collapsed(self):
+        assert upstream_path("https://api.themoviedb.org/3/movie/9/credits") == (
+            "/movie/{id}/credits"
+        )
+        assert upstream_path("https://image.tmdb.org/t/p/w500/abc.jpg") == (
+            "/images/w500"
+        )
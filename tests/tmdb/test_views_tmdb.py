@@ -1,3 +1,4 @@
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -70,6 +71,36 @@ class TestDiscoverMoviesView:
         assert by_id[200] is True
         assert by_id[300] is False
 
+    @patch("tmdb.views.TMDB_FAVORITES_DEADLINE", 0.05)
+    @patch("tmdb.views.TMDBService")
+    def test_discover_movies_slow_favorites_degrade_to_false(
+        self, mock_service_cls, api_factory
+    ):
+        release = threading.Event()
+        svc = MagicMock()
+        svc.discover.return_value = {
+            "page": 1,
+            "results": [{"id": 200, "title": "Fav"}],
+            "total_pages": 1,
+            "total_results": 1,
+        }
+        svc.fetch_favorite_ids.side_effect = lambda _account_id: (
+            release.wait(5) and {200}
+        )
+        mock_service_cls.return_value = svc
+
+        req = api_factory.get(
+            "/api/v1/movies/discover/?account_id=42", HTTP_AUTHORIZATION="Bearer x"
+        )
+        try:
+            resp = DiscoverMoviesView.as_view()(req)
+        finally:
+            release.set()
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["results"][0]["favorite"] is False
+        svc.annotate_favorites.assert_not_called()
+
     @patch("tmdb.views.TMDBService")
     def test_discover_movies_empty_results(self, mock_service_cls, api_factory):
         svc = MagicMock()
@@ -122,8 +153,8 @@ class TestSearchMoviesView:
         search_url = f"{TMDB_API_BASE}{TMDBPaths.SEARCH_MOVIE}"
         fav_url = f"{TMDB_API_BASE}{TMDBPaths.ACCOUNT_FAVORITES.format(account_id=7)}"
 
-        mock_requests_get.side_effect = [
-            _resp(
+        responses = {
+            search_url: _resp(
                 200,
                 {
                     "page": 1,
@@ -135,7 +166,7 @@ class TestSearchMoviesView:
                     "total_results": 2,
                 },
             ),
-            _resp(
+            fav_url: _resp(
                 200,
                 {
                     "page": 1,
@@ -144,7 +175,8 @@ class TestSearchMoviesView:
                     "total_results": 1,
                 },
             ),
-        ]
+        }
+        mock_requests_get.side_effect = lambda url, **_kw: responses[url]
 
         request = api_factory.get(
             f"/api/v1/movies/search/?{QueryParams.QUERY}=ava&account_id=7",
@@ -158,10 +190,8 @@ class TestSearchMoviesView:
         assert res[11] is False
         assert res[22] is True
 
-        first_call_url = mock_requests_get.call_args_list[0].args[0]
-        second_call_url = mock_requests_get.call_args_list[1].args[0]
-        assert first_call_url == search_url
-        assert second_call_url == fav_url
+        called_urls = {c.args[0] for c in mock_requests_get.call_args_list}
+        assert called_urls == {search_url, fav_url}
 
     def test_search_requires_query_param(self, api_factory):
         request = api_factory.get("/api/v1/movies/search/")
@@ -190,4 +220,29 @@ class TestMovieDetailsView:
 
         assert resp.status_code == status.HTTP_200_OK
         assert resp.data["title"] == "Interstellar"
-        svc.details.assert_called_once_with(500)
+        svc.details.assert_called_once_with(500, language=None, region=None)
+
+    @pytest.mark.parametrize(
+        "params,status_code",
+        [
+            ({"language": "es-ES", "region": "mx"}, status.HTTP_200_OK),
+            ({"language": "x" * 500}, status.HTTP_400_BAD_REQUEST),
+            ({"language": "en US"}, status.HTTP_400_BAD_REQUEST),
+            ({"region": "BRA"}, status.HTTP_400_BAD_REQUEST),
+        ],
+    )
+    @patch("tmdb.views.TMDBService")
+    def test_movie_details_validates_locale(
+        self, mock_service_cls, api_factory, params, status_code
+    ):
+        svc = mock_service_cls.return_value
+        svc.details.return_value = {"id": 500}
+
+        request = api_factory.get("/api/v1/movies/500/", params)
+        resp = MovieDetailsView.as_view()(request, tmdb_id=500)
+
+        assert resp.status_code == status_code
+        if status_code == status.HTTP_200_OK:
+            svc.details.assert_called_once_with(500, language="es-ES", region="mx")
+        else:
+            svc.details.assert_not_called()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+import requests
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.constants import TMDB_MOVIE_CACHE_TTL
+from tmdb.client import TMDBClient
+from tmdb.movie_cache import invalidate_movies
+
+CURSOR_KEY = "tmdb:changes:cursor"
+# TMDb rejects /movie/changes windows longer than 14 days.
+MAX_WINDOW = timedelta(days=14)
+
+
+@dataclass
+class ChangeSyncResult:
+    start: datetime
+    end: datetime
+    changed: int
+    refreshed: int
+
+
+def changed_movie_ids(client: TMDBClient, start: datetime, end: datetime) -> list[int]:
+    ids: list[int] = []
+    page = 1
+    while True:
+        payload = client.movie_changes(
+            start.date().isoformat(), end.date().isoformat(), page
+        )
+        ids.extend(
+            item["id"]
+            for item in payload.get("results", [])
+            if isinstance(item.get("id"), int)
+        )
+        if page >= (payload.get("total_pages") or 1):
+            return ids
+        page += 1
+
+
+def sync_changes(
+    client: TMDBClient,
+    since: Optional[datetime] = None,
+    refresh: bool = False,
+    now: Optional[datetime] = None,
+) -> ChangeSyncResult:
+    # The feed is day-granular, so overlapping runs re-invalidate today's
+    # changes; that costs a refetch, never a stale read. Anything older than
+    # the movie TTL has expired anyway, which bounds the first window.
+    now = now or timezone.now()
+    since = (
+        since or cache.get(CURSOR_KEY) or now - timedelta(seconds=TMDB_MOVIE_CACHE_TTL)
+    )
+    since = max(since, now - MAX_WINDOW)
+
+    ids = list(dict.fromkeys(changed_movie_ids(client, since, now)))
+    # Movies with a version key have been served recently; warm those again.
+    invalidated = invalidate_movies(ids)
+    hot = invalidated if refresh else []
+
+    refreshed = 0
+    for tmdb_id in hot:
+        try:
+            client.movie_details(tmdb_id)
+        except requests.RequestException:
+            continue
+        refreshed += 1
+
+    cache.set(CURSOR_KEY, now, timeout=None)
+    return ChangeSyncResult(start=since, end=now, changed=len(ids), refreshed=refreshed)
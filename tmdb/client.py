@@ -1,13 +1,56 @@
-from typing import Any, Dict, Optional, Union
+from concurrent.futures import Future
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Union
 
 import requests
 from django.conf import settings
 from django.core.cache import cache
 
+from core import metrics, tracing
+from core.constants import (
+    TMDB_API_BASE,
+    TMDB_DEFAULT_REGION,
+    TMDB_DETAILS_DEADLINE,
+    TMDB_MOVIE_CACHE_TTL,
+    TMDB_PREFETCH_DETAILS_TOP_K,
+    TMDB_TTL_POPULAR_HITS,
+    ImageSize,
+    TMDBPaths,
+)
+from tmdb.concurrency import PoolFull, details_pool
+from tmdb.images import image_url
+from tmdb.movie_cache import movie_namespace
+from tmdb.passthrough import EncodedListing, encode_listing
+from tmdb.prefetch import (
+    details_prefetcher,
+    next_page_prefetcher,
+    prefetched_marker_key,
+    record_prefetch_use,
+)
+from tmdb.ttl import hit_counter, ttl_policy
+from tmdb.upstream import tracked
+
+_MISSING = object()
+
+# Builders rather than values: the empty section is merged into, or returned
+# as part of, a response the caller may mutate.
+EMPTY_SECTIONS: Dict[str, Callable[[], Any]] = {
+    "overlay": lambda: {"videos": []},
+    "providers": dict,
+    "credits": list,
+}
+# Fields of /movie/{id} that vary with `language`. Everything else, plus
+# credits and providers, is cached once per movie and shared by all locales.
+LOCALIZED_FIELDS = ("title", "overview", "tagline", "genres", "poster_path")
+# Provider fields kept per flatrate entry; display_priority varies by region
+# and is stored with each region's reference instead.
+PROVIDER_FIELDS = ("logo_path", "provider_id", "provider_name")
+# Floor for the core details call once the budget is nearly spent.
+MIN_CALL_TIMEOUT = 0.5
+
 
 class TMDBClient:
-    BASE = "https://api.themoviedb.org/3"
-    IMAGE_BASE = "https://image.tmdb.org/t/p/"
+    BASE = TMDB_API_BASE
 
     def __init__(self, bearer_token: Optional[str] = None, language: str = "pt-BR"):
         token = bearer_token or settings.TMDB_BEARER or ""
@@ -17,41 +60,232 @@ class TMDBClient:
             self.session.headers.update({"Authorization": token})
         self.timeout = 10
 
+    def _cache_key(
+        self,
+        path: str,
+        params: Optional[dict[str, Union[str, int, bool]]],
+        project: Optional[Callable[[Dict[str, Any]], Any]],
+        namespace: Optional[str],
+    ) -> str:
+        # With `project`, only its result is cached (under a key naming the
+        # projection), so hits never unpickle fields the API does not return.
+        # `namespace` replaces the URL in the key (see tmdb.movie_cache).
+        key_base = f"{namespace}:{path}" if namespace else f"{self.BASE}{path}"
+        cache_key = f"tmdb:{key_base}:{str(sorted((params or {}).items()))}"
+        if project is not None:
+            cache_key = f"{cache_key}:{project.__name__}"
+        return cache_key
+
     def _cached_request(
-        self, path: str, params: Optional[dict[str, Union[str, int, bool]]]
-    ) -> Dict[str, Any]:
-        url = f"{self.BASE}{path}"
-        key_params = params or {}
-        cache_key = f"tmdb:{url}:{str(sorted(key_params.items()))}"
-        cached = cache.get(cache_key)
-        if cached is not None:
+        self,
+        path: str,
+        params: Optional[dict[str, Union[str, int, bool]]],
+        project: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        namespace: Optional[str] = None,
+        ttl: int = 600,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        cache_key = self._cache_key(path, params, project, namespace)
+        with tracing.span("cache", "get"):
+            cached = cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            metrics.inc("tmdb_cache_requests_total", {"result": "hit"})
+            if TMDB_TTL_POPULAR_HITS:
+                hit_counter.hit(cache_key)
             return cached
 
-        resp = self.session.get(url, params=key_params or None, timeout=self.timeout)
+        metrics.inc("tmdb_cache_requests_total", {"result": "miss"})
+        resp = tracked(
+            self.session.get,
+            f"{self.BASE}{path}",
+            params=params or None,
+            timeout=self.timeout if timeout is None else timeout,
+        )
         resp.raise_for_status()
+        metrics.inc("tmdb_cache_bytes_total", amount=len(resp.content))
         data = resp.json()
-        cache.set(cache_key, data, timeout=600)
+        if project is not None:
+            data = project(data)
+        # `ttl` is the fallback for paths the TTL policy does not cover.
+        rule, ttl = ttl_policy.resolve(path, ttl, hit_counter.pop(cache_key))
+        metrics.observe("tmdb_cache_ttl_seconds", ttl, {"rule": rule})
+        with tracing.span("cache", "set"):
+            cache.set(cache_key, data, timeout=ttl)
         return data
 
+    def _cached_request_async(
+        self,
+        path: str,
+        params: Optional[dict[str, Union[str, int, bool]]],
+        project: Callable[[Dict[str, Any]], Any],
+        namespace: str,
+        ttl: int,
+    ) -> Future[Any]:
+        # Hits resolve inline; only misses pay for a worker thread. A miss the
+        # details pool rejects resolves to PoolFull, i.e. a partial section.
+        cache_key = self._cache_key(path, params, project, namespace)
+        cached = cache.get(cache_key, _MISSING)
+        if cached is _MISSING:
+            try:
+                return details_pool.submit(
+                    self._cached_request, path, params, project, namespace, ttl
+                )
+            except PoolFull as exc:
+                metrics.inc("tmdb_details_rejected_total")
+                cached = exc
+        else:
+            metrics.inc("tmdb_cache_requests_total", {"result": "hit"})
+            if TMDB_TTL_POPULAR_HITS:
+                hit_counter.hit(cache_key)
+        future: Future[Any] = Future()
+        if isinstance(cached, PoolFull):
+            future.set_exception(cached)
+        else:
+            future.set_result(cached)
+        return future
+
     def discover_movies(
         self, params: dict[str, Union[str, int, bool]]
     ) -> Dict[str, Any]:
         return self._cached_request("/discover/movie", params=params)
 
-    def movie_details(self, tmdb_id: int) -> Dict[str, Any]:
-        details = self._cached_request(f"/movie/{tmdb_id}", {"language": self.language})
+    def discover_movies_encoded(
+        self, params: dict[str, Union[str, int, bool]]
+    ) -> EncodedListing:
+        return self._cached_request("/discover/movie", params, encode_listing)
 
-        if details.get("poster_path"):
-            details["poster_path"] = f"{self.IMAGE_BASE}w500{details['poster_path']}"
-        if details.get("backdrop_path"):
-            details["backdrop_path"] = (
-                f"{self.IMAGE_BASE}w780{details['backdrop_path']}"
+    def prefetch_discover(
+        self, params: dict[str, Union[str, int, bool]], encoded: bool
+    ) -> Optional[Future[Any]]:
+        # Warms the same key discover_movies(_encoded) will read.
+        project = encode_listing if encoded else None
+        return next_page_prefetcher.submit(
+            self._cache_key("/discover/movie", params, project, None),
+            self._cached_request,
+            "/discover/movie",
+            params,
+            project,
+        )
+
+    def _details_requests(
+        self, tmdb_id: int, language: Optional[str] = None
+    ) -> dict[str, tuple[str, Optional[dict[str, Any]], Callable[..., Any]]]:
+        # `core` is fetched without a language (TMDb's en-US defaults double
+        # as the fallback when the overlay is late); `overlay` is one small
+        # call per locale carrying the localized fields and videos.
+        overlay_params = {
+            "language": language or self.language,
+            "append_to_response": "videos",
+        }
+        return {
+            "core": (f"/movie/{tmdb_id}", None, self._details),
+            "overlay": (f"/movie/{tmdb_id}", overlay_params, self._localized_details),
+            "providers": (
+                f"/movie/{tmdb_id}/watch/providers",
+                None,
+                self._compact_providers,
+            ),
+            "credits": (f"/movie/{tmdb_id}/credits", None, self._cast_credits),
+        }
+
+    def movie_details(
+        self,
+        tmdb_id: int,
+        language: Optional[str] = None,
+        region: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        # Sub-resources are fetched concurrently and awaited only until the
+        # deadline; late or failed ones come back empty with `partial` set and
+        # keep filling the cache in the background for the next request.
+        if deadline is None:
+            deadline = monotonic() + TMDB_DETAILS_DEADLINE
+        ns, ttl = movie_namespace(tmdb_id), TMDB_MOVIE_CACHE_TTL
+        requests_ = self._details_requests(tmdb_id, language)
+        core_path, core_params, core_project = requests_.pop("core")
+        if TMDB_PREFETCH_DETAILS_TOP_K:
+            # A running prefetch is already making the calls below; let it
+            # fill the cache rather than repeat them.
+            details_prefetcher.join(
+                self._cache_key(core_path, core_params, core_project, ns),
+                timeout=max(deadline - monotonic(), 0),
             )
+            record_prefetch_use(tmdb_id)
+
+        sections = {
+            name: self._cached_request_async(path, params, project, ns, ttl)
+            for name, (path, params, project) in requests_.items()
+        }
+        details = self._cached_request(
+            core_path,
+            core_params,
+            core_project,
+            namespace=ns,
+            ttl=ttl,
+            timeout=max(deadline - monotonic(), MIN_CALL_TIMEOUT),
+        )
+
+        partial = False
+        for name, future in sections.items():
+            try:
+                value = future.result(timeout=max(deadline - monotonic(), 0))
+            except (TimeoutError, PoolFull, requests.RequestException, ValueError):
+                value = EMPTY_SECTIONS[name]()
+                partial = True
+            if name == "overlay":
+                details.update(value)
+            elif name == "providers":
+                details[name] = self._region_providers(value, region)
+            else:
+                details[name] = value
+        details["partial"] = partial
+        return details
+
+    def prefetch_movie_details(self, tmdb_id: int) -> Optional[Future[Any]]:
+        # Keyed on the core details entry, which is filled first.
+        ns = movie_namespace(tmdb_id)
+        path, params, project = self._details_requests(tmdb_id)["core"]
+        return details_prefetcher.submit(
+            self._cache_key(path, params, project, ns),
+            self._warm_movie_details,
+            tmdb_id,
+            ns,
+            cost=4,
+        )
+
+    def _warm_movie_details(self, tmdb_id: int, namespace: str) -> None:
+        # Sequential on the prefetch worker, never on the request executor.
+        for path, params, project in self._details_requests(tmdb_id).values():
+            self._cached_request(path, params, project, namespace, TMDB_MOVIE_CACHE_TTL)
+        cache.set(prefetched_marker_key(tmdb_id), True, TMDB_MOVIE_CACHE_TTL)
+
+    def movie_changes(
+        self, start_date: str, end_date: str, page: int = 1
+    ) -> Dict[str, Any]:
+        resp = tracked(
+            self.session.get,
+            f"{self.BASE}{TMDBPaths.MOVIE_CHANGES}",
+            params={"start_date": start_date, "end_date": end_date, "page": page},
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
-        videos_data = self._cached_request(
-            f"/movie/{tmdb_id}/videos", {"language": self.language}
+    def _details(self, details: Dict[str, Any]) -> Dict[str, Any]:
+        details["poster_path"] = image_url(ImageSize.W500, details.get("poster_path"))
+        details["backdrop_path"] = image_url(
+            ImageSize.W780, details.get("backdrop_path")
         )
-        youtube_videos = [
+        return details
+
+    def _localized_details(self, details: Dict[str, Any]) -> Dict[str, Any]:
+        overlay = {field: details.get(field) for field in LOCALIZED_FIELDS}
+        overlay["poster_path"] = image_url(ImageSize.W500, overlay["poster_path"])
+        overlay["videos"] = self._youtube_videos(details.get("videos") or {})
+        return overlay
+
+    def _youtube_videos(self, videos_data: Dict[str, Any]) -> list[Dict[str, Any]]:
+        return [
             {
                 "name": v.get("name"),
                 "url": f"https://www.youtube.com/watch?v={v['key']}",
@@ -62,30 +296,55 @@ class TMDBClient:
             if v.get("site") == "YouTube" and v.get("key")
         ]
 
-        providers_data = self._cached_request(f"/movie/{tmdb_id}/watch/providers", None)
-        providers_br = providers_data.get("results", {}).get("BR")
-        if providers_br and providers_br.get("flatrate"):
-            for p in providers_br["flatrate"]:
-                if p.get("logo_path"):
-                    p["logo_path"] = f"{self.IMAGE_BASE}w92{p['logo_path']}"
+    def _compact_providers(self, providers_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Every region is cached together and _region_providers slices on read.
+        # Only what it serves is kept (link and flatrate), and each provider is
+        # stored once with regions referring to it by index: the raw blob of a
+        # popular title runs to tens of KiB, this to a few.
+        catalog: list[tuple[tuple[str, Any], ...]] = []
+        index: dict[tuple[tuple[str, Any], ...], int] = {}
+        regions: dict[str, tuple[Optional[str], tuple[tuple[int, Any], ...]]] = {}
+        for region, entry in (providers_data.get("results") or {}).items():
+            refs = []
+            for item in entry.get("flatrate") or []:
+                provider = tuple((f, item[f]) for f in PROVIDER_FIELDS if f in item)
+                if provider not in index:
+                    index[provider] = len(catalog)
+                    catalog.append(provider)
+                refs.append((index[provider], item.get("display_priority")))
+            regions[region] = (entry.get("link"), tuple(refs))
+        return {"catalog": catalog, "regions": regions}
 
-        credits_data = self._cached_request(f"/movie/{tmdb_id}/credits", None)
-        filtered_credits = [
+    def _region_providers(
+        self, providers: Optional[Dict[str, Any]], region: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        providers = providers or {}
+        entry = providers.get("regions", {}).get(
+            (region or TMDB_DEFAULT_REGION).upper()
+        )
+        if not entry:
+            return None
+        link, refs = entry
+        found: Dict[str, Any] = {} if link is None else {"link": link}
+        if refs:
+            flatrate = []
+            for position, priority in refs:
+                item = dict(providers["catalog"][position])
+                item["logo_path"] = image_url(ImageSize.W92, item.get("logo_path"))
+                if priority is not None:
+                    item["display_priority"] = priority
+                flatrate.append(item)
+            found["flatrate"] = flatrate
+        return found
+
+    def _cast_credits(self, credits_data: Dict[str, Any]) -> list[Dict[str, Any]]:
+        return [
             {
                 "name": c.get("name"),
-                "profile_path": (
-                    f"{self.IMAGE_BASE}w185{c['profile_path']}"
-                    if c.get("profile_path")
-                    else None
-                ),
+                "profile_path": image_url(ImageSize.W185, c.get("profile_path")),
                 "character": c.get("character"),
                 "known_for_department": c.get("known_for_department"),
             }
             for c in credits_data.get("cast", [])
             if c.get("known_for_department") in ("Acting", "Directing")
         ]
-
-        details["videos"] = youtube_videos
-        details["providers"] = providers_br
-        details["credits"] = filtered_credits
-        return details
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, TypeVar
+
+from django.db import connections
+
+from core.constants import (
+    TMDB_CONCURRENCY_WORKERS,
+    TMDB_DETAILS_MAX_QUEUED,
+    TMDB_DETAILS_WORKERS,
+)
+
+T = TypeVar("T")
+
+
+class PoolFull(RuntimeError):
+    pass
+
+
+class BackgroundPool:
+    # A thread pool that carries the caller's context (tracing spans) into the
+    # worker and closes DB connections afterwards. With `max_queued`, work
+    # beyond the busy workers plus that many queued jobs is rejected with
+    # PoolFull instead of waiting behind a backlog.
+
+    def __init__(self, name: str, workers: int, max_queued: int = 0) -> None:
+        self.workers = workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=name
+        )
+        self._active = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        with self._lock:
+            if self.max_queued and self._pending >= self.workers + self.max_queued:
+                raise PoolFull(f"{self.workers} workers, {self.max_queued} queued")
+            self._pending += 1
+        context = copy_context()
+        future = self._executor.submit(context.run, self._run, fn, *args, **kwargs)
+        future.add_done_callback(self._done)
+        return future
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "active": self._active,
+            "queued": self._executor._work_queue.qsize(),
+        }
+
+    def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            connections.close_all()
+            with self._lock:
+                self._active -= 1
+
+    def _done(self, _: Future[Any]) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+_pool = BackgroundPool("tmdb", TMDB_CONCURRENCY_WORKERS)
+# Movie details sections get their own bounded pool so a burst of details
+# misses cannot starve the favorites fan-out on the shared pool, and vice versa.
+details_pool = BackgroundPool(
+    "tmdb-details", TMDB_DETAILS_WORKERS, TMDB_DETAILS_MAX_QUEUED
+)
+
+
+def run_in_background(fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+    return _pool.submit(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict[str, int]:
+    return _pool.stats()
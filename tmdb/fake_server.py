@@ -0,0 +1,539 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field, fields
+from datetime import date, timedelta
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+# Local stand-in for the parts of the TMDb v3 API this project calls. Data is
+# generated deterministically from the movie id (and `seed`), so any id up to
+# `catalog_size` exists without fixtures. Point TMDB_API_BASE at `base_url`.
+
+Environ = dict[str, Any]
+StartResponse = Callable[..., Any]
+
+API_PREFIX = "/3"
+REGIONS = ("BR", "US", "GB", "DE", "FR", "ES", "PT", "MX", "CA", "JP")
+GENRES = (28, 12, 16, 35, 80, 99, 18, 10751, 14, 36, 27, 10402, 9648, 878, 53)
+DEPARTMENTS = ("Acting", "Acting", "Acting", "Directing", "Writing", "Sound")
+# TMDb caps discover/search at 500 pages.
+MAX_PAGES = 500
+CHANGES_PAGE_SIZE = 100
+
+ENDPOINTS = (
+    "discover",
+    "search",
+    "details",
+    "videos",
+    "providers",
+    "credits",
+    "favorites",
+    "favorite_toggle",
+    "changes",
+)
+
+
+@dataclass
+class EndpointProfile:
+    latency_ms: float = 0.0
+    latency_p99_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+    def delay(self, rng: random.Random) -> float:
+        # Log-normal with the configured median and p99; constant latency when
+        # no p99 above the median is given.
+        if self.latency_ms <= 0:
+            return 0.0
+        if self.latency_p99_ms <= self.latency_ms:
+            return self.latency_ms / 1000
+        sigma = math.log(self.latency_p99_ms / self.latency_ms) / 2.326
+        return rng.lognormvariate(math.log(self.latency_ms), sigma) / 1000
+
+
+@dataclass
+class FakeTMDbConfig:
+    page_size: int = 20
+    catalog_size: int = 10_000
+    favorites_per_account: int = 40
+    seed: int = 0
+    default: EndpointProfile = field(default_factory=EndpointProfile)
+    endpoints: dict[str, EndpointProfile] = field(default_factory=dict)
+
+    def profile(self, endpoint: str) -> EndpointProfile:
+        return self.endpoints.get(endpoint, self.default)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FakeTMDbConfig":
+        # {"page_size": 20, "default": {...}, "endpoints": {"details": {...}}};
+        # endpoint profiles inherit unspecified fields from "default".
+        default = _profile(data.get("default", {}), EndpointProfile())
+        unknown = set(data.get("endpoints", {})) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        return cls(
+            page_size=int(data.get("page_size", cls.page_size)),
+            catalog_size=int(data.get("catalog_size", cls.catalog_size)),
+            favorites_per_account=int(
+                data.get("favorites_per_account", cls.favorites_per_account)
+            ),
+            seed=int(data.get("seed", cls.seed)),
+            default=default,
+            endpoints={
+                name: _profile(values, default)
+                for name, values in data.get("endpoints", {}).items()
+            },
+        )
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "FakeTMDbConfig":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+def _profile(values: dict[str, Any], base: EndpointProfile) -> EndpointProfile:
+    known = {f.name for f in fields(EndpointProfile)}
+    unknown = set(values) - known
+    if unknown:
+        raise ValueError(f"Unknown profile fields: {', '.join(sorted(unknown))}")
+    merged = {name: getattr(base, name) for name in known}
+    merged.update({k: float(v) for k, v in values.items()})
+    return EndpointProfile(**merged)
+
+
+ROUTES: tuple[tuple[str, str, re.Pattern[str]], ...] = (
+    ("discover", "GET", re.compile(r"^/discover/movie$")),
+    ("search", "GET", re.compile(r"^/search/movie$")),
+    ("details", "GET", re.compile(r"^/movie/(?P<movie_id>\d+)$")),
+    ("videos", "GET", re.compile(r"^/movie/(?P<movie_id>\d+)/videos$")),
+    ("providers", "GET", re.compile(r"^/movie/(?P<movie_id>\d+)/watch/providers$")),
+    ("credits", "GET", re.compile(r"^/movie/(?P<movie_id>\d+)/credits$")),
+    (
+        "favorites",
+        "GET",
+        re.compile(r"^/account/(?P<account_id>\d+)/favorite/movies$"),
+    ),
+    ("favorite_toggle", "POST", re.compile(r"^/account/(?P<account_id>\d+)/favorite$")),
+    ("changes", "GET", re.compile(r"^/movie/changes$")),
+)
+
+
+class FakeTMDbApp:
+    def __init__(self, config: Optional[FakeTMDbConfig] = None) -> None:
+        self.config = config or FakeTMDbConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._accounts: dict[int, dict[int, None]] = {}
+        self._calls: dict[str, int] = {}
+        # Ids reported by /movie/changes, whatever the requested window.
+        self.changed_ids: list[int] = []
+
+    def __call__(
+        self, environ: Environ, start_response: StartResponse
+    ) -> Iterable[bytes]:
+        method = environ["REQUEST_METHOD"]
+        path = environ.get("PATH_INFO", "")
+
+        if path == "/__stats" and method == "GET":
+            return self._json(start_response, 200, self.stats())
+        if path == "/__reset" and method == "POST":
+            self.reset()
+            return self._json(start_response, 200, {"success": True})
+
+        if not path.startswith(API_PREFIX + "/"):
+            return self._error(start_response, 404, 34, "Not found.")
+        path = path[len(API_PREFIX) :]
+
+        for endpoint, route_method, pattern in ROUTES:
+            match = pattern.match(path)
+            if match and method == route_method:
+                return self._dispatch(
+                    endpoint, match.groupdict(), environ, start_response
+                )
+        return self._error(
+            start_response, 404, 34, "The resource you requested could not be found."
+        )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            calls = dict(self._calls)
+        return {"calls": calls, "total": sum(calls.values())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._accounts.clear()
+
+    def _dispatch(
+        self,
+        endpoint: str,
+        args: dict[str, str],
+        environ: Environ,
+        start_response: StartResponse,
+    ) -> Iterable[bytes]:
+        with self._lock:
+            self._calls[endpoint] = self._calls.get(endpoint, 0) + 1
+            profile = self.config.profile(endpoint)
+            delay = profile.delay(self._rng)
+            roll = self._rng.random()
+
+        if delay:
+            time.sleep(delay)
+        if roll < profile.rate_limit_rate:
+            return self._error(
+                start_response,
+                429,
+                25,
+                "Your request count (#) is over the allowed limit of (40).",
+                [("Retry-After", "1")],
+            )
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            return self._error(
+                start_response,
+                500,
+                11,
+                "Internal error: Something went wrong, contact TMDb.",
+            )
+
+        query = {k: v[-1] for k, v in parse_qs(environ.get("QUERY_STRING", "")).items()}
+        handler = getattr(self, f"_{endpoint}")
+        status, body = handler(query=query, environ=environ, **args)
+        return self._json(start_response, status, body)
+
+    # Endpoints
+
+    def _discover(self, query: dict[str, str], **_: Any) -> tuple[int, Any]:
+        page = _page(query)
+        total = self.config.catalog_size
+        ids = range((page - 1) * self.config.page_size + 1, total + 1)
+        return 200, self._listing(page, ids[: self.config.page_size], total)
+
+    def _search(self, query: dict[str, str], **_: Any) -> tuple[int, Any]:
+        text = query.get("query", "").strip().lower()
+        if not text:
+            return 200, self._listing(1, [], 0)
+        page = _page(query)
+        total = min(self.config.catalog_size, 25 + zlib.crc32(text.encode()) % 176)
+        start = zlib.crc32(text.encode()[::-1]) % self.config.catalog_size
+        offset = (page - 1) * self.config.page_size
+        ids = [
+            (start + i) % self.config.catalog_size + 1
+            for i in range(offset, min(offset + self.config.page_size, total))
+        ]
+        return 200, self._listing(page, ids, total)
+
+    def _details(
+        self, movie_id: str, query: dict[str, str], **_: Any
+    ) -> tuple[int, Any]:
+        if not self._exists(movie_id):
+            return self._not_found()
+        movie_id_int = int(movie_id)
+        rng = self._movie_rng(movie_id_int, "details")
+        details = self.movie(movie_id_int)
+        genre_ids = details.pop("genre_ids")
+        details.update(
+            {
+                "runtime": rng.randint(80, 180),
+                "budget": rng.randint(1, 200) * 1_000_000,
+                "genres": [
+                    {"id": genre, "name": f"Genre {genre}"} for genre in genre_ids
+                ],
+                "status": "Released",
+                "tagline": f"Tagline {movie_id}",
+                "imdb_id": f"tt{movie_id_int:07d}",
+            }
+        )
+        if "videos" in query.get("append_to_response", "").split(","):
+            details["videos"] = self._videos(movie_id)[1]
+        return 200, details
+
+    def _videos(self, movie_id: str, **_: Any) -> tuple[int, Any]:
+        if not self._exists(movie_id):
+            return self._not_found()
+        rng = self._movie_rng(int(movie_id), "videos")
+        return 200, {
+            "id": int(movie_id),
+            "results": [
+                {
+                    "name": f"Trailer {n}",
+                    "key": f"{movie_id}v{n}",
+                    "site": "YouTube" if n else "Vimeo",
+                    "type": rng.choice(("Trailer", "Teaser", "Featurette")),
+                    "official": True,
+                }
+                for n in range(rng.randint(1, 4))
+            ],
+        }
+
+    def _providers(self, movie_id: str, **_: Any) -> tuple[int, Any]:
+        if not self._exists(movie_id):
+            return self._not_found()
+        rng = self._movie_rng(int(movie_id), "providers")
+        results = {}
+        for region in REGIONS:
+            if rng.random() < 0.3:
+                continue
+            results[region] = {
+                "link": f"https://www.themoviedb.org/movie/{movie_id}/watch?locale={region}",
+                "flatrate": [
+                    {
+                        "logo_path": f"/provider{provider}.jpg",
+                        "provider_id": provider,
+                        "provider_name": f"Provider {provider}",
+                        "display_priority": priority,
+                    }
+                    for priority, provider in enumerate(
+                        rng.sample(range(1, 40), rng.randint(1, 4))
+                    )
+                ],
+            }
+        return 200, {"id": int(movie_id), "results": results}
+
+    def _credits(self, movie_id: str, **_: Any) -> tuple[int, Any]:
+        if not self._exists(movie_id):
+            return self._not_found()
+        rng = self._movie_rng(int(movie_id), "credits")
+        cast = [
+            {
+                "id": int(movie_id) * 100 + n,
+                "name": f"Person {movie_id}-{n}",
+                "character": f"Character {n}",
+                "known_for_department": rng.choice(DEPARTMENTS),
+                "profile_path": f"/person{movie_id}-{n}.jpg" if n % 3 else None,
+                "order": n,
+            }
+            for n in range(rng.randint(5, 25))
+        ]
+        return 200, {"id": int(movie_id), "cast": cast, "crew": []}
+
+    def _changes(self, query: dict[str, str], **_: Any) -> tuple[int, Any]:
+        page = _page(query)
+        offset = (page - 1) * CHANGES_PAGE_SIZE
+        ids = self.changed_ids[offset : offset + CHANGES_PAGE_SIZE]
+        return 200, {
+            "page": page,
+            "results": [{"id": movie_id, "adult": False} for movie_id in ids],
+            "total_pages": max(math.ceil(len(self.changed_ids) / CHANGES_PAGE_SIZE), 1),
+            "total_results": len(self.changed_ids),
+        }
+
+    def _favorites(
+        self, account_id: str, query: dict[str, str], **_: Any
+    ) -> tuple[int, Any]:
+        page = _page(query)
+        with self._lock:
+            ids = list(self._account_favorites(int(account_id)))
+        if query.get("sort_by", "").endswith(".desc"):
+            ids.reverse()
+        offset = (page - 1) * self.config.page_size
+        return 200, self._listing(
+            page, ids[offset : offset + self.config.page_size], len(ids)
+        )
+
+    def _favorite_toggle(
+        self, account_id: str, environ: Environ, **_: Any
+    ) -> tuple[int, Any]:
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            body = json.loads(environ["wsgi.input"].read(length) or b"{}")
+            movie_id = int(body["media_id"])
+        except (KeyError, TypeError, ValueError):
+            return 400, {
+                "success": False,
+                "status_code": 5,
+                "status_message": "Invalid parameters.",
+            }
+
+        favorite = bool(body.get("favorite", True))
+        with self._lock:
+            favorites = self._account_favorites(int(account_id))
+            created = favorite and movie_id not in favorites
+            if favorite:
+                favorites[movie_id] = None
+            else:
+                favorites.pop(movie_id, None)
+
+        if created:
+            return 201, {
+                "success": True,
+                "status_code": 1,
+                "status_message": "Success.",
+            }
+        if favorite:
+            return 200, {
+                "success": True,
+                "status_code": 12,
+                "status_message": "The item/record was updated successfully.",
+            }
+        return 200, {
+            "success": True,
+            "status_code": 13,
+            "status_message": "The item/record was deleted successfully.",
+        }
+
+    # Data
+
+    def movie(self, movie_id: int) -> dict[str, Any]:
+        rng = self._movie_rng(movie_id, "movie")
+        released = date(1950, 1, 1) + timedelta(days=rng.randint(0, 27_000))
+        return {
+            "id": movie_id,
+            "title": f"Movie {movie_id}",
+            "original_title": f"Movie {movie_id}",
+            "original_language": rng.choice(("en", "pt", "es", "fr", "ja")),
+            "overview": f"Overview of movie {movie_id}.",
+            "poster_path": f"/poster{movie_id}.jpg",
+            "backdrop_path": f"/backdrop{movie_id}.jpg" if movie_id % 7 else None,
+            "release_date": released.isoformat(),
+            "genre_ids": sorted(rng.sample(GENRES, rng.randint(1, 3))),
+            "adult": False,
+            "video": False,
+            # Popularity falls with the id so discover's default order is by id.
+            "popularity": round(10_000 / movie_id, 3),
+            "vote_average": round(rng.uniform(1, 10), 1),
+            "vote_count": rng.randint(0, 30_000),
+        }
+
+    def _listing(self, page: int, ids: Iterable[int], total: int) -> dict[str, Any]:
+        return {
+            "page": page,
+            "results": [self.movie(movie_id) for movie_id in ids],
+            "total_pages": min(math.ceil(total / self.config.page_size), MAX_PAGES),
+            "total_results": total,
+        }
+
+    def _account_favorites(self, account_id: int) -> dict[int, None]:
+        favorites = self._accounts.get(account_id)
+        if favorites is None:
+            rng = random.Random(self.config.seed * 1_000_003 + account_id)
+            count = min(self.config.favorites_per_account, self.config.catalog_size)
+            favorites = self._accounts[account_id] = dict.fromkeys(
+                rng.sample(range(1, self.config.catalog_size + 1), count)
+            )
+        return favorites
+
+    def _movie_rng(self, movie_id: int, salt: str) -> random.Random:
+        return random.Random(f"{self.config.seed}:{salt}:{movie_id}")
+
+    def _exists(self, movie_id: str) -> bool:
+        return 1 <= int(movie_id) <= self.config.catalog_size
+
+    def _not_found(self) -> tuple[int, Any]:
+        return 404, {
+            "success": False,
+            "status_code": 34,
+            "status_message": "The resource you requested could not be found.",
+        }
+
+    def _json(
+        self,
+        start_response: StartResponse,
+        status: int,
+        body: Any,
+        headers: Optional[list[tuple[str, str]]] = None,
+    ) -> list[bytes]:
+        payload = json.dumps(body).encode()
+        start_response(
+            f"{status} {_REASONS.get(status, 'OK')}",
+            [
+                ("Content-Type", "application/json;charset=utf-8"),
+                ("Content-Length", str(len(payload))),
+                *(headers or []),
+            ],
+        )
+        return [payload]
+
+    def _error(
+        self,
+        start_response: StartResponse,
+        status: int,
+        code: int,
+        message: str,
+        headers: Optional[list[tuple[str, str]]] = None,
+    ) -> list[bytes]:
+        body = {"success": False, "status_code": code, "status_message": message}
+        return self._json(start_response, status, body, headers)
+
+
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+def _page(query: dict[str, str]) -> int:
+    try:
+        return max(int(query.get("page", 1)), 1)
+    except ValueError:
+        return 1
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class FakeTMDbServer:
+    def __init__(
+        self,
+        config: Optional[FakeTMDbConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.app = FakeTMDbApp(config)
+        self._httpd = make_server(
+            host,
+            port,
+            self.app,
+            server_class=_ThreadingWSGIServer,
+            handler_class=_QuietHandler,
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def start(self) -> "FakeTMDbServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-tmdb",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeTMDbServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
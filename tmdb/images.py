@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import requests
+from django.conf import settings
+
+from core.constants import (
+    IMAGE_CACHE_MAX_BYTES,
+    IMAGE_PROXY_URL,
+    TMDB_IMAGE_BASE,
+    TMDB_REQUEST_TIMEOUT,
+    ImageSize,
+)
+from tmdb.upstream import tracked
+
+# SVG is deliberately absent: it can carry script, and these responses are
+# served unauthenticated from our origin with immutable caching.
+IMAGE_PATH = re.compile(r"^/[A-Za-z0-9_-]+\.(jpg|jpeg|png|webp)$")
+CONTENT_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "webp": "image/webp",
+}
+# Eviction scans the blob directory, so it runs once per this many stores.
+EVICT_EVERY = 32
+
+
+def image_url(size: str, path: Optional[str]) -> Optional[str]:
+    # The one place TMDb image paths become client URLs: through our proxy
+    # when IMAGE_PROXY_URL is set, straight to TMDb otherwise.
+    if not path:
+        return None
+    if path.startswith(("http://", "https://")):
+        return path
+    if IMAGE_PROXY_URL:
+        return f"{IMAGE_PROXY_URL.rstrip('/')}/{size}{path}"
+    return f"{TMDB_IMAGE_BASE}{size}{path}"
+
+
+class ImageNotFound(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class CachedImage:
+    path: Path
+    digest: str
+    content_type: str
+
+
+class ImageCache:
+    # Blobs are stored under their sha256 (identical images share one file)
+    # and `index/` maps sha1(size + path) to a blob digest. File mtimes double
+    # as the LRU clock: hits touch the blob, eviction drops the oldest.
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, threading.Lock] = {}
+        self._stores = 0
+
+    def get(self, size: str, path: str) -> CachedImage:
+        if size not in ImageSize.__members__.values() or not IMAGE_PATH.match(path):
+            raise ImageNotFound(f"{size}{path}")
+
+        key = hashlib.sha1(f"{size}{path}".encode()).hexdigest()
+        cached = self._lookup(key, path)
+        if cached is not None:
+            return cached
+
+        # One fetch per image per process; concurrent requests wait for it.
+        with self._lock:
+            fetch_lock = self._in_flight.setdefault(key, threading.Lock())
+        with fetch_lock:
+            try:
+                cached = self._lookup(key, path)
+                if cached is None:
+                    cached = self._fetch(key, size, path)
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+        return cached
+
+    def open(self, size: str, path: str) -> tuple[CachedImage, BinaryIO]:
+        # Another worker can evict the blob between get() and opening it; that
+        # costs one re-fetch rather than a failed response.
+        image = self.get(size, path)
+        try:
+            return image, image.path.open("rb")
+        except FileNotFoundError:
+            image = self.get(size, path)
+            return image, image.path.open("rb")
+
+    def _lookup(self, key: str, path: str) -> Optional[CachedImage]:
+        try:
+            digest = (self.root / "index" / key).read_text()
+            blob = self._blob_path(digest)
+            os.utime(blob)
+        except OSError:
+            return None
+        return CachedImage(blob, digest, _content_type(path))
+
+    def _fetch(self, key: str, size: str, path: str) -> CachedImage:
+        resp = tracked(
+            requests.get,
+            f"{TMDB_IMAGE_BASE}{size}{path}",
+            timeout=TMDB_REQUEST_TIMEOUT,
+        )
+        if resp.status_code == 404:
+            raise ImageNotFound(f"{size}{path}")
+        resp.raise_for_status()
+
+        body = resp.content
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(digest)
+        if not blob.exists():
+            _atomic_write(blob, body)
+        _atomic_write(self.root / "index" / key, digest.encode())
+
+        self._stores += 1
+        if self._stores % EVICT_EVERY == 0:
+            self.evict()
+        return CachedImage(blob, digest, _content_type(path))
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / digest
+
+    def evict(self) -> int:
+        # Drops least recently served blobs until the cache is under 90% of
+        # its cap, then the index entries that pointed at them.
+        blobs = []
+        total = 0
+        for blob in (self.root / "blobs").glob("*/*"):
+            try:
+                stat = blob.stat()
+            except OSError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, blob))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        target = self.max_bytes * 0.9
+        for _, size, blob in sorted(blobs, key=lambda b: b[0]):
+            if total <= target:
+                break
+            try:
+                blob.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            self._prune_index()
+        return removed
+
+    def _prune_index(self) -> None:
+        for entry in (self.root / "index").glob("*"):
+            try:
+                if not self._blob_path(entry.read_text()).exists():
+                    entry.unlink()
+            except OSError:
+                continue
+
+
+def _content_type(path: str) -> str:
+    return CONTENT_TYPES[path.rsplit(".", 1)[-1].lower()]
+
+
+def _atomic_write(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+_cache: Optional[ImageCache] = None
+_cache_lock = threading.Lock()
+
+
+def image_cache() -> ImageCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ImageCache(Path(settings.IMAGE_CACHE_DIR), IMAGE_CACHE_MAX_BYTES)
+        return _cache
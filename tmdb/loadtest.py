@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Any, Callable, Optional
+
+import requests
+
+# Replays a weighted traffic mix against a running instance at a fixed arrival
+# rate. Latency is measured from each request's scheduled start, so time spent
+# queued behind a saturated worker pool counts against the build under test.
+
+Request = tuple[str, dict[str, Any]]
+
+DEFAULT_MIX = {"discover": 60, "details": 25, "search": 10, "shared_list": 5}
+DEFAULT_QUERIES = ("matrix", "star", "love", "night", "war", "king", "dark", "home")
+
+_METRIC_LINE = re.compile(r"^(\w+)\{([^}]*)\}\s+(\S+)$")
+
+
+@dataclass
+class Scenario:
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    discover_pages: tuple[int, int] = (1, 5)
+    catalog_size: int = 1000
+    zipf_s: float = 1.1
+    queries: tuple[str, ...] = DEFAULT_QUERIES
+    list_names: tuple[str, ...] = ("loadtest",)
+    account_id: Optional[int] = None
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "Scenario":
+        data = json.loads(Path(path).read_text())
+        scenario = cls()
+        if "mix" in data:
+            unknown = set(data["mix"]) - set(OPERATIONS)
+            if unknown:
+                raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+            scenario.mix = {k: float(v) for k, v in data["mix"].items()}
+        if "discover_pages" in data:
+            low, high = data["discover_pages"]
+            scenario.discover_pages = (int(low), int(high))
+        for name in ("catalog_size", "account_id"):
+            if name in data:
+                setattr(scenario, name, int(data[name]))
+        if "zipf_s" in data:
+            scenario.zipf_s = float(data["zipf_s"])
+        for name in ("queries", "list_names"):
+            if name in data:
+                setattr(scenario, name, tuple(data[name]))
+        return scenario
+
+
+class Sampler:
+    def __init__(self, scenario: Scenario, seed: Optional[int] = None) -> None:
+        self.scenario = scenario
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._names = [name for name, weight in scenario.mix.items() if weight > 0]
+        self._weights = list(accumulate(scenario.mix[name] for name in self._names))
+        # Rank k (1-based) maps to movie id k; weight 1/k^s.
+        self._zipf = list(
+            accumulate(
+                1 / rank**scenario.zipf_s
+                for rank in range(1, scenario.catalog_size + 1)
+            )
+        )
+
+    def next(self) -> tuple[str, str, dict[str, Any]]:
+        with self._lock:
+            name = self.rng.choices(self._names, cum_weights=self._weights)[0]
+            path, params = OPERATIONS[name](self)
+        return name, path, params
+
+    def movie_id(self) -> int:
+        return self.rng.choices(
+            range(1, self.scenario.catalog_size + 1), cum_weights=self._zipf
+        )[0]
+
+    def with_account(self, params: dict[str, Any]) -> dict[str, Any]:
+        if self.scenario.account_id is not None:
+            params["account_id"] = self.scenario.account_id
+        return params
+
+
+def _discover(sampler: Sampler) -> Request:
+    page = sampler.rng.randint(*sampler.scenario.discover_pages)
+    return "/api/v1/discover/", sampler.with_account({"page": page})
+
+
+def _details(sampler: Sampler) -> Request:
+    return f"/api/v1/movies/{sampler.movie_id()}/", {}
+
+
+def _search(sampler: Sampler) -> Request:
+    query = sampler.rng.choice(sampler.scenario.queries)
+    return "/api/v1/movies/search/", sampler.with_account({"query": query})
+
+
+def _shared_list(sampler: Sampler) -> Request:
+    list_name = sampler.rng.choice(sampler.scenario.list_names)
+    return "/api/v1/get-shared-favorites/", {"list_name": list_name}
+
+
+OPERATIONS: dict[str, Callable[[Sampler], Request]] = {
+    "discover": _discover,
+    "details": _details,
+    "search": _search,
+    "shared_list": _shared_list,
+}
+
+
+def summarize(latencies_ms: list[float]) -> dict[str, Optional[float]]:
+    if not latencies_ms:
+        return {"p50": None, "p95": None, "p99": None, "max": None, "mean": None}
+    values = sorted(latencies_ms)
+
+    def pick(q: float) -> float:
+        return round(values[min(int(q * len(values)), len(values) - 1)], 2)
+
+    return {
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(values[-1], 2),
+        "mean": round(sum(values) / len(values), 2),
+    }
+
+
+def scrape_counters(session: requests.Session, base_url: str) -> Optional[dict]:
+    # Sums of tmdb_cache_requests_total by result and tmdb_requests_total, or
+    # None when /metrics is not reachable.
+    try:
+        resp = session.get(f"{base_url}/metrics", timeout=5)
+    except requests.RequestException:
+        return None
+    if resp.status_code != 200:
+        return None
+
+    counters = {"hit": 0.0, "miss": 0.0, "upstream": 0.0}
+    for line in resp.text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        if name == "tmdb_cache_requests_total":
+            result = "hit" if 'result="hit"' in labels else "miss"
+            counters[result] += float(value)
+        elif name == "tmdb_requests_total":
+            counters["upstream"] += float(value)
+    return counters
+
+
+class LoadTest:
+    def __init__(
+        self,
+        base_url: str,
+        scenario: Scenario,
+        rps: float,
+        duration: float,
+        workers: int = 32,
+        timeout: float = 10.0,
+        headers: Optional[dict[str, str]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.sampler = Sampler(scenario, seed)
+        self.rps = rps
+        self.duration = duration
+        self.workers = workers
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._latencies: dict[str, list[float]] = {}
+        self._errors: dict[str, dict[str, int]] = {}
+
+    def run(self) -> dict[str, Any]:
+        metrics_session = requests.Session()
+        before = scrape_counters(metrics_session, self.base_url)
+
+        interval = 1 / self.rps
+        total = int(self.rps * self.duration)
+        futures = []
+        started = monotonic()
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="loadtest") as pool:
+            for n in range(total):
+                scheduled = started + n * interval
+                delay = scheduled - monotonic()
+                if delay > 0:
+                    sleep(delay)
+                name, path, params = self.sampler.next()
+                futures.append(pool.submit(self._send, name, path, params, scheduled))
+            wait(futures)
+        elapsed = monotonic() - started
+
+        after = scrape_counters(metrics_session, self.base_url)
+        return self._report(total, elapsed, before, after)
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+        return session
+
+    def _send(
+        self, name: str, path: str, params: dict[str, Any], scheduled: float
+    ) -> None:
+        error: Optional[str] = None
+        try:
+            resp = self._session().get(
+                f"{self.base_url}{path}", params=params, timeout=self.timeout
+            )
+            if resp.status_code >= 400:
+                error = str(resp.status_code)
+        except requests.RequestException as exc:
+            error = type(exc).__name__
+        latency_ms = (monotonic() - scheduled) * 1000
+
+        with self._lock:
+            self._latencies.setdefault(name, []).append(latency_ms)
+            if error is not None:
+                errors = self._errors.setdefault(name, {})
+                errors[error] = errors.get(error, 0) + 1
+
+    def _report(
+        self,
+        total: int,
+        elapsed: float,
+        before: Optional[dict],
+        after: Optional[dict],
+    ) -> dict[str, Any]:
+        all_latencies = [ms for values in self._latencies.values() for ms in values]
+        errors: dict[str, int] = {}
+        for by_kind in self._errors.values():
+            for kind, count in by_kind.items():
+                errors[kind] = errors.get(kind, 0) + count
+
+        report: dict[str, Any] = {
+            "target_rps": self.rps,
+            "achieved_rps": round(total / elapsed, 2) if elapsed else None,
+            "duration_s": round(elapsed, 2),
+            "requests": total,
+            "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+            "latency_ms": summarize(all_latencies),
+            "errors": errors,
+            "operations": {
+                name: {
+                    "count": len(values),
+                    "latency_ms": summarize(values),
+                    "errors": self._errors.get(name, {}),
+                }
+                for name, values in sorted(self._latencies.items())
+            },
+            "cache": None,
+        }
+        if before is not None and after is not None:
+            hits = after["hit"] - before["hit"]
+            misses = after["miss"] - before["miss"]
+            lookups = hits + misses
+            report["cache"] = {
+                "tmdb_hits": hits,
+                "tmdb_misses": misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else None,
+                "upstream_calls_per_request": (
+                    round((after["upstream"] - before["upstream"]) / total, 3)
+                    if total
+                    else None
+                ),
+            }
+        return report
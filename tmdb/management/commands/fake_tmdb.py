@@ -0,0 +1,65 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from tmdb.fake_server import EndpointProfile, FakeTMDbConfig, FakeTMDbServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a local TMDb stand-in with generated data and configurable latency, "
+        "errors and 429s. Point TMDB_API_BASE at the printed URL. Per-endpoint "
+        "profiles come from --config; the flags set the default profile."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--config",
+            default=None,
+            help="JSON file with page_size, catalog_size, default and endpoints.",
+        )
+        parser.add_argument("--latency-ms", type=float, default=None)
+        parser.add_argument("--latency-p99-ms", type=float, default=None)
+        parser.add_argument("--error-rate", type=float, default=None)
+        parser.add_argument("--rate-limit-rate", type=float, default=None)
+        parser.add_argument("--page-size", type=int, default=None)
+        parser.add_argument("--catalog-size", type=int, default=None)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            config = (
+                FakeTMDbConfig.from_file(options["config"])
+                if options["config"]
+                else FakeTMDbConfig()
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Invalid config: {exc}")
+
+        overrides = {
+            name: options[name]
+            for name in (
+                "latency_ms",
+                "latency_p99_ms",
+                "error_rate",
+                "rate_limit_rate",
+            )
+            if options[name] is not None
+        }
+        if overrides:
+            config.default = EndpointProfile(**{**vars(config.default), **overrides})
+        for name in ("page_size", "catalog_size", "seed"):
+            if options[name] is not None:
+                setattr(config, name, options[name])
+
+        server = FakeTMDbServer(config, host=options["host"], port=options["port"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Fake TMDb listening on {server.base_url}")
+        )
+        self.stdout.write(f"export TMDB_API_BASE={server.base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core.constants import Headers
+from tmdb.loadtest import DEFAULT_MIX, LoadTest, Scenario
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays a weighted traffic mix against a running instance at a target "
+        f"RPS and prints a JSON report. Default mix: {DEFAULT_MIX}, details ids "
+        "Zipf-distributed. Cache hit ratios come from the target's /metrics."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("base_url", help="e.g. http://127.0.0.1:8000")
+        parser.add_argument("--rps", type=float, default=50.0)
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds.")
+        parser.add_argument("--workers", type=int, default=32)
+        parser.add_argument("--timeout", type=float, default=10.0)
+        parser.add_argument(
+            "--scenario",
+            default=None,
+            help="JSON file overriding mix, discover_pages, catalog_size, zipf_s, "
+            "queries, list_names and account_id.",
+        )
+        parser.add_argument(
+            "--token",
+            default=None,
+            help="Authorization header value (defaults to TMDB_API_KEY).",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--output", default=None, help="Write the report here.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["rps"] <= 0 or options["duration"] <= 0:
+            raise CommandError("--rps and --duration must be positive.")
+        try:
+            scenario = (
+                Scenario.from_file(options["scenario"])
+                if options["scenario"]
+                else Scenario()
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Invalid scenario: {exc}")
+
+        token = options["token"] or settings.TMDB_BEARER
+        report = LoadTest(
+            base_url=options["base_url"],
+            scenario=scenario,
+            rps=options["rps"],
+            duration=options["duration"],
+            workers=options["workers"],
+            timeout=options["timeout"],
+            headers={Headers.AUTHORIZATION: token} if token else {},
+            seed=options["seed"],
+        ).run()
+
+        body = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(body + "\n")
+        self.stdout.write(body)
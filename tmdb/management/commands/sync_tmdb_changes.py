@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Any
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from tmdb.changes import sync_changes
+from tmdb.client import TMDBClient
+
+
+class Command(BaseCommand):
+    help = (
+        "Invalidates cached movie details, videos, providers and credits for "
+        "movies listed by TMDb's /movie/changes since the previous run. Meant "
+        "to run periodically (cron, scheduler) so TMDB_MOVIE_CACHE_TTL can be "
+        "long."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--since",
+            default=None,
+            help="ISO date/datetime to start from (defaults to the last run).",
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Refetch changed movies that were served recently.",
+        )
+        parser.add_argument(
+            "--token",
+            default=None,
+            help="TMDb bearer token (defaults to TMDB_API_KEY).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        token = options["token"] or settings.TMDB_BEARER
+        if not token:
+            raise CommandError("A TMDb bearer token is required.")
+
+        since = None
+        if options["since"]:
+            try:
+                since = datetime.fromisoformat(options["since"])
+            except ValueError:
+                raise CommandError("--since must be an ISO date or datetime.")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        try:
+            result = sync_changes(
+                TMDBClient(bearer_token=token),
+                since=since,
+                refresh=options["refresh"],
+            )
+        except requests.RequestException as exc:
+            raise CommandError(f"TMDb /movie/changes failed: {exc}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.changed} movies changed between "
+                f"{result.start:%Y-%m-%d %H:%M} and {result.end:%Y-%m-%d %H:%M}; "
+                f"{result.refreshed} refreshed."
+            )
+        )
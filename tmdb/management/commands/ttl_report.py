@@ -0,0 +1,72 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from tmdb.ttl import expiry_spread, ttl_policy
+
+# _cached_request's fallback TTL for paths no rule matches.
+FALLBACK_TTL = 600
+SAMPLE_PATHS = (
+    "/discover/movie",
+    "/movie/550",
+    "/movie/550/credits",
+    "/movie/550/watch/providers",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the TTL policy (TMDB_TTL_POLICY) applied to sample TMDb paths: "
+        "the matching rule, base and popular TTLs, the jittered range, and how "
+        "entries written at the same moment spread their expiry."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="TMDb paths to evaluate (defaults to a few common ones).",
+        )
+        parser.add_argument(
+            "--keys",
+            type=int,
+            default=1000,
+            help="Entries simulated per path for the expiry distribution.",
+        )
+        parser.add_argument(
+            "--bucket",
+            type=int,
+            default=60,
+            help="Expiry histogram bucket width in seconds.",
+        )
+        parser.add_argument(
+            "--histogram",
+            action="store_true",
+            help="Print the per-bucket expiry counts for each path.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["keys"] < 1 or options["bucket"] < 1:
+            raise CommandError("--keys and --bucket must be positive.")
+
+        policy = ttl_policy
+        self.stdout.write(
+            f"jitter +/-{policy.jitter:.0%}; "
+            + (
+                f"x{policy.popular_factor:g} after {policy.popular_hits} reads"
+                if policy.popular_hits
+                else "popularity extension off"
+            )
+        )
+        for path in options["paths"] or SAMPLE_PATHS:
+            rule, ttl = policy.rule(path, FALLBACK_TTL)
+            popular = int(ttl * policy.popular_factor) if policy.popular_hits else ttl
+            spread = expiry_spread(policy, ttl, options["keys"], options["bucket"])
+            self.stdout.write(
+                f"{path:<32} {rule:<34} base {ttl:>7}s  popular {popular:>7}s  "
+                f"range {spread['min']}-{spread['max']}s  "
+                f"peak {spread['peak_share']:.1%} per {options['bucket']}s"
+            )
+            if options["histogram"]:
+                for start, count in spread["buckets"].items():
+                    self.stdout.write(f"    {start:>8}s  {count}")
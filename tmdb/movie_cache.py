@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable
+
+from django.core.cache import cache
+
+from core.constants import TMDB_MOVIE_CACHE_TTL, TMDBPaths
+from tmdb.ttl import ttl_policy
+
+# Every cached sub-resource of a movie lives under `tmdb:movie:{id}:{version}`.
+# Invalidating a movie swaps its version, orphaning the old entries (they age
+# out on their own TTL) without scanning keys. Versions are timestamps so a
+# version key lost to eviction can never resurrect an older generation.
+# Version keys expire after the longest-lived sub-resource could, so one that
+# ages out has nothing left to orphan and the next read simply starts a fresh
+# namespace.
+
+VERSION_TTL = ttl_policy.longest(
+    [
+        path.format(tmdb_id=0)
+        for path in (
+            TMDBPaths.MOVIE_DETAILS,
+            TMDBPaths.MOVIE_VIDEOS,
+            TMDBPaths.MOVIE_PROVIDERS,
+            TMDBPaths.MOVIE_CREDITS,
+        )
+    ],
+    TMDB_MOVIE_CACHE_TTL,
+)
+
+
+def movie_version_key(tmdb_id: int | str) -> str:
+    return f"tmdb:movie:{tmdb_id}:version"
+
+
+def movie_namespace(tmdb_id: int | str) -> str:
+    key = movie_version_key(tmdb_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=VERSION_TTL)
+        version = cache.get(key, time.time_ns())
+    return f"tmdb:movie:{tmdb_id}:{version}"
+
+
+def invalidate_movies(tmdb_ids: Iterable[int | str]) -> list[int | str]:
+    # Only movies with a version key have cached entries to orphan; the change
+    # feed names thousands of ids we never served, and writing version keys
+    # for those would fill the cache. Returns the ids that were invalidated.
+    keys = {movie_version_key(tmdb_id): tmdb_id for tmdb_id in tmdb_ids}
+    current = cache.get_many(list(keys))
+    if current:
+        version = time.time_ns()
+        cache.set_many({key: version for key in current}, timeout=VERSION_TTL)
+    return [keys[key] for key in keys if key in current]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.renderers import JSONRenderer
+
+from tmdb.serializers import MovieDiscoverResultSerializer
+
+_renderer = JSONRenderer()
+
+_FLAGS = {True: b"true}", False: b"false}"}
+
+# The splice appends `favorite` after every other field, which only matches
+# the serializer's own output while `favorite` is its last field.
+if list(MovieDiscoverResultSerializer._declared_fields)[-1] != "favorite":
+    raise ImproperlyConfigured(
+        "MovieDiscoverResultSerializer.favorite must be the last field for "
+        "TMDB_PASSTHROUGH encoding"
+    )
+
+
+@dataclass(frozen=True)
+class EncodedListing:
+    # A discover page already validated and rendered to JSON. Each item
+    # stops right after `"favorite":`, so a response is the items joined with
+    # the per-request flag spliced in, with no decode or re-encode on a hit.
+    head: bytes
+    items: tuple[bytes, ...]
+    ids: tuple[int, ...]
+    tail: bytes
+    page: int = 1
+    total_pages: int = 0
+
+    def render(self, flags: Iterable[bool]) -> bytes:
+        body = b",".join(item + _FLAGS[flag] for item, flag in zip(self.items, flags))
+        return b"".join((self.head, body, self.tail))
+
+
+def encode_listing(payload: dict[str, Any]) -> EncodedListing:
+    items: list[bytes] = []
+    ids: list[int] = []
+    for raw in payload.get("results") or []:
+        serializer = MovieDiscoverResultSerializer(data={**raw, "favorite": False})
+        if not serializer.is_valid():
+            continue
+        data = dict(serializer.data)
+        del data["favorite"]
+        encoded = _renderer.render(data)
+        # `favorite` is the serializer's last field; reopen the object for it.
+        items.append(encoded[:-1] + b',"favorite":')
+        ids.append(data["id"])
+
+    page = int(payload.get("page") or 1)
+    total_pages = int(payload.get("total_pages") or 0)
+    head = _renderer.render({"page": page})
+    totals = _renderer.render(
+        {
+            "total_pages": total_pages,
+            "total_results": int(payload.get("total_results") or 0),
+        }
+    )
+    return EncodedListing(
+        head=head[:-1] + b',"results":[',
+        items=tuple(items),
+        ids=tuple(ids),
+        tail=b"]," + totals[1:],
+        page=page,
+        total_pages=total_pages,
+    )
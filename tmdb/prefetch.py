@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import Any, Callable, Iterable, Optional
+
+from django.core.cache import cache
+
+from core import metrics
+from core.constants import (
+    TMDB_PREFETCH_BURST,
+    TMDB_PREFETCH_DETAILS_BURST,
+    TMDB_PREFETCH_DETAILS_RATE,
+    TMDB_PREFETCH_MAX_PENDING,
+    TMDB_PREFETCH_RATE,
+    TMDB_PREFETCH_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+
+class Prefetcher:
+    # Speculative cache warming off the request path. It runs on its own small
+    # pool so it never competes with request-driven fetches. Work is dropped,
+    # never queued indefinitely: when the key is already cached or in flight,
+    # when `max_pending` jobs are outstanding, or when the outbound budget is
+    # spent.
+
+    def __init__(
+        self, kind: str, workers: int, max_pending: int, budget: TokenBucket
+    ) -> None:
+        self.kind = kind
+        self.max_pending = max_pending
+        self.budget = budget
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"tmdb-prefetch-{kind}"
+        )
+        self._in_flight: dict[str, Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, cache_key: str, fn: Callable[..., Any], *args: Any, cost: float = 1.0
+    ) -> Optional[Future[Any]]:
+        # `cost` is the number of TMDb calls `fn` makes on a cold cache.
+        with self._lock:
+            if cache_key in self._in_flight:
+                return self._skip("in_flight")
+            if len(self._in_flight) >= self.max_pending:
+                return self._skip("queue_full")
+        if cache.has_key(cache_key):
+            return self._skip("cached")
+        if not self.budget.try_acquire(cost):
+            return self._skip("throttled")
+
+        with self._lock:
+            if cache_key in self._in_flight:
+                return self._skip("in_flight")
+            future = self._executor.submit(self._run, cache_key, fn, *args)
+            self._in_flight[cache_key] = future
+        future.add_done_callback(lambda _: self._done(cache_key))
+        self._count("scheduled")
+        return future
+
+    def cancel(self, cache_key: str) -> bool:
+        # Only jobs still queued can be cancelled; a running fill completes.
+        with self._lock:
+            future = self._in_flight.get(cache_key)
+        if future is None or not future.cancel():
+            return False
+        self._count("cancelled")
+        return True
+
+    def join(self, cache_key: str, timeout: float) -> None:
+        # For a request that needs `cache_key` now: a queued job is cancelled
+        # (the request fetches for itself), a running one is waited on for up
+        # to `timeout` so its upstream calls are not made twice.
+        with self._lock:
+            future = self._in_flight.get(cache_key)
+        if future is None:
+            return
+        if future.cancel():
+            self._count("cancelled")
+            return
+        try:
+            future.result(timeout=timeout)
+        except TimeoutError:
+            self._count("join_timeout")
+        else:
+            self._count("joined")
+
+    def _run(self, cache_key: str, fn: Callable[..., Any], *args: Any) -> None:
+        # A request may have filled the key while this job sat in the queue.
+        if cache.has_key(cache_key):
+            self._count("cached")
+            return
+        try:
+            fn(*args)
+        except Exception:
+            self._count("error")
+            logger.debug("Prefetch failed", exc_info=True)
+        else:
+            self._count("completed")
+
+    def _done(self, cache_key: str) -> None:
+        with self._lock:
+            self._in_flight.pop(cache_key, None)
+
+    def _count(self, result: str) -> None:
+        metrics.inc("tmdb_prefetch_total", {"kind": self.kind, "result": result})
+
+    def _skip(self, reason: str) -> None:
+        self._count(reason)
+        return None
+
+
+def top_k_ids(results: Iterable[dict[str, Any]], k: int, order: str) -> list[int]:
+    ranked = list(results)
+    if order == "popularity":
+        ranked.sort(key=lambda r: r.get("popularity") or 0, reverse=True)
+    return [r["id"] for r in ranked if r.get("id")][:k]
+
+
+def prefetched_marker_key(tmdb_id: int) -> str:
+    return f"tmdb:prefetched:{tmdb_id}"
+
+
+def record_prefetch_use(tmdb_id: int) -> None:
+    # used / completed on tmdb_prefetch_total{kind="details"} is the hit rate.
+    if cache.delete(prefetched_marker_key(tmdb_id)):
+        metrics.inc("tmdb_prefetch_used_total", {"kind": "details"})
+
+
+next_page_prefetcher = Prefetcher(
+    kind="discover_page",
+    workers=TMDB_PREFETCH_WORKERS,
+    max_pending=TMDB_PREFETCH_MAX_PENDING,
+    budget=TokenBucket(TMDB_PREFETCH_RATE, TMDB_PREFETCH_BURST),
+)
+# A single worker keeps details warming from crowding out anything else.
+details_prefetcher = Prefetcher(
+    kind="details",
+    workers=1,
+    max_pending=TMDB_PREFETCH_MAX_PENDING,
+    budget=TokenBucket(TMDB_PREFETCH_DETAILS_RATE, TMDB_PREFETCH_DETAILS_BURST),
+)
@@ -2,6 +2,9 @@ from typing import Any, TypedDict
 
 from rest_framework import serializers
 
+from core.constants import ImageSize
+from tmdb.images import image_url
+
 
 class DiscoverQueryParamsDict(TypedDict):
     language: str
@@ -19,6 +22,22 @@ class DiscoverQueryParamsSerializer(serializers.Serializer[DiscoverQueryParamsDi
     sort_by = serializers.CharField(default="popularity.desc")
 
 
+class MovieDetailsQueryParamsSerializer(serializers.Serializer):
+    # `language` is part of the details cache key, so only well-formed tags
+    # (ISO 639 language plus optional subtags, e.g. "pt-BR") are accepted.
+    language = serializers.RegexField(
+        r"^[a-z]{2,3}(-[A-Za-z0-9]{2,8})*$",
+        max_length=35,
+        required=False,
+        help_text="Locale for title, overview and videos (default=pt-BR)",
+    )
+    region = serializers.RegexField(
+        r"^[A-Za-z]{2}$",
+        required=False,
+        help_text="ISO 3166-1 country for watch providers (default=BR)",
+    )
+
+
 class MovieDiscoverResultSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     title = serializers.CharField()
@@ -70,10 +89,7 @@ class CreditSerializer(serializers.Serializer):
     known_for_department = serializers.CharField()
 
     def get_profile_path(self, obj: dict[str, Any]) -> str | None:
-        path = obj.get("profile_path")
-        if not path:
-            return None
-        return f"https://image.tmdb.org/t/p/w185{path}"
+        return image_url(ImageSize.W185, obj.get("profile_path"))
 
 
 class MovieDetailsSerializer(serializers.Serializer):
@@ -89,3 +105,4 @@ class MovieDetailsSerializer(serializers.Serializer):
     videos = VideoSerializer(many=True, required=False)
     providers = ProviderSerializer(required=False, allow_null=True)
     credits = CreditSerializer(many=True, required=False)
+    partial = serializers.BooleanField(required=False)
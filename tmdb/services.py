@@ -1,19 +1,29 @@
 from __future__ import annotations
 
-from typing import Any, Iterable
+from typing import AbstractSet, Any, Iterable
 
 import requests
 
 from core.constants import (
     TMDB_API_BASE,
     TMDB_DEFAULT_LANG,
+    TMDB_DISCOVER_MAX_PAGE,
     TMDB_REQUEST_TIMEOUT,
     Headers,
     QueryParams,
     SortBy,
     TMDBPaths,
 )
+from favorites.access import has_access, mark_access
+from favorites.favorite_ids import (
+    FavoriteIdSet,
+    get_cached_favorite_ids,
+    set_cached_favorite_ids,
+)
+from favorites.services import FavoritesReplicaService
 from tmdb.client import TMDBClient
+from tmdb.passthrough import EncodedListing
+from tmdb.upstream import tracked
 
 
 class TMDBService:
@@ -23,13 +33,32 @@ class TMDBService:
     def discover(self, params: dict[str, Any]) -> dict[str, Any]:
         return self.client.discover_movies(params=params)
 
-    def details(self, tmdb_id: int) -> dict[str, Any]:
-        return self.client.movie_details(tmdb_id)
+    def discover_encoded(self, params: dict[str, Any]) -> EncodedListing:
+        return self.client.discover_movies_encoded(params=params)
+
+    def prefetch_next_discover_page(
+        self, params: dict[str, Any], encoded: bool
+    ) -> None:
+        page = int(params.get(QueryParams.PAGE) or 1)
+        if page < TMDB_DISCOVER_MAX_PAGE:
+            self.client.prefetch_discover(
+                {**params, QueryParams.PAGE: page + 1}, encoded
+            )
+
+    def prefetch_details(self, tmdb_ids: Iterable[int]) -> None:
+        for tmdb_id in tmdb_ids:
+            self.client.prefetch_movie_details(tmdb_id)
+
+    def details(
+        self, tmdb_id: int, language: str | None = None, region: str | None = None
+    ) -> dict[str, Any]:
+        return self.client.movie_details(tmdb_id, language=language, region=region)
 
     def search_movies(
         self, query: str, page: int | str = 1, language: str = TMDB_DEFAULT_LANG
     ) -> dict[str, Any]:
-        resp = requests.get(
+        resp = tracked(
+            requests.get,
             f"{TMDB_API_BASE}{TMDBPaths.SEARCH_MOVIE}",
             params={
                 QueryParams.QUERY: query,
@@ -42,17 +71,30 @@ class TMDBService:
         )
         return resp.json()
 
-    def fetch_favorite_ids(self, account_id: int | str) -> set[int]:
+    def fetch_favorite_ids(self, account_id: int | str) -> FavoriteIdSet:
         bearer = self.client.session.headers.get(Headers.AUTHORIZATION)
         if not bearer:
-            return set()
+            return FavoriteIdSet()
+
+        # The cached set is shared by every bearer TMDb accepted for the account.
+        cached = get_cached_favorite_ids(account_id)
+        if cached is not None and has_access(account_id, bearer):
+            return cached
+
+        if FavoritesReplicaService.is_fresh(account_id) and has_access(
+            account_id, bearer
+        ):
+            favorite_ids = FavoritesReplicaService.favorite_ids(account_id)
+            set_cached_favorite_ids(account_id, favorite_ids)
+            return favorite_ids
 
         page = 1
-        favorite_ids: set[int] = set()
+        items: list[dict[str, Any]] = []
         endpoint = f"{TMDB_API_BASE}{TMDBPaths.ACCOUNT_FAVORITES.format(account_id=account_id)}"
 
         while True:
-            resp = requests.get(
+            resp = tracked(
+                requests.get,
                 endpoint,
                 params={
                     QueryParams.LANGUAGE: TMDB_DEFAULT_LANG,
@@ -66,25 +108,32 @@ class TMDBService:
                 timeout=TMDB_REQUEST_TIMEOUT,
             )
             if resp.status_code >= 400:
-                return set()
+                return FavoriteIdSet()
 
             payload = resp.json()
-            for item in payload.get("results", []):
-                movie_id = item.get("id")
-                if isinstance(movie_id, int):
-                    favorite_ids.add(movie_id)
+            items.extend(
+                item
+                for item in payload.get("results", [])
+                if isinstance(item.get("id"), int)
+            )
 
             total_pages = payload.get("total_pages") or 1
             if page >= total_pages:
                 break
             page += 1
 
+        mark_access(account_id, bearer)
+        FavoritesReplicaService.sync_account(account_id, items)
+        favorite_ids = FavoriteIdSet(item["id"] for item in items)
+        set_cached_favorite_ids(account_id, favorite_ids)
         return favorite_ids
 
     def annotate_favorites(
-        self, results: Iterable[dict[str, Any]], favorite_ids: set[int]
+        self, results: Iterable[dict[str, Any]], favorite_ids: AbstractSet[int]
     ) -> None:
-        for movie in results:
-            movie["favorite"] = (
-                bool(movie.get("id") in favorite_ids) if favorite_ids else False
-            )
+        movies = list(results)
+        if not isinstance(favorite_ids, FavoriteIdSet):
+            favorite_ids = FavoriteIdSet(favorite_ids)
+        flags = favorite_ids.contains_many([movie.get("id") for movie in movies])
+        for movie, flag in zip(movies, flags):
+            movie["favorite"] = flag
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from core.constants import (
+    TMDB_TTL_JITTER,
+    TMDB_TTL_POLICY,
+    TMDB_TTL_POPULAR_FACTOR,
+    TMDB_TTL_POPULAR_HITS,
+)
+
+# How long each TMDb response stays cached, by upstream path. The first rule
+# whose pattern matches wins; unmatched paths keep the caller's TTL. Jitter
+# spreads entries written together (warming, a traffic spike) so they do not
+# all expire in the same second, and entries read often during their lifetime
+# are stored for longer when refilled.
+
+DEFAULT_RULE = "default"
+
+
+@dataclass(frozen=True)
+class TTLRule:
+    pattern: re.Pattern[str]
+    ttl: int
+
+    @property
+    def name(self) -> str:
+        return self.pattern.pattern
+
+
+class TTLPolicy:
+    def __init__(
+        self,
+        rules: Iterable[tuple[str, int]],
+        jitter: float = 0.0,
+        popular_hits: int = 0,
+        popular_factor: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.rules = tuple(TTLRule(re.compile(p), int(ttl)) for p, ttl in rules)
+        self.jitter = jitter
+        self.popular_hits = popular_hits
+        self.popular_factor = popular_factor
+        self._rng = rng or random.Random()
+
+    def rule(self, path: str, default: int) -> tuple[str, int]:
+        for rule in self.rules:
+            if rule.pattern.search(path):
+                return rule.name, rule.ttl
+        return DEFAULT_RULE, default
+
+    def resolve(self, path: str, default: int, hits: int = 0) -> tuple[str, int]:
+        # (rule name, effective TTL) for an entry read `hits` times in its
+        # previous lifetime.
+        name, ttl = self.rule(path, default)
+        if self.popular_hits and hits >= self.popular_hits:
+            ttl = int(ttl * self.popular_factor)
+        return name, self.jittered(ttl)
+
+    def longest(self, paths: Iterable[str], default: int) -> int:
+        # Upper bound on how long an entry for any of `paths` can stay cached,
+        # popularity extension and jitter included.
+        ttl = max(self.rule(path, default)[1] for path in paths)
+        if self.popular_hits:
+            ttl = max(ttl, int(ttl * self.popular_factor))
+        return max(round(ttl * (1 + self.jitter)), 1)
+
+    def jittered(self, ttl: int) -> int:
+        if self.jitter:
+            ttl = round(ttl * self._rng.uniform(1 - self.jitter, 1 + self.jitter))
+        return max(ttl, 1)
+
+
+class HitCounter:
+    # Reads per cache key since it was last filled, kept for the most recently
+    # read `max_keys` keys in this process.
+
+    def __init__(self, max_keys: int = 10_000) -> None:
+        self.max_keys = max_keys
+        self._hits: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> None:
+        with self._lock:
+            self._hits[key] = self._hits.get(key, 0) + 1
+            self._hits.move_to_end(key)
+            if len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+
+    def pop(self, key: str) -> int:
+        with self._lock:
+            return self._hits.pop(key, 0)
+
+
+def expiry_spread(
+    policy: TTLPolicy, ttl: int, keys: int, bucket_seconds: int
+) -> dict[str, Any]:
+    # Where `keys` entries with base `ttl` written at the same instant expire,
+    # bucketed; without jitter they all land in one bucket.
+    ttls = sorted(policy.jittered(ttl) for _ in range(keys))
+    buckets: dict[int, int] = {}
+    for value in ttls:
+        start = value // bucket_seconds * bucket_seconds
+        buckets[start] = buckets.get(start, 0) + 1
+    return {
+        "min": ttls[0],
+        "max": ttls[-1],
+        "peak_share": max(buckets.values()) / keys,
+        "buckets": dict(sorted(buckets.items())),
+    }
+
+
+ttl_policy = TTLPolicy(
+    TMDB_TTL_POLICY,
+    jitter=TMDB_TTL_JITTER,
+    popular_hits=TMDB_TTL_POPULAR_HITS,
+    popular_factor=TMDB_TTL_POPULAR_FACTOR,
+)
+hit_counter = HitCounter()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import deque
+from time import monotonic, perf_counter
+from typing import Any, Callable
+
+import requests
+
+from core import metrics, tracing
+from core.constants import TMDB_STATS_WINDOW
+
+# Status recorded for calls that never produced a response (timeouts, DNS...).
+NO_RESPONSE = 599
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+# Image CDN URLs (https://image.tmdb.org/t/p/{size}/{file}) are labelled by
+# size only, so metrics do not get one series per poster.
+_IMAGE_URL = re.compile(r"/t/p/([^/]+)/")
+
+
+class RollingStats:
+    def __init__(self, window_seconds: float, max_samples: int = 4096) -> None:
+        self.window_seconds = window_seconds
+        self._samples: deque[tuple[float, float, bool]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            self._samples.append((monotonic(), elapsed_ms, ok))
+
+    def snapshot(self) -> dict[str, Any]:
+        cutoff = monotonic() - self.window_seconds
+        with self._lock:
+            samples = [s for s in self._samples if s[0] >= cutoff]
+
+        if not samples:
+            return {
+                "window_seconds": self.window_seconds,
+                "count": 0,
+                "p50_ms": None,
+                "p99_ms": None,
+                "error_rate": 0.0,
+            }
+
+        latencies = sorted(s[1] for s in samples)
+        errors = sum(1 for s in samples if not s[2])
+        return {
+            "window_seconds": self.window_seconds,
+            "count": len(samples),
+            "p50_ms": round(_percentile(latencies, 0.50), 1),
+            "p99_ms": round(_percentile(latencies, 0.99), 1),
+            "error_rate": round(errors / len(samples), 4),
+        }
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+tmdb_stats = RollingStats(window_seconds=TMDB_STATS_WINDOW)
+
+
+def tracked(
+    send: Callable[..., requests.Response], url: str, **kwargs: Any
+) -> requests.Response:
+    started = perf_counter()
+    status_code = NO_RESPONSE
+    try:
+        resp = send(url, **kwargs)
+        if isinstance(resp.status_code, int):
+            status_code = resp.status_code
+        return resp
+    finally:
+        elapsed = perf_counter() - started
+        ok = status_code < 500 and status_code != 429
+        tmdb_stats.record(elapsed * 1000, ok)
+        path = upstream_path(url)
+        metrics.inc("tmdb_requests_total", {"path": path, "status": str(status_code)})
+        metrics.observe("tmdb_request_duration_seconds", elapsed, {"path": path})
+        tracing.record("tmdb", elapsed, path)
+
+
+def upstream_path(url: str) -> str:
+    image = _IMAGE_URL.search(url)
+    if image:
+        return f"/images/{image.group(1)}"
+    path = url.split("/3/", 1)[-1].split("?", 1)[0]
+    return _ID_SEGMENT.sub("/{id}", "/" + path.lstrip("/"))
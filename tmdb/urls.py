@@ -1,9 +1,15 @@
 from django.urls import path
 
-from tmdb.views import DiscoverMoviesView, MovieDetailsView, SearchMoviesView
+from tmdb.views import (
+    DiscoverMoviesView,
+    ImageProxyView,
+    MovieDetailsView,
+    SearchMoviesView,
+)
 
 urlpatterns = [
     path("discover/", DiscoverMoviesView.as_view(), name="discover-movies"),
     path("movies/search/", SearchMoviesView.as_view()),
     path("movies/<int:tmdb_id>/", MovieDetailsView.as_view(), name="movie-details"),
+    path("images/<str:size>/<str:path>", ImageProxyView.as_view(), name="image"),
 ]
@@ -1,19 +1,61 @@
-from typing import Any, cast
+import logging
+from concurrent.futures import Future
+from time import monotonic
+from typing import Any, Callable, Iterable, Optional, cast
 
+import requests
+from django.http import FileResponse, HttpResponse
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.constants import TMDB_DEFAULT_LANG, Docs, Errors, Headers, QueryParams
+from core import tracing
+from core.constants import (
+    TMDB_DEFAULT_LANG,
+    TMDB_FAVORITES_DEADLINE,
+    TMDB_PASSTHROUGH,
+    TMDB_PREFETCH_DETAILS_ORDER,
+    TMDB_PREFETCH_DETAILS_TOP_K,
+    TMDB_PREFETCH_NEXT_PAGE,
+    Docs,
+    Errors,
+    Headers,
+    QueryParams,
+)
+from favorites.favorite_ids import FavoriteIdSet
+from tmdb.concurrency import run_in_background
+from tmdb.images import ImageNotFound, image_cache
+from tmdb.passthrough import EncodedListing
+from tmdb.prefetch import top_k_ids
 from tmdb.serializers import (
     DiscoverQueryParamsSerializer,
+    MovieDetailsQueryParamsSerializer,
     MovieDetailsSerializer,
     MovieDiscoverListSerializer,
 )
 from tmdb.services import TMDBService
 
+logger = logging.getLogger(__name__)
+
+
+def after_response(response: HttpResponse, fn: Callable[..., Any], *args: Any) -> None:
+    # Runs `fn` when the server closes the response, i.e. after the body has
+    # been sent, so speculative work never delays the request it follows.
+    close = response.close
+
+    def close_then_run() -> None:
+        try:
+            close()
+        finally:
+            try:
+                fn(*args)
+            except Exception:
+                logger.exception("Post-response task failed")
+
+    response.close = close_then_run  # type: ignore[method-assign]
+
 
 class BaseTMDBView(APIView):
     def initialize_request(self, request, *args, **kwargs):
@@ -23,6 +65,64 @@ class BaseTMDBView(APIView):
         )
         return drf_request
 
+    def start_favorites_fetch(
+        self, request: Request
+    ) -> Optional[Future[FavoriteIdSet]]:
+        account_id = request.query_params.get("account_id")
+        if not account_id:
+            return None
+        return run_in_background(self.service.fetch_favorite_ids, account_id)
+
+    def apply_favorites(
+        self,
+        results: Iterable[dict[str, Any]],
+        favorites: Optional[Future[FavoriteIdSet]],
+        deadline: float,
+    ) -> None:
+        results = list(results)
+        for item in results:
+            item["favorite"] = False
+        favorite_ids = self.resolve_favorites(favorites, deadline)
+        if favorite_ids is not None:
+            self.service.annotate_favorites(results, favorite_ids)
+
+    def resolve_favorites(
+        self, favorites: Optional[Future[FavoriteIdSet]], deadline: float
+    ) -> Optional[FavoriteIdSet]:
+        if favorites is None:
+            return None
+        try:
+            return favorites.result(timeout=max(deadline - monotonic(), 0))
+        except (TimeoutError, requests.RequestException):
+            favorites.cancel()
+            return None
+
+    def prefetch_details(
+        self, response: HttpResponse, results: Iterable[dict[str, Any]]
+    ) -> None:
+        # Warms details for the results users are most likely to open next,
+        # once `response` has been sent.
+        if TMDB_PREFETCH_DETAILS_TOP_K:
+            ids = top_k_ids(
+                results, TMDB_PREFETCH_DETAILS_TOP_K, TMDB_PREFETCH_DETAILS_ORDER
+            )
+            after_response(response, self.service.prefetch_details, ids)
+
+    def encoded_response(
+        self,
+        listing: EncodedListing,
+        favorites: Optional[Future[FavoriteIdSet]],
+        deadline: float,
+    ) -> HttpResponse:
+        favorite_ids = self.resolve_favorites(favorites, deadline)
+        with tracing.span("serialize"):
+            if favorite_ids is None:
+                flags = [False] * len(listing.ids)
+            else:
+                flags = favorite_ids.contains_many(listing.ids)
+            body = listing.render(flags)
+        return HttpResponse(body, content_type=Headers.JSON_CT)
+
 
 class DiscoverMoviesView(BaseTMDBView):
     serializer_class = MovieDiscoverListSerializer
@@ -51,19 +151,51 @@ class DiscoverMoviesView(BaseTMDBView):
         ser_in.is_valid(raise_exception=True)
         params = dict(ser_in.validated_data)
 
+        deadline = monotonic() + TMDB_FAVORITES_DEADLINE
+        favorites = self.start_favorites_fetch(request)
+        if TMDB_PASSTHROUGH:
+            listing = self.service.discover_encoded(params)
+            response = self.encoded_response(listing, favorites, deadline)
+            self.prefetch_next_page(
+                response, params, listing.page, listing.total_pages, encoded=True
+            )
+            # Encoded listings keep only ids, so they always rank by position.
+            self.prefetch_details(
+                response, ({"id": tmdb_id} for tmdb_id in listing.ids)
+            )
+            return response
         payload = self.service.discover(params)
-        results = payload.get("results", [])
-        for item in results:
-            item["favorite"] = False
+        self.apply_favorites(payload.get("results", []), favorites, deadline)
 
-        account_id = request.query_params.get("account_id")
-        if account_id:
-            favorite_ids = self.service.fetch_favorite_ids(account_id)
-            self.service.annotate_favorites(results, favorite_ids)
+        with tracing.span("serialize"):
+            ser_out = self.serializer_class(data=payload)
+            ser_out.is_valid(raise_exception=False)
+            data = ser_out.data
+        response = Response(data, status=status.HTTP_200_OK)
+        self.prefetch_next_page(
+            response,
+            params,
+            int(payload.get("page") or 1),
+            int(payload.get("total_pages") or 0),
+            encoded=False,
+        )
+        self.prefetch_details(response, payload.get("results", []))
+        return response
 
-        ser_out = self.serializer_class(data=payload)
-        ser_out.is_valid(raise_exception=False)
-        return Response(ser_out.data, status=status.HTTP_200_OK)
+    def prefetch_next_page(
+        self,
+        response: HttpResponse,
+        params: dict[str, Any],
+        page: int,
+        total_pages: int,
+        encoded: bool,
+    ) -> None:
+        # Infinite scroll asks for page N+1 next; start warming it once page N
+        # has been sent.
+        if TMDB_PREFETCH_NEXT_PAGE and page < total_pages:
+            after_response(
+                response, self.service.prefetch_next_discover_page, params, encoded
+            )
 
 
 class SearchMoviesView(BaseTMDBView):
@@ -115,21 +247,20 @@ class SearchMoviesView(BaseTMDBView):
         page = request.query_params.get(QueryParams.PAGE, 1)
         language = request.query_params.get(QueryParams.LANGUAGE, TMDB_DEFAULT_LANG)
 
+        deadline = monotonic() + TMDB_FAVORITES_DEADLINE
+        favorites = self.start_favorites_fetch(request)
         payload = self.service.search_movies(
             query=query_text, page=page, language=language
         )
-        results = payload.get("results", [])
-        for item in results:
-            item["favorite"] = False
-
-        account_id = request.query_params.get("account_id")
-        if account_id:
-            favorite_ids = self.service.fetch_favorite_ids(account_id)
-            self.service.annotate_favorites(results, favorite_ids)
+        self.apply_favorites(payload.get("results", []), favorites, deadline)
 
-        ser_out = self.serializer_class(data=payload)
-        ser_out.is_valid(raise_exception=False)
-        return Response(ser_out.data, status=status.HTTP_200_OK)
+        with tracing.span("serialize"):
+            ser_out = self.serializer_class(data=payload)
+            ser_out.is_valid(raise_exception=False)
+            data = ser_out.data
+        response = Response(data, status=status.HTTP_200_OK)
+        self.prefetch_details(response, payload.get("results", []))
+        return response
 
 
 class MovieDetailsView(BaseTMDBView):
@@ -147,6 +278,7 @@ class MovieDetailsView(BaseTMDBView):
                 description="TMDb movie ID",
                 required=True,
             ),
+            MovieDetailsQueryParamsSerializer,
         ],
         responses={
             200: OpenApiResponse(
@@ -158,5 +290,52 @@ class MovieDetailsView(BaseTMDBView):
     def get(
         self, request: Request, tmdb_id: int, *args: Any, **kwargs: Any
     ) -> Response:
-        details = self.service.details(tmdb_id)
+        ser_in = MovieDetailsQueryParamsSerializer(data=request.query_params)
+        ser_in.is_valid(raise_exception=True)
+        details = self.service.details(
+            tmdb_id,
+            language=ser_in.validated_data.get(QueryParams.LANGUAGE),
+            region=ser_in.validated_data.get(QueryParams.REGION),
+        )
         return Response(details, status=status.HTTP_200_OK)
+
+
+class ImageProxyView(APIView):
+    # Serves TMDb images from the local content-addressed cache. The file is
+    # handed to the server's wsgi.file_wrapper (sendfile where available).
+    authentication_classes: list = []
+
+    @extend_schema(
+        tags=[Docs.Tags.MOVIES],
+        summary=Docs.Summaries.IMAGE,
+        description=Docs.Descriptions.IMAGE,
+        responses={
+            (200, "image/*"): OpenApiResponse(description="Image bytes."),
+            404: OpenApiResponse(description="Image not found."),
+            502: OpenApiResponse(description="Upstream TMDb error."),
+        },
+    )
+    def get(
+        self, request: Request, size: str, path: str, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        try:
+            image, file = image_cache().open(size, f"/{path}")
+        except ImageNotFound:
+            return Response(
+                {"detail": Errors.NOT_FOUND}, status=status.HTTP_404_NOT_FOUND
+            )
+        except requests.RequestException:
+            return Response(
+                {"detail": Errors.TMDB_UPSTREAM_ERROR},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
+
+        etag = f'"{image.digest}"'
+        if request.headers.get("If-None-Match") == etag:
+            file.close()
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = FileResponse(file, content_type=image.content_type)
+        response["ETag"] = etag
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response